@@ -0,0 +1,181 @@
+"""Deterministic generator of realistic mypy output and baselines.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+
+
+CATEGORIES = (
+    # (category, weight)
+    ('arg-type', 20),
+    ('union-attr', 15),
+    ('assignment', 12),
+    ('attr-defined', 10),
+    ('return-value', 8),
+    ('no-untyped-def', 8),
+    ('call-arg', 6),
+    ('index', 5),
+    ('misc', 5),
+    ('override', 4),
+    ('name-defined', 3),
+    ('import-untyped', 2),
+    ('var-annotated', 2),
+)
+MESSAGES = (
+    'Argument {n} to "{func}" has incompatible type "{t1}"; expected "{t2}"',
+    'Item "None" of "Optional[{t1}]" has no attribute "{attr}"',
+    'Incompatible types in assignment (expression has type "{t1}", variable has type "{t2}")',  # noqa: E501
+    '"{t1}" has no attribute "{attr}"',
+    'Incompatible return value type (got "{t1}", expected "{t2}")',
+    'Function is missing a type annotation',
+    'Unexpected keyword argument "{attr}" for "{func}"',
+    'Value of type "{t1}" is not indexable',
+    'Signature of "{func}" incompatible with supertype "{t2}"',
+    'Name "{attr}" already defined on line {n}',
+)
+NOTES = (
+    'See https://mypy.readthedocs.io/en/stable/running_mypy.html#missing-imports',
+    'Revealed type is "{t1}"',
+    '    def {func}(self, x: {t1}) -> {t2}',
+)
+TYPES = (
+    'int', 'str', 'None', 'list[int]', 'dict[str, Any]', 'User', 'QuerySet[User]',
+    'Callable[[int], str]', 'tuple[int, ...]', 'Optional[Decimal]',
+)
+NAMES = ('get', 'save', 'name', 'user', 'process', 'render', 'id', 'value', 'items')
+
+
+@dataclass
+class Options:
+    # how many lines to generate
+    size: int = 1_000
+    # how many different files to report errors for
+    files: int = 100
+    # the fraction of errors that repeat an earlier error in the same file
+    duplicates: float = 0.1
+    # the fraction of notes (errors without a category)
+    notes: float = 0.1
+    # the fraction of errors in Jupyter notebooks (reported by nbQA)
+    nbqa: float = 0.02
+    # the fraction of lines with color codes
+    colors: float = 0.0
+    seed: int = 0
+
+
+def _make_paths(rnd: random.Random, options: Options) -> list[str]:
+    paths = []
+    for i in range(max(options.files, 1)):
+        depth = rnd.randint(0, 3)
+        dirs = [f'pkg{rnd.randint(0, 9)}']
+        dirs += [f'sub{rnd.randint(0, 20)}' for _ in range(depth)]
+        ext = 'pyi' if rnd.random() < 0.05 else 'py'
+        paths.append('/'.join(dirs + [f'module{i}.{ext}']))
+    return paths
+
+
+def _make_message(rnd: random.Random, templates: tuple[str, ...]) -> str:
+    return rnd.choice(templates).format(
+        n=rnd.randint(1, 500),
+        func=rnd.choice(NAMES),
+        attr=rnd.choice(NAMES),
+        t1=rnd.choice(TYPES),
+        t2=rnd.choice(TYPES),
+    )
+
+
+def _colorize(severity: str, message: str, category: str | None) -> str:
+    """Add color codes in the same way as mypy does it.
+    """
+    result = f'\x1b[1m\x1b[31m{severity}:\x1b[m {message}'
+    if category:
+        result += f'  \x1b[m\x1b[33m[{category}]\x1b[m'
+    return result
+
+
+def generate_output(options: Options) -> list[str]:
+    """Generate mypy output.
+
+    All lines end with a newline. The last line is the summary that mypy
+    shows at the end, so it's the only line that is not an error.
+    """
+    rnd = random.Random(options.seed)
+    paths = _make_paths(rnd, options)
+    categories = [c for c, _ in CATEGORIES]
+    weights = [w for _, w in CATEGORIES]
+    # Errors are grouped by file, and files go in an arbitrary order.
+    file_indices = sorted(rnd.randrange(len(paths)) for _ in range(options.size - 1))
+    order = list(range(len(paths)))
+    rnd.shuffle(order)
+    file_indices.sort(key=order.__getitem__)
+
+    lines: list[str] = []
+    previous: dict[int, tuple[str, str, str | None]] = {}
+    prev_file_index = -1
+    lineno = 0
+    for file_index in file_indices:
+        if file_index != prev_file_index:
+            lineno = 0
+            prev_file_index = file_index
+        lineno += rnd.randint(1, 20)
+        if file_index in previous and rnd.random() < options.duplicates:
+            severity, message, category = previous[file_index]
+        elif rnd.random() < options.notes:
+            severity = 'note'
+            message = _make_message(rnd, NOTES)
+            category = None
+        else:
+            severity = 'error'
+            message = _make_message(rnd, MESSAGES)
+            category = rnd.choices(categories, weights)[0]
+        previous[file_index] = (severity, message, category)
+
+        pos = f'{paths[file_index]}:{lineno}'
+        if rnd.random() < options.nbqa:
+            pos = f'notebooks/nb{file_index}.ipynb:cell_{rnd.randint(1, 30)}:{lineno}'
+        elif rnd.random() < 0.3:
+            pos += f':{rnd.randint(1, 80)}'  # column number
+        if rnd.random() < options.colors:
+            line = f'{pos}: {_colorize(severity, message, category)}'
+        else:
+            line = f'{pos}: {severity}: {message}'
+            if category:
+                line += f'  [{category}]'
+        lines.append(line + '\n')
+    files = len(set(file_indices))
+    summary = f'Found {len(lines)} errors in {files} files (checked 1000 source files)'
+    lines.append(summary + '\n')
+    return lines
+
+
+def generate_baseline(
+    clean_lines: list[str],
+    new: float = 0.01,
+    fixed: float = 0.01,
+    seed: int = 0,
+) -> list[str]:
+    """Generate a baseline for the given clean lines of mypy output.
+
+    The `new` fraction of errors is not included into the baseline,
+    and the `fixed` fraction of extra errors is added into it,
+    so that the baseline is close to what a real project might have.
+    """
+    rnd = random.Random(seed)
+    fixed_count = int(len(clean_lines) * fixed)
+    positions = sorted(
+        (rnd.randrange(len(clean_lines) + 1) for _ in range(fixed_count)),
+        reverse=True,
+    )
+    fixed_lines = iter(
+        f'fixed/module{i}.py:0: error: Fixed error {i}  [misc]'
+        for i in range(fixed_count)
+    )
+    baseline = []
+    for i, line in enumerate(clean_lines):
+        while positions and positions[-1] == i:
+            positions.pop()
+            baseline.append(next(fixed_lines))
+        if rnd.random() >= new:
+            baseline.append(line)
+    baseline.extend(fixed_lines)
+    return baseline
@@ -0,0 +1,92 @@
+"""Benchmark for parsing mypy output lines.
+
+Compares `Error.new` and `Error.get_clean_line` with the regex-only
+implementation they had before the fast path was introduced.
+
+    python3 -m benchmarks.parse
+"""
+from __future__ import annotations
+
+import random
+import re
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Callable
+
+from mypy_baseline._config import Config
+from mypy_baseline._error import (
+    REX_COLOR_NBQA, REX_LINE, REX_LINE_IN_MSG, REX_LINE_NBQA, Error,
+)
+
+
+# The color codes regex before it was optimized.
+REX_COLOR = re.compile('(\x1b\\[\\d*m?|\x0f)*')
+LINES = (
+    'pkg/api/views.py:69: error: Incompatible return value type (got "int", expected "str")  [return-value]\n',  # noqa: E501
+    'pkg/models.py:12:5: error: Item "None" of "Optional[User]" has no attribute "name"  [union-attr]\n',  # noqa: E501
+    'pkg/stubs/lib.pyi:3: note: See https://mypy.readthedocs.io/en/stable/running_mypy.html\n',  # noqa: E501
+    'pkg/models.py:14: note: Revealed type is "builtins.int"  [note]\n',
+    'pkg/forms.py:8: \x1b[1m\x1b[31merror:\x1b[m Name \x1b[m\x1b[1m"x"\x1b[m is not defined  \x1b[m\x1b[33m[name-defined]\x1b[m\n',  # noqa: E501
+    'notebooks/fail.ipynb:cell_1:2: error: Unsupported operand types  [operator]\n',
+    'Found 1000 errors in 100 files (checked 1000 source files)\n',
+)
+
+
+def parse_before(line: str, config: Config) -> str | None:
+    """The parser as it was before the fast path was introduced.
+    """
+    line = REX_COLOR.sub('', line)
+    line = REX_COLOR_NBQA.sub('', line)
+    match = REX_LINE.fullmatch(line) or REX_LINE_NBQA.fullmatch(line)
+    if match is None:
+        return None
+    path, lineno, severity, msg, category = match.groups()
+    category = category or 'note'
+    path = str(Path(*Path(path).parts[:config.depth])).replace('\\', '/')
+    pos = lineno if config.preserve_position else 0
+    msg = REX_COLOR.sub('', msg).strip()
+    msg = REX_COLOR_NBQA.sub('', msg).strip()
+    msg = REX_LINE_IN_MSG.sub('defined on line 0', msg)
+    result = f'{path}:{pos}: {severity}: {msg}'
+    if category != 'note':
+        result += f'  [{category}]'
+    return result
+
+
+def parse_after(line: str, config: Config) -> str | None:
+    error = Error.new(line)
+    if error is None:
+        return None
+    return error.get_clean_line(config)
+
+
+def measure(func: Callable[[str, Config], str | None], lines: list[str]) -> float:
+    """Get how many lines per second the function can parse.
+    """
+    config = Config(depth=2)
+    start = time.perf_counter()
+    for line in lines:
+        func(line, config)
+    return len(lines) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = ArgumentParser()
+    parser.add_argument('-n', type=int, default=100_000, help='lines to parse')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    rnd = random.Random(args.seed)
+    lines = [rnd.choice(LINES) for _ in range(args.n)]
+
+    for line in LINES:
+        assert parse_before(line, Config(depth=2)) == parse_after(line, Config(depth=2))
+    before = measure(parse_before, lines)
+    after = measure(parse_after, lines)
+    print(f'before: {before:>12,.0f} lines/s')
+    print(f'after:  {after:>12,.0f} lines/s')
+    print(f'speedup: {after / before:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
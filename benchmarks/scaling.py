@@ -0,0 +1,212 @@
+"""Benchmark how commands scale with the size of mypy output and baseline.
+
+    python3 -m benchmarks.scaling
+    python3 -m benchmarks.scaling --sizes 1000 10000 100000 1000000 --repeat 1
+
+For each benchmark and size, it reports the time, throughput, and peak memory.
+It also estimates how the time grows with the input size, and fails
+if the growth is noticeably worse than linear.
+"""
+from __future__ import annotations
+
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from contextlib import contextmanager
+from dataclasses import dataclass
+from io import StringIO
+from pathlib import Path
+from typing import Callable, Iterator
+
+from mypy_baseline import main as cli_main
+from mypy_baseline._config import Config
+from mypy_baseline._error import Error, parse_line
+
+from .generator import Options, generate_baseline, generate_output
+
+
+# If the run takes less time than that, the time is too noisy
+# to judge about the complexity.
+MIN_TIME = 0.05
+
+
+@dataclass
+class Case:
+    """Input data for a benchmark of the given size.
+    """
+    root: Path
+    output: list[str]
+    baseline_path: Path
+
+    @classmethod
+    def new(cls, root: Path, size: int, options: Options) -> Case:
+        options.size = size
+        options.files = max(size // 20, 10)
+        output = generate_output(options)
+        config = Config()
+        clean_lines = [c for line in output for _, c in parse_line(config, line)]
+        baseline = generate_baseline(clean_lines, seed=options.seed)
+        root.mkdir(parents=True)
+        baseline_path = root / 'mypy-baseline.txt'
+        baseline_path.write_text('\n'.join(baseline) + '\n')
+        return cls(
+            root=root,
+            output=output,
+            baseline_path=baseline_path,
+        )
+
+    def run_cli(self, *args: str) -> None:
+        stdin = StringIO(''.join(self.output))
+        argv = [*args, '--baseline-path', str(self.baseline_path)]
+        cli_main(argv, stdin, StringIO())
+
+
+def bench_error_new(case: Case) -> Callable[[], object]:
+    def run() -> None:
+        for line in case.output:
+            Error.new(line)
+    return run
+
+
+def bench_filter(case: Case) -> Callable[[], object]:
+    return lambda: case.run_cli('filter')
+
+
+def bench_sync(case: Case) -> Callable[[], object]:
+    # Sync removes fixed errors from the baseline and inserts new ones,
+    # but each run should start from the same state.
+    original = case.baseline_path.read_text()
+
+    def run() -> None:
+        case.baseline_path.write_text(original)
+        case.run_cli('sync')
+    return run
+
+
+def bench_top_files(case: Case) -> Callable[[], object]:
+    return lambda: case.run_cli('top-files')
+
+
+def bench_suggest(case: Case) -> Callable[[], object]:
+    git = ['git', '-c', 'user.name=bench', '-c', 'user.email=bench@localhost']
+    with _enter_dir(case.root):
+        subprocess.run([*git, 'init', '-q'], check=True)
+        subprocess.run([*git, 'add', '.'], check=True)
+        subprocess.run([*git, 'commit', '-q', '-m', 'init'], check=True)
+
+    def run() -> None:
+        with _enter_dir(case.root):
+            case.run_cli('suggest', '--default-branch', 'HEAD', '--exit-zero')
+    return run
+
+
+BENCHMARKS = {
+    'Error.new': bench_error_new,
+    'filter': bench_filter,
+    'sync': bench_sync,
+    'top-files': bench_top_files,
+    'suggest': bench_suggest,
+}
+
+
+@contextmanager
+def _enter_dir(path: Path) -> Iterator[None]:
+    old_path = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(old_path)
+
+
+def measure_time(func: Callable[[], object], repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_memory(func: Callable[[], object]) -> int:
+    """Get peak memory (in bytes) allocated while running the function.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def get_exponent(size1: int, time1: float, size2: int, time2: float) -> float:
+    """Estimate k in `time = O(size^k)` based on two measurements.
+    """
+    return math.log(time2 / time1) / math.log(size2 / size1)
+
+
+def main() -> int:
+    parser = ArgumentParser()
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+        help='how many lines of mypy output to generate',
+    )
+    parser.add_argument(
+        '--only', nargs='+', choices=sorted(BENCHMARKS),
+        help='run only the given benchmarks',
+    )
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true', help='do not measure memory')
+    parser.add_argument(
+        '--max-exponent', type=float, default=1.3,
+        help='fail if time grows faster than size to the power of that',
+    )
+    parser.add_argument('--duplicates', type=float, default=Options.duplicates)
+    parser.add_argument('--notes', type=float, default=Options.notes)
+    parser.add_argument('--nbqa', type=float, default=Options.nbqa)
+    parser.add_argument('--colors', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=Options.seed)
+    args = parser.parse_args()
+    options = Options(
+        duplicates=args.duplicates,
+        notes=args.notes,
+        nbqa=args.nbqa,
+        colors=args.colors,
+        seed=args.seed,
+    )
+
+    failed = False
+    header = f'{"benchmark":12} {"lines":>10} {"time":>9} {"lines/s":>11} {"memory":>9}'
+    print(f'{header}  growth')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in (args.only or BENCHMARKS):
+            prev: tuple[int, float] | None = None
+            for size in sorted(args.sizes):
+                case = Case.new(Path(tmp_dir, name, str(size)), size, options)
+                func = BENCHMARKS[name](case)
+                elapsed = measure_time(func, repeat=args.repeat)
+                line = f'{name:12} {size:>10,} {elapsed:>8.3f}s {size / elapsed:>11,.0f}'
+                if args.no_memory:
+                    line += ' ' * 10
+                else:
+                    memory = measure_memory(func) / 2 ** 20
+                    line += f' {memory:>6.1f} MB'
+                if prev is not None and min(prev[1], elapsed) >= MIN_TIME:
+                    exponent = get_exponent(*prev, size, elapsed)
+                    line += f'  n^{exponent:.2f}'
+                    if exponent > args.max_exponent:
+                        line += '  FAIL: superlinear'
+                        failed = True
+                print(line, flush=True)
+                prev = (size, elapsed)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,407 @@
+from __future__ import annotations
+
+import json
+import time
+from collections import Counter
+from hashlib import sha256
+from pathlib import Path
+from typing import Iterator, Mapping, NamedTuple
+
+from ._compression import decompress, read_lines
+from ._error import Error
+from ._files import write_if_changed
+from ._parallel import map_lines
+
+
+# Bump it every time the format of the index file changes.
+INDEX_VERSION = 2
+# If the baseline has been modified less than that many nanoseconds before
+# it was indexed, its size and mtime aren't enough to know that it's unchanged.
+# The window covers filesystems with coarse timestamps (2 seconds on FAT).
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def stable_merge(
+    old: list[str],
+    new: list[str],
+    paths: Mapping[str, str],
+) -> list[str]:
+    """Update the old baseline to have the same lines as the new one.
+
+    The lines that are present in both baselines stay in the same order
+    as they are in the old baseline, and lines that aren't in the new baseline
+    are removed. New lines are inserted after the last old line for the same file.
+    Lines for files that aren't in the old baseline are inserted after the file
+    that precedes them in the new baseline. So, adding a single error
+    results in a single line added into the baseline.
+
+    The `paths` maps each line of the new baseline to the file it refers to.
+    Runs in linear time.
+    """
+    # Keep old lines that are also in the new baseline, respecting duplicates.
+    remaining = Counter(new)
+    kept: list[str] = []
+    last_index: dict[str, int] = {}
+    for line in old:
+        count = remaining.get(line, 0)
+        if count:
+            remaining[line] = count - 1
+            last_index[paths[line]] = len(kept)
+            kept.append(line)
+
+    # Group lines that weren't in the old baseline by file.
+    added: dict[str, list[str]] = {}
+    for line in new:
+        count = remaining.get(line, 0)
+        if count:
+            remaining[line] = count - 1
+            added.setdefault(paths[line], []).append(line)
+    if not added:
+        return kept
+
+    # Find after which old line to insert new lines. Walk through files
+    # in the order of the new baseline and remember the last old line
+    # of the last seen file that has old lines.
+    inserts: dict[int, list[str]] = {}
+    anchor = -1
+    for path in dict.fromkeys(paths[line] for line in new):
+        anchor = last_index.get(path, anchor)
+        lines = added.get(path)
+        if lines:
+            inserts.setdefault(anchor, []).extend(lines)
+
+    result = inserts.get(-1, [])
+    for index, line in enumerate(kept):
+        result.append(line)
+        result.extend(inserts.get(index, ()))
+    return result
+
+
+class Entry(NamedTuple):
+    """Parsed baseline line.
+    """
+    path: str
+    severity: str
+    category: str
+
+
+class BaselineIndex:
+    """Counted baseline lines, parsed lazily, with aggregated stats.
+
+    It's a multiset: each line is stored with how many times it occurs
+    in the baseline. Duplicates are possible because line numbers are
+    removed from the baseline. So, matching an error consumes only one
+    occurrence of its line.
+
+    Parsed lines can be cached in a file next to the baseline, so that
+    the next run doesn't need to parse the baseline again. The cache is loaded
+    only when all lines need to be parsed, single lines are parsed on demand.
+    """
+    __slots__ = (
+        'lines', 'counts', 'remaining',
+        '_entries', '_files', '_categories', '_parts', '_cache',
+    )
+
+    def __init__(
+        self,
+        lines: list[str],
+        counts: Counter[str] | None = None,
+        entries: dict[str, Entry | None] | None = None,
+    ) -> None:
+        self.lines = lines
+        if counts is None:
+            counts = Counter(lines)
+        self.counts = counts
+        # How many times each line occurs and hasn't been matched yet.
+        self.remaining = counts.copy()
+        self._entries: dict[str, Entry | None] = entries or {}
+        self._files: Counter[str] | None = None
+        self._categories: Counter[str] | None = None
+        # For combined indexes, the indexes of each baseline file.
+        self._parts: list[BaselineIndex] = []
+        # The index file, the key it has if it's up to date, and the key
+        # to write it with if it needs to be (re)written.
+        self._cache: tuple[Path, dict | None, dict | None] | None = None
+
+    @classmethod
+    def read(cls, path: Path, cache: bool = False) -> BaselineIndex:
+        """Read the baseline file.
+
+        If cache is True, the index file stored next to the baseline is used
+        when all lines need to be parsed. The index is rebuilt if the baseline
+        has been changed since then.
+        """
+        if not cache:
+            try:
+                return cls(read_lines(path))
+            except FileNotFoundError:
+                return cls([])
+        try:
+            stat = path.stat()
+            # Taken before reading, so that changes made after it are not trusted.
+            indexed_at = time.time_ns()
+            content = path.read_bytes()
+        except FileNotFoundError:
+            return cls([])
+        index = cls(decompress(content, path).decode('utf8').splitlines())
+        new_stat = path.stat()
+        if (new_stat.st_size, new_stat.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+            # The baseline is being written right now, don't cache it.
+            return index
+        index_path = get_index_path(path)
+        header = _read_index_header(index_path)
+        # Fast path: the baseline file has not been touched since it was indexed.
+        # If it was modified right before indexing, it might have been modified
+        # again in the same timestamp tick, so check the content (like git does
+        # for "racily clean" files).
+        if header is not None:
+            same_stat = (header.get('size'), header.get('mtime')) == (
+                stat.st_size, stat.st_mtime_ns,
+            )
+            indexed_at = header.get('indexed_at', 0)
+            if same_stat and stat.st_mtime_ns + RACY_WINDOW_NS < indexed_at:
+                index._cache = (index_path, header, None)
+                return index
+        key: dict[str, object] = dict(
+            version=INDEX_VERSION,
+            size=stat.st_size,
+            mtime=stat.st_mtime_ns,
+            sha256=sha256(content).hexdigest(),
+            indexed_at=indexed_at,
+        )
+        # The baseline file might have been touched (for example, by `git checkout`)
+        # but its content is the same.
+        if header is not None and header.get('sha256') == key['sha256']:
+            index._cache = (index_path, header, key)
+        else:
+            index._cache = (index_path, None, key)
+        return index
+
+    @classmethod
+    def combine(cls, indexes: list[BaselineIndex]) -> BaselineIndex:
+        """Merge indexes of multiple baseline files into one.
+        """
+        if len(indexes) == 1:
+            return indexes[0]
+        lines: list[str] = []
+        counts: Counter[str] = Counter()
+        entries: dict[str, Entry | None] = {}
+        for index in indexes:
+            lines.extend(index.lines)
+            counts.update(index.counts)
+            entries.update(index._entries)
+        combined = cls(lines, counts, entries)
+        combined._parts = indexes
+        return combined
+
+    def copy(self) -> BaselineIndex:
+        """Get a copy with no lines matched yet that shares all parsed lines.
+        """
+        index = BaselineIndex(self.lines, self.counts, self._entries)
+        index._files = self._files
+        index._categories = self._categories
+        index._parts = self._parts
+        index._cache = self._cache
+        return index
+
+    def remove(self, line: str) -> bool:
+        """Consume one occurrence of the line.
+
+        Returns False if there are no (more) such lines in the baseline.
+        """
+        count = self.remaining.get(line, 0)
+        if not count:
+            return False
+        self.remaining[line] = count - 1
+        return True
+
+    def get_unmatched(self) -> Iterator[str]:
+        """Iterate over the lines that haven't been removed yet.
+
+        The lines are produced in the same order as they are in the baseline.
+        Matching consumes the first occurrences of a line, so for duplicates
+        the last ones are considered unmatched.
+        """
+        skip = self.counts.copy()
+        skip.subtract(self.remaining)
+        for line in self.lines:
+            to_skip = skip[line]
+            if to_skip:
+                skip[line] = to_skip - 1
+                continue
+            yield line
+
+    def get(self, line: str) -> Entry | None:
+        """Get the parsed baseline line or None if it cannot be parsed.
+        """
+        try:
+            return self._entries[line]
+        except KeyError:
+            pass
+        entry = _parse_entry(line)
+        self._entries[line] = entry
+        return entry
+
+    def parse_all(self, jobs: int = 1) -> None:
+        """Parse all non-empty lines of the baseline.
+
+        The parsed lines are loaded from the index file, if it's up to date.
+        Otherwise, the lines are parsed and the index file is rebuilt.
+        """
+        for part in self._parts:
+            part.parse_all(jobs)
+            self._entries.update(part._entries)
+        if self._cache is None:
+            self._parse(jobs)
+            return
+        index_path, old_key, new_key = self._cache
+        self._cache = None
+        if old_key is None or not self._load(index_path, old_key):
+            self._parse(jobs)
+        if new_key is not None:
+            self._write(index_path, new_key)
+
+    def _parse(self, jobs: int) -> None:
+        lines = [line for line in self.counts if line and line not in self._entries]
+        for line, entry in map_lines(_parse_entry, lines, jobs):
+            self._entries[line] = entry
+
+    def get_invalid(self) -> Iterator[str]:
+        """Iterate over all non-empty lines that cannot be parsed.
+        """
+        self.parse_all()
+        for line in self.counts:
+            if line and self.get(line) is None:
+                yield line
+
+    @property
+    def files(self) -> Counter[str]:
+        """How many errors each file has.
+        """
+        if self._files is None:
+            self._aggregate()
+        assert self._files is not None
+        return self._files
+
+    @property
+    def categories(self) -> Counter[str]:
+        """How many errors there are of each category.
+        """
+        if self._categories is None:
+            self._aggregate()
+        assert self._categories is not None
+        return self._categories
+
+    def _aggregate(self) -> None:
+        self.parse_all()
+        if self._files is not None:
+            # Loaded from the index file.
+            return
+        files: Counter[str] = Counter()
+        categories: Counter[str] = Counter()
+        for line, count in self.counts.items():
+            entry = self.get(line) if line else None
+            if entry is not None:
+                files[entry.path] += count
+                categories[entry.category] += count
+        self._files = files
+        self._categories = categories
+
+    def _load(self, path: Path, key: dict) -> bool:
+        """Load parsed lines from the index file.
+
+        The entries are stored in the same order as the distinct non-empty lines
+        of the baseline, each as indexes in the table of strings.
+        Returns False if the index file has been changed since its key was checked.
+        """
+        data = _read_index_file(path, key)
+        if data is None:
+            return False
+        lines = [line for line in self.counts if line]
+        strings: list[str] = data['strings']
+        entries: list[int] = data['entries']
+        if len(entries) != len(lines) * 3:
+            return False
+        it = iter(entries)
+        for line, path_id, severity_id, category_id in zip(lines, it, it, it):
+            if path_id < 0:
+                self._entries[line] = None
+            else:
+                self._entries[line] = Entry(
+                    strings[path_id], strings[severity_id], strings[category_id],
+                )
+        self._files = Counter(data['files'])
+        self._categories = Counter(data['categories'])
+        return True
+
+    def _write(self, path: Path, key: dict) -> None:
+        """Write the index file, see `_load` for the format.
+
+        The first line has the key to check if the index is up to date,
+        so that it can be checked without reading the whole index.
+        """
+        string_ids: dict[str, int] = {}
+        entries: list[int] = []
+        for line in self.counts:
+            if not line:
+                continue
+            entry = self.get(line)
+            if entry is None:
+                entries.extend((-1, -1, -1))
+                continue
+            for string in entry:
+                entries.append(string_ids.setdefault(string, len(string_ids)))
+        data = dict(
+            strings=list(string_ids),
+            entries=entries,
+            files=self.files,
+            categories=self.categories,
+        )
+        content = json.dumps(key) + '\n' + json.dumps(data, separators=(',', ':'))
+        try:
+            write_if_changed(path, content)
+        except OSError:
+            # The cache is optional, it's fine if we cannot write it.
+            pass
+
+
+def get_index_path(path: Path) -> Path:
+    """Get path to the index file for the given baseline file.
+    """
+    return path.with_name(f'.{path.stem}.idx')
+
+
+def _parse_entry(line: str) -> Entry | None:
+    error = Error.new(line)
+    if error is None:
+        return None
+    path = '/'.join(error.path.parts)
+    return Entry(path, error.severity, error.category)
+
+
+def _read_index_header(path: Path) -> dict | None:
+    """Read the first line of the index file with the key of the baseline.
+    """
+    try:
+        with path.open('rb') as stream:
+            header = json.loads(stream.readline())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(header, dict) or header.get('version') != INDEX_VERSION:
+        return None
+    return header
+
+
+def _read_index_file(path: Path, key: dict) -> dict | None:
+    """Read parsed lines from the index file if it still has the given key.
+    """
+    try:
+        with path.open('rb') as stream:
+            if json.loads(stream.readline()) != key:
+                return None
+            data = json.loads(stream.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    return data
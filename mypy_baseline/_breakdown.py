@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import dataclasses
+import posixpath
+from collections import Counter
+from typing import Iterable
+
+from ._error import Error, truncate_path
+from ._git import Commit
+
+
+# How errors can be grouped in `history --by`.
+GROUPS = ('category', 'file', 'directory')
+
+
+class Breakdown:
+    """Count errors in the baseline per category, file, or directory at each commit.
+
+    Each version of the baseline is compared with the previous one, and only
+    lines that have changed are parsed, each distinct line only once.
+    For a sharded baseline, files that haven't changed since the previous
+    commit are not read at all.
+    """
+    __slots__ = ('by', 'depth', 'counts', '_files', '_groups')
+
+    def __init__(self, by: str, depth: int) -> None:
+        assert by in GROUPS
+        self.by = by
+        self.depth = depth
+        # How many errors each group has after the last applied commit.
+        self.counts: Counter[str] = Counter()
+        # For each baseline file, the oid of its content and the lines in it.
+        self._files: dict[str, tuple[str, Counter[bytes]]] = {}
+        # The group of each line that has been seen, None if it's not an error.
+        self._groups: dict[bytes, str | None] = {}
+
+    def update(self, commit: Commit) -> dict[str, int]:
+        """Apply the baseline at the commit and get how counts of groups changed.
+
+        Commits should be applied from the oldest one.
+        """
+        diff: dict[str, int] = {}
+        files = commit.get_files()
+        for name in self._files.keys() - files.keys():
+            _, removed = self._files.pop(name)
+            self._apply(diff, removed.items(), -1)
+        for name, oid in files.items():
+            old = self._files.get(name)
+            if old is not None and old[0] == oid:
+                continue
+            lines = commit.read_file_lines(name, oid)
+            if old is None:
+                self._apply(diff, lines.items(), 1)
+            else:
+                # Set operations on dict views are fast, most lines are the same.
+                old_lines = old[1]
+                self._apply(diff, lines.items() - old_lines.items(), 1)
+                self._apply(diff, old_lines.items() - lines.items(), -1)
+            self._files[name] = (oid, lines)
+        diff = {group: change for group, change in diff.items() if change}
+        self.counts.update(diff)
+        return diff
+
+    def start_before(self, commit: Commit) -> None:
+        """Use the baseline before the commit as the initial state.
+
+        It's needed if the history doesn't start from the commit that
+        has added the baseline, so that the first commit shows only its changes.
+        """
+        self.update(dataclasses.replace(commit, hash=f'{commit.hash}^'))
+
+    def _apply(
+        self,
+        diff: dict[str, int],
+        lines: Iterable[tuple[bytes, int]],
+        sign: int,
+    ) -> None:
+        """Add (or subtract) counts of lines to their groups in the diff.
+        """
+        for line, count in lines:
+            group = self._get_group(line)
+            if group is not None:
+                diff[group] = diff.get(group, 0) + sign * count
+
+    def _get_group(self, line: bytes) -> str | None:
+        try:
+            return self._groups[line]
+        except KeyError:
+            pass
+        group: str | None = None
+        error = Error.new(line.decode('utf8', errors='replace'))
+        if error is not None:
+            if self.by == 'category':
+                group = error.category
+            elif self.by == 'file':
+                group = truncate_path(error.raw_path, self.depth)
+            else:
+                path = posixpath.dirname(error.raw_path) or '.'
+                group = truncate_path(path, self.depth)
+        self._groups[line] = group
+        return group
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime, timezone
+from typing import Sequence
+from xml.sax.saxutils import escape
+
+from ._git import Commit
+
+
+# The size of the chart in pixels.
+WIDTH = 800
+HEIGHT = 480
+# Space around the plot area for axis labels.
+MARGIN_LEFT = 70
+MARGIN_RIGHT = 20
+MARGIN_TOP = 20
+MARGIN_BOTTOM = 100
+# How many ticks to show on each axis, approximately.
+TICKS = 6
+# Colors of points for commits that fixed more errors than added and the rest.
+COLOR_FIXED = '#00bfc4'
+COLOR_NEW = '#f8766d'
+
+
+def render_svg(commits: Sequence[Commit]) -> str:
+    """Draw the chart of how the baseline size changed over time as SVG.
+
+    It's the same chart as the one drawn with plotnine but it doesn't need
+    any dependencies. Commits can be in any order: commit dates might go
+    backwards in git history (like after a rebase), so they are sorted by date.
+    """
+    assert commits
+    commits = sorted(commits, key=lambda c: c.created_at)
+    plot_width = WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+    plot_height = HEIGHT - MARGIN_TOP - MARGIN_BOTTOM
+    times = [c.created_at.timestamp() for c in commits]
+    min_time = times[0]
+    max_time = times[-1]
+    time_span = (max_time - min_time) or 1.0
+    max_count = max(c.lines_count for c in commits) + 5
+    y_ticks = get_ticks(max_count)
+    max_y = max(max_count, y_ticks[-1])
+
+    def get_x(timestamp: float) -> float:
+        return MARGIN_LEFT + (timestamp - min_time) / time_span * plot_width
+
+    def get_y(count: float) -> float:
+        return MARGIN_TOP + plot_height - count / max_y * plot_height
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{HEIGHT}"'
+        f' viewBox="0 0 {WIDTH} {HEIGHT}" font-family="sans-serif" font-size="12">',
+        f'<rect width="{WIDTH}" height="{HEIGHT}" fill="white"/>',
+        f'<rect x="{MARGIN_LEFT}" y="{MARGIN_TOP}" width="{plot_width}"'
+        f' height="{plot_height}" fill="#ebebeb"/>',
+    ]
+
+    # the grid with labels for the count
+    x_end = MARGIN_LEFT + plot_width
+    for tick in y_ticks:
+        y = get_y(tick)
+        parts.append(
+            f'<line x1="{MARGIN_LEFT}" y1="{y:.1f}" x2="{x_end}" y2="{y:.1f}"'
+            ' stroke="white"/>',
+        )
+        parts.append(
+            f'<text x="{MARGIN_LEFT - 5}" y="{y + 4:.1f}"'
+            f' text-anchor="end">{tick}</text>',
+        )
+
+    # the grid with labels for the time
+    y_end = MARGIN_TOP + plot_height
+    for tick_time, label in get_time_ticks(min_time, max_time):
+        x = get_x(tick_time)
+        parts.append(
+            f'<line x1="{x:.1f}" y1="{MARGIN_TOP}" x2="{x:.1f}" y2="{y_end}"'
+            ' stroke="white"/>',
+        )
+        parts.append(
+            f'<text x="{x:.1f}" y="{y_end + 15}" text-anchor="end"'
+            f' transform="rotate(-45 {x:.1f} {y_end + 15})">{label}</text>',
+        )
+
+    # axis titles
+    parts.append(
+        f'<text x="{MARGIN_LEFT + plot_width / 2:.1f}" y="{HEIGHT - 10}"'
+        ' text-anchor="middle">commit time</text>',
+    )
+    y_middle = MARGIN_TOP + plot_height / 2
+    parts.append(
+        f'<text x="15" y="{y_middle:.1f}" text-anchor="middle"'
+        f' transform="rotate(-90 15 {y_middle:.1f})">unresolved issues</text>',
+    )
+
+    # the line and a point for each commit
+    points = ' '.join(
+        f'{get_x(t):.1f},{get_y(c.lines_count):.1f}'
+        for t, c in zip(times, commits)
+    )
+    parts.append(f'<polyline points="{points}" fill="none" stroke="black"/>')
+    for timestamp, commit in zip(times, commits):
+        fixed = commit.deletions > commit.insertions
+        color = COLOR_FIXED if fixed else COLOR_NEW
+        title = f'{commit.created_at} {commit.hash[:10]} {commit.author_email}'
+        title += f': {commit.lines_count}'
+        parts.append(
+            f'<circle cx="{get_x(timestamp):.1f}" cy="{get_y(commit.lines_count):.1f}"'
+            f' r="3" fill="{color}"><title>{escape(title)}</title></circle>',
+        )
+
+    # the legend
+    legend_x = WIDTH - MARGIN_RIGHT - 90
+    for i, (color, label) in enumerate([(COLOR_FIXED, 'fixed'), (COLOR_NEW, 'new')]):
+        y = MARGIN_TOP + 15 + i * 18
+        parts.append(f'<circle cx="{legend_x}" cy="{y - 4}" r="4" fill="{color}"/>')
+        parts.append(f'<text x="{legend_x + 10}" y="{y}">{label}</text>')
+
+    parts.append('</svg>')
+    return '\n'.join(parts) + '\n'
+
+
+def render_png(commits: Sequence[Commit]) -> bytes:
+    """Draw the chart as PNG, requires cairosvg to be installed.
+    """
+    try:
+        import cairosvg
+    except ImportError:
+        msg = 'cairosvg package is required to save the chart as PNG'
+        raise ImportError(msg) from None
+    return cairosvg.svg2png(bytestring=render_svg(commits).encode())
+
+
+def get_ticks(max_value: float) -> list[int]:
+    """Get round numbers from 0 to at least `max_value` to show on the axis.
+    """
+    raw_step = max(max_value / TICKS, 1)
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(
+        m * magnitude for m in (1, 2, 5, 10)
+        if m * magnitude >= raw_step
+    )
+    count = math.ceil(max_value / step)
+    return [i * step for i in range(count + 1)]
+
+
+def get_time_ticks(start: float, end: float) -> list[tuple[float, str]]:
+    """Get evenly spaced timestamps between `start` and `end` and labels for them.
+    """
+    span = end - start
+    # Show time only if all commits were made in a few days.
+    fmt = '%Y-%m-%d' if span > 3 * 24 * 3600 else '%Y-%m-%d %H:%M'
+    if span == 0:
+        timestamps = [start]
+    else:
+        timestamps = [start + span * i / (TICKS - 1) for i in range(TICKS)]
+    return [
+        (ts, datetime.fromtimestamp(ts, timezone.utc).strftime(fmt))
+        for ts in timestamps
+    ]
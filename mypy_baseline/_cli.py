@@ -4,27 +4,45 @@ import sys
 from argparse import ArgumentParser
 from typing import NoReturn, TextIO
 
-from .commands import Command, commands
+from ._profile import Profiler, add_profile_arguments
+from .commands import registry
+
+
+def _get_command_name(argv: list[str]) -> str | None:
+    """Find out which command is going to be run without parsing all arguments.
+    """
+    parser = ArgumentParser('mypy-baseline', add_help=False)
+    add_profile_arguments(parser)
+    parser.add_argument('cmd_name', nargs='?')
+    args, _ = parser.parse_known_args(argv)
+    return args.cmd_name
 
 
 def main(argv: list[str], stdin: TextIO, stdout: TextIO) -> int:
     parser = ArgumentParser('mypy-baseline')
     subparsers = parser.add_subparsers()
-    parser.set_defaults(cmd=None)
-
-    cmd_class: type[Command]
-    for name, cmd_class in sorted(commands.items()):
-        subparser = subparsers.add_parser(name=name, help=cmd_class.__doc__)
-        subparser.set_defaults(cmd=cmd_class)
-        cmd_class.init_parser(subparser)
+    parser.set_defaults(cmd_name=None)
+    add_profile_arguments(parser)
+
+    # Import and configure only the command that is going to be run.
+    selected = _get_command_name(argv)
+    cmd_class = None
+    for name, info in sorted(registry.items()):
+        subparser = subparsers.add_parser(name=name, help=info.help)
+        subparser.set_defaults(cmd_name=name)
+        add_profile_arguments(subparser, subcommand=True)
+        if name == selected:
+            cmd_class = info.load()
+            cmd_class.init_parser(subparser)
     args = parser.parse_args(argv)
 
-    cmd_class = args.cmd
     if cmd_class is None:
         parser.print_help()
         return 1
-    cmd = cmd_class(args=args, stdin=stdin, stdout=stdout)
-    return cmd.run()
+    profiler = Profiler.from_args(args)
+    cmd = cmd_class(args=args, stdin=stdin, stdout=stdout, profiler=profiler)
+    with profiler.run(args.cmd_name):
+        return cmd.run()
 
 
 def entrypoint() -> NoReturn:
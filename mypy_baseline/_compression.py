@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path, PurePath
+from typing import IO, Any, Iterable, Iterator
+
+
+# File extensions of supported compression formats.
+# `.zst` requires Python 3.14+ or the `zstandard` package.
+GZIP = '.gz'
+XZ = '.xz'
+ZSTD = '.zst'
+COMPRESSIONS = (GZIP, XZ, ZSTD)
+# How many bytes to decompress at once when streaming.
+CHUNK_SIZE = 2 ** 16
+
+
+def get_compression(path: PurePath) -> str:
+    """Get the extension of the compression format of the file, empty if not compressed.
+    """
+    suffix = path.suffix
+    if suffix in COMPRESSIONS:
+        return suffix
+    return ''
+
+
+def strip_compression(path: Path) -> Path:
+    """Remove the compression extension from the path, if any.
+    """
+    if get_compression(path):
+        return path.with_suffix('')
+    return path
+
+
+def open_reader(stream: IO[bytes], compression: str) -> IO[bytes] | io.BufferedIOBase:
+    """Wrap the binary stream to decompress it while reading.
+    """
+    if compression == GZIP:
+        import gzip
+        return gzip.GzipFile(fileobj=stream, mode='rb')
+    if compression == XZ:
+        import lzma
+        return lzma.LZMAFile(stream, mode='rb')
+    if compression == ZSTD:
+        return _open_zstd(stream, mode='rb')
+    return stream
+
+
+def open_writer(stream: IO[bytes], compression: str) -> IO[bytes] | io.BufferedIOBase:
+    """Wrap the binary stream to compress everything written into it.
+
+    Closing the returned stream flushes the compressed data
+    but doesn't close the original stream.
+    """
+    if compression == GZIP:
+        import gzip
+
+        # Don't store the timestamp, so that the same content
+        # is always compressed into the same bytes.
+        return gzip.GzipFile(filename='', fileobj=stream, mode='wb', mtime=0)
+    if compression == XZ:
+        import lzma
+        return lzma.LZMAFile(stream, mode='wb')
+    if compression == ZSTD:
+        return _open_zstd(stream, mode='wb')
+    return stream
+
+
+def read_lines(path: Path) -> list[str]:
+    """Read lines of the text file, decompressing it if needed.
+
+    Raises FileNotFoundError if there is no such file.
+    """
+    with path.open('rb') as stream:
+        with open_reader(stream, get_compression(path)) as reader:
+            return reader.read().decode('utf8').splitlines()
+
+
+def decompress(data: bytes, path: PurePath) -> bytes:
+    """Decompress the content of the file at the given path.
+
+    Used for files that aren't on the disk, like blobs from git history.
+    """
+    compression = get_compression(path)
+    if not compression:
+        return data
+    with open_reader(io.BytesIO(data), compression) as reader:
+        return reader.read()
+
+
+def iter_decompressed(chunks: Iterable[bytes], compression: str) -> Iterator[bytes]:
+    """Decompress the content that comes in chunks without reading all of it.
+    """
+    if not compression:
+        yield from chunks
+        return
+    stream = io.BufferedReader(_ChunksStream(chunks), CHUNK_SIZE)
+    with open_reader(stream, compression) as reader:
+        yield from iter(lambda: reader.read(CHUNK_SIZE), b'')
+
+
+class _ChunksStream(io.RawIOBase):
+    """Binary stream reading from an iterator of chunks.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._buffer = b''
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+def _open_zstd(stream: IO[bytes], mode: str) -> IO[bytes]:
+    try:
+        from compression import zstd
+    except ImportError:
+        pass
+    else:
+        return zstd.ZstdFile(stream, mode=mode)
+    try:
+        import zstandard
+    except ImportError:
+        msg = 'Python 3.14+ or zstandard package is required for .zst baseline'
+        raise ImportError(msg) from None
+    if mode == 'rb':
+        return zstandard.ZstdDecompressor().stream_reader(stream)
+    return zstandard.ZstdCompressor().stream_writer(stream, closefd=False)
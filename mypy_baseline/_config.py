@@ -2,30 +2,19 @@ from __future__ import annotations
 
 import dataclasses
 import os
-import re
 from argparse import ArgumentParser
 from functools import cached_property
 from pathlib import Path
 from typing import Any
 
-
-try:
-    import toml
-except ImportError:
-    toml = None  # type: ignore[assignment]
-try:
-    import tomli
-except ImportError:
-    # https://peps.python.org/pep-0680/
-    try:
-        import tomllib as tomli
-    except ImportError:
-        tomli = None
+from ._ignore import IgnoreMatcher
 
 
 @dataclasses.dataclass
 class Config:
     baseline_path: Path = Path('mypy-baseline.txt')
+    baseline_index: bool = False
+    shard_depth: int = 0
     depth: int = 40
     allow_unsynced: bool = False
     preserve_position: bool = False
@@ -35,6 +24,8 @@ class Config:
     ignore: list[str] = dataclasses.field(default_factory=list)
     ignore_categories: list[str] = dataclasses.field(default_factory=list)
     default_branch: str = ''
+    input_format: str = 'auto'
+    cache_dir: Path | None = None
 
     @classmethod
     def from_args(cls, args: dict[str, Any]) -> Config:
@@ -43,6 +34,8 @@ class Config:
         config = config.read_args(args)
         if isinstance(config.baseline_path, str):
             config.baseline_path = Path(config.baseline_path)
+        if isinstance(config.cache_dir, str):
+            config.cache_dir = Path(config.cache_dir)
         return config
 
     @classmethod
@@ -56,6 +49,14 @@ class Config:
             '--baseline-path', type=Path,
             help='path to the file where to store baseline.',
         )
+        add(
+            '--baseline-index', action='store_const', const=True,
+            help='cache the parsed baseline in a file next to it.',
+        )
+        add(
+            '--shard-depth', type=int,
+            help='split the baseline into files by that many first directories.',
+        )
         add(
             '--depth', type=int,
             help='cut paths longer than that many directories deep.'
@@ -93,18 +94,22 @@ class Config:
             '--default-branch',
             help='default git branch name.',
         )
+        add(
+            '--input-format', choices=('auto', 'text', 'json'),
+            help='format of mypy output, "json" is for `mypy -O json`.',
+        )
+        add(
+            '--cache-dir', type=Path,
+            help='where to cache the baseline history, inside `.git` by default.',
+        )
 
     def read_file(self, path: Path) -> Config:
         if not path.exists():
             return self
 
         # parse the config file
-        if tomli is not None:
-            with path.open('rb') as stream:
-                data = tomli.load(stream)
-        elif toml is not None:
-            data = dict(toml.load(path))
-        else:
+        data = _load_toml(path)
+        if data is None:
             return self
 
         # extract the right section from the config
@@ -126,22 +131,52 @@ class Config:
         return config
 
     @cached_property
-    def _ignore_regexes(self) -> list[re.Pattern[str]]:
-        result = []
+    def _ignore_matcher(self) -> IgnoreMatcher:
         assert isinstance(self.ignore, list)
-        for pattern in self.ignore:
-            try:
-                result.append(re.compile(pattern))
-            except re.error:
-                raise ValueError(f'Invalid pattern: {pattern}')
-        return result
+        return IgnoreMatcher(self.ignore)
+
+    @cached_property
+    def _ignored_categories(self) -> frozenset[str]:
+        return frozenset(self.ignore_categories)
 
     def is_ignored(self, msg: str) -> bool:
         """Check if the message matches any ignore pattern from the config.
         """
-        return any(rex.fullmatch(msg) for rex in self._ignore_regexes)
+        if not self.ignore:
+            return False
+        return self._ignore_matcher.match(msg) is not None
+
+    def matching_ignore(self, msg: str) -> str | None:
+        """Get the ignore pattern from the config that matches the message.
+        """
+        if not self.ignore:
+            return None
+        return self._ignore_matcher.match(msg)
 
     def is_ignored_category(self, category: str) -> bool:
         """Check if the category matches any ignore pattern from the config.
         """
-        return category in self.ignore_categories
+        return category in self._ignored_categories
+
+
+def _load_toml(path: Path) -> dict[str, Any] | None:
+    """Parse the TOML file, None if there is no TOML parser installed.
+
+    The parser is imported only when needed because it takes a noticeable time.
+    """
+    try:
+        import tomli
+    except ImportError:
+        # https://peps.python.org/pep-0680/
+        try:
+            import tomllib as tomli
+        except ImportError:
+            tomli = None
+    if tomli is not None:
+        with path.open('rb') as stream:
+            return tomli.load(stream)
+    try:
+        import toml
+    except ImportError:
+        return None
+    return dict(toml.load(path))
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import socket
+from argparse import ArgumentParser
+from pathlib import Path
+
+
+# The socket is created in the current directory, so that every project
+# has its own daemon with its own config and baseline.
+DEFAULT_SOCKET = Path('.mypy-baseline.sock')
+# How many bytes to read from the socket at once.
+CHUNK_SIZE = 2 ** 16
+# How long the client waits for the daemon to respond, in seconds.
+TIMEOUT = 60.0
+
+
+def add_socket_argument(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        '--socket', type=Path, default=DEFAULT_SOCKET,
+        help='path to the Unix socket of the daemon.',
+    )
+
+
+def is_supported() -> bool:
+    """Check if Unix sockets are available on this platform.
+    """
+    return hasattr(socket, 'AF_UNIX')
+
+
+def send_request(path: Path, data: bytes) -> tuple[int, str]:
+    """Send mypy output to the daemon and get the exit code and the filtered output.
+
+    Raises OSError if the daemon isn't running.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(TIMEOUT)
+        conn.connect(str(path))
+        conn.sendall(data)
+        conn.shutdown(socket.SHUT_WR)
+        response = recv_all(conn)
+    return decode_response(response)
+
+
+def recv_all(conn: socket.socket) -> bytes:
+    """Read everything from the socket until the other side stops sending.
+    """
+    chunks = []
+    for chunk in iter(lambda: conn.recv(CHUNK_SIZE), b''):
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+def encode_response(code: int, output: str) -> bytes:
+    """Serialize the response: the exit code on the first line and then the output.
+    """
+    return f'{code}\n{output}'.encode('utf8')
+
+
+def decode_response(data: bytes) -> tuple[int, str]:
+    header, _, output = data.decode('utf8').partition('\n')
+    try:
+        code = int(header)
+    except ValueError:
+        raise ConnectionError('invalid response from the daemon') from None
+    return code, output
@@ -1,16 +1,16 @@
 from __future__ import annotations
 
+import json
 import re
-from dataclasses import dataclass
-from functools import cached_property
 from pathlib import Path
-from typing import TYPE_CHECKING
+from sys import intern
+from typing import TYPE_CHECKING, Optional, Tuple
 
 
 if TYPE_CHECKING:
     from ._config import Config
 
-REX_COLOR = re.compile('(\x1b\\[\\d*m?|\x0f)*')
+REX_COLOR = re.compile('(?:\x1b\\[\\d*m?|\x0f)+')
 REX_COLOR_NBQA = re.compile(r'\[\d*\x1bm|\x1b|\(B')
 REX_LINE = re.compile(r"""
     (?P<path>.+\.pyi?):
@@ -29,6 +29,16 @@ REX_LINE_NBQA = re.compile(r"""
     \s*
 """, re.VERBOSE | re.MULTILINE)
 REX_LINE_IN_MSG = re.compile(r'defined on line \d+')
+REX_CATEGORY = re.compile(r'[a-z-]+')
+
+# path, line number, severity, message, category
+Fields = Tuple[str, str, str, str, Optional[str]]
+
+
+def _has_color_codes(line: str) -> bool:
+    """Check if the line might have something for `_remove_color_codes` to remove.
+    """
+    return '\x1b' in line or '\x0f' in line or '(B' in line
 
 
 def _remove_color_codes(line: str) -> str:
@@ -36,48 +46,237 @@ def _remove_color_codes(line: str) -> str:
     return REX_COLOR_NBQA.sub('', line)
 
 
-@dataclass
+def _parse_regex(line: str) -> Fields | None:
+    """Parse the line (with color codes removed) using regular expressions.
+
+    It's slow but handles all possible edge cases.
+    """
+    match = REX_LINE.fullmatch(line) or REX_LINE_NBQA.fullmatch(line)
+    if match is None:
+        return None
+    path, lineno, severity, message, category = match.groups()
+    return (path, lineno, severity, message, category)
+
+
+def _parse_fast(line: str) -> Fields | None:
+    """Parse the line using string operations.
+
+    The line must have color codes removed. Handles only the most common
+    form of mypy output lines and returns None for everything else,
+    so that `_parse_regex` could take care of it.
+    """
+    # Find where the path ends. If the message has something looking like
+    # a path as well, the regex might pick a different split.
+    py_pos = line.find('.py:')
+    pyi_pos = line.find('.pyi:')
+    if pyi_pos != -1 and (py_pos == -1 or pyi_pos < py_pos):
+        path_end = pyi_pos + 4
+    elif py_pos != -1:
+        path_end = py_pos + 3
+    else:
+        return None
+    if path_end <= 4 or '\n' in line[:-1]:
+        return None
+    rest = line[path_end + 1:]
+    if '.py:' in rest or '.pyi:' in rest:
+        return None
+
+    # line number and optional column number
+    lineno, _, rest = rest.partition(':')
+    if not lineno.isdigit() or not lineno.isascii():
+        return None
+    if rest[:1].isdigit():
+        column, _, rest = rest.partition(':')
+        if not column.isdigit() or not column.isascii():
+            return None
+
+    # severity
+    if rest[:1] != ' ':
+        return None
+    severity, sep, message = rest[1:].partition(': ')
+    if not sep or not severity.isalpha() or not severity.isascii():
+        return None
+    if not severity.islower():
+        return None
+
+    # message and optional category
+    message = message.rstrip()
+    category: str | None = None
+    if message.endswith(']'):
+        cat_start = message.rfind('  [')
+        if cat_start == -1:
+            return None
+        if not REX_CATEGORY.fullmatch(message, cat_start + 3, len(message) - 1):
+            return None
+        category = message[cat_start + 3:-1]
+        message = message[:cat_start]
+    if not message:
+        return None
+    return (line[:path_end], lineno, severity, message, category)
+
+
+def parse(line: str) -> Fields | None:
+    """Parse a line of mypy output.
+
+    Returns None if the line is not an error message.
+    """
+    # Quick check that skips most of the lines that aren't errors,
+    # like the summary at the end of mypy output.
+    if '.py' not in line and '.ipynb:' not in line:
+        return None
+    if _has_color_codes(line):
+        line = _remove_color_codes(line)
+    return _parse_fast(line) or _parse_regex(line)
+
+
+def truncate_path(path: str, depth: int) -> str:
+    """Cut the path to be not more than `depth` directories deep.
+
+    The path uses forward slashes as separators.
+    """
+    # Paths that need normalization go through pathlib.
+    if depth <= 0 or '\\' in path or '//' in path or '/./' in path:
+        return _truncate_path_slow(path, depth)
+    if path.startswith(('/', './')):
+        return _truncate_path_slow(path, depth)
+    parts = path.split('/', depth)
+    if len(parts) <= depth:
+        return path
+    return '/'.join(parts[:depth])
+
+
+def _truncate_path_slow(path: str, depth: int) -> str:
+    return str(Path(*Path(path).parts[:depth])).replace('\\', '/')
+
+
 class Error:
-    raw_line: str
-    _match: re.Match[str]
+    """A single error from mypy output.
+
+    There might be hundreds of thousands of errors, so the class is kept compact:
+    only the parsed fields are stored, and the repeated strings are interned.
+    """
+    __slots__ = ('raw_path', 'line_number', 'severity', 'message', 'category')
+
+    def __init__(
+        self,
+        raw_path: str,
+        line_number: int,
+        severity: str,
+        message: str,
+        category: str,
+    ) -> None:
+        self.raw_path = raw_path
+        self.line_number = line_number
+        self.severity = severity
+        self.message = message
+        self.category = category
 
     @classmethod
-    def new(self, line: str) -> Error | None:
-        line = _remove_color_codes(line)
-        match = REX_LINE.fullmatch(line) or REX_LINE_NBQA.fullmatch(line)
-        if match is None:
+    def new(cls, line: str) -> Error | None:
+        fields = parse(line)
+        if fields is None:
             return None
-        return Error(line, match)
+        path, lineno, severity, message, category = fields
+        return cls(
+            raw_path=intern(path),
+            line_number=int(lineno),
+            severity=intern(severity),
+            message=message,
+            category=intern(category or 'note'),
+        )
 
-    @cached_property
-    def path(self) -> Path:
-        return Path(self._match.group('path'))
+    @classmethod
+    def from_json(cls, line: str) -> list[Error]:
+        """Parse a line of mypy output in JSON format (`mypy -O json`).
+
+        Notes attached to the error ("hint") are returned as separate errors
+        with "note" severity, the same way as mypy shows them in text output.
+        Returns an empty list if the line is not a valid mypy error.
+        """
+        try:
+            data = json.loads(line)
+        except ValueError:
+            return []
+        if not isinstance(data, dict):
+            return []
+        path = data.get('file')
+        lineno = data.get('line')
+        severity = data.get('severity')
+        message = data.get('message')
+        if not isinstance(path, str) or not isinstance(lineno, int):
+            return []
+        if not isinstance(severity, str) or not isinstance(message, str):
+            return []
+        code = data.get('code')
+        if not isinstance(code, str) or not code:
+            code = 'note'
+        path = intern(path)
+        lineno = max(lineno, 0)
+        note = intern('note')
+        errors = [cls(
+            raw_path=path,
+            line_number=lineno,
+            severity=intern(severity),
+            message=message,
+            category=intern(code),
+        )]
+        hint = data.get('hint')
+        if isinstance(hint, str):
+            for hint_line in hint.splitlines():
+                if hint_line.strip():
+                    errors.append(cls(path, lineno, note, hint_line, note))
+        return errors
 
-    @cached_property
-    def line_number(self) -> int:
-        result = int(self._match.group('lineno'))
-        assert result >= 0
-        return result
+    @property
+    def path(self) -> Path:
+        return Path(self.raw_path)
 
-    @cached_property
-    def severity(self) -> str:
-        return self._match.group('severity')
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{type(self).__name__}({fields})'
 
-    @cached_property
-    def message(self) -> str:
-        return self._match.group('message')
+    def __reduce__(self) -> tuple[type[Error], tuple[str, int, str, str, str]]:
+        # Pickle errors as a tuple of arguments, it's faster and more compact
+        # than the default pickling of objects with slots.
+        fields = (
+            self.raw_path, self.line_number, self.severity,
+            self.message, self.category,
+        )
+        return (type(self), fields)
 
-    @cached_property
-    def category(self) -> str:
-        return self._match.group('category') or 'note'
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Error):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
 
     def get_clean_line(self, config: Config) -> str:
-        path = str(Path(*self.path.parts[:config.depth])).replace('\\', '/')
+        path = truncate_path(self.raw_path, config.depth)
         pos = self.line_number if config.preserve_position else 0
-        msg = REX_COLOR.sub('', self.message).strip()
-        msg = REX_COLOR_NBQA.sub('', msg).strip()
-        msg = REX_LINE_IN_MSG.sub('defined on line 0', msg)
+        msg = self.message
+        if _has_color_codes(msg):
+            msg = REX_COLOR.sub('', msg).strip()
+            msg = REX_COLOR_NBQA.sub('', msg)
+        msg = msg.strip()
+        if 'defined on line' in msg:
+            msg = REX_LINE_IN_MSG.sub('defined on line 0', msg)
         line = f'{path}:{pos}: {self.severity}: {msg}'
         if self.category != 'note':
             line += f'  [{self.category}]'
         return line
+
+
+def parse_line(config: Config, line: str) -> list[tuple[Error, str]]:
+    """Parse the line of mypy output and generate clean lines for the baseline.
+
+    The line might be in text or JSON format, depending on `input_format`.
+    In JSON format, one line might produce multiple errors.
+    If the line is not an error, returns an empty list.
+    """
+    errors: list[Error] = []
+    if config.input_format != 'text' and line.startswith('{'):
+        errors = Error.from_json(line)
+    if not errors and config.input_format != 'json':
+        error = Error.new(line)
+        if error is not None:
+            errors = [error]
+    return [(error, error.get_clean_line(config)) for error in errors]
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import datetime
+from pathlib import PurePath
+from typing import Iterable, Iterator
+
+
+# Machine-readable formats in which `history` can export data.
+FORMATS = ('json', 'ndjson', 'csv')
+
+
+def iter_export(rows: Iterable[dict[str, object]], fmt: str) -> Iterator[str]:
+    """Serialize rows in the given format and produce the output line by line.
+
+    Rows are serialized as they come, so the output can be consumed
+    while the rows are still being generated. All rows must have the same keys.
+    """
+    if fmt == 'ndjson':
+        for row in rows:
+            yield json.dumps(_clean_row(row))
+    elif fmt == 'json':
+        # A list of objects, one object per line.
+        prefix = '['
+        for row in rows:
+            yield prefix + json.dumps(_clean_row(row))
+            prefix = ','
+        yield ']' if prefix == ',' else '[]'
+    elif fmt == 'csv':
+        buffer = io.StringIO()
+        writer: csv.DictWriter | None = None
+        for row in rows:
+            row = _clean_row(row)
+            if writer is None:
+                writer = csv.DictWriter(buffer, fieldnames=list(row), lineterminator='')
+                writer.writeheader()
+                yield _pop_buffer(buffer)
+            writer.writerow(row)
+            yield _pop_buffer(buffer)
+    else:
+        raise ValueError(f'unsupported format: {fmt}')
+
+
+def _clean_row(row: dict[str, object]) -> dict[str, object]:
+    """Convert values into types that can be serialized in any format.
+    """
+    result: dict[str, object] = {}
+    for key, value in row.items():
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, PurePath):
+            value = value.as_posix()
+        result[key] = value
+    return result
+
+
+def _pop_buffer(buffer: io.StringIO) -> str:
+    value = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return value
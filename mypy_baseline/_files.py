@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from hashlib import sha256
+from pathlib import Path
+
+from ._compression import get_compression, open_reader, open_writer
+
+
+# How many bytes to read at once when calculating the digest of a file.
+CHUNK_SIZE = 2 ** 16
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Atomically write the content into the file if it's different.
+
+    If the file already has the same content, it isn't touched at all,
+    so its modification time stays the same and file watchers aren't triggered.
+    Otherwise, the content is written into a temporary file which is synced
+    to the disk and then replaces the original one, so the file is never left
+    half-written, even if the system crashes.
+
+    If the file has a compression extension (like `.gz`), the content is compressed.
+    The check for the same content compares the uncompressed content.
+
+    Returns False if the file is unchanged.
+    """
+    data = content.encode('utf8')
+    compression = get_compression(path)
+    if _has_content(path, data, compression):
+        return False
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent,
+        prefix=f'.{path.name}.',
+        suffix='.tmp',
+    )
+    try:
+        with os.fdopen(fd, 'wb') as stream:
+            if compression:
+                with open_writer(stream, compression) as writer:
+                    writer.write(data)
+            else:
+                stream.write(data)
+            # The content must be on the disk before the file is replaced.
+            # Otherwise, a crash might leave an empty file instead of both.
+            stream.flush()
+            os.fsync(stream.fileno())
+        _copy_mode(path, tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(path.parent)
+    return True
+
+
+def _has_content(path: Path, data: bytes, compression: str) -> bool:
+    """Check if the file has exactly the given content after decompression.
+    """
+    try:
+        # The size of a compressed file says nothing about its content.
+        if not compression and path.stat().st_size != len(data):
+            return False
+        digest = sha256()
+        with path.open('rb') as stream:
+            reader = open_reader(stream, compression)
+            for chunk in iter(lambda: reader.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+    except ImportError:
+        raise
+    except Exception:
+        # The file is missing, unreadable, or corrupted, so it needs to be rewritten.
+        return False
+    return digest.digest() == sha256(data).digest()
+
+
+def _fsync_dir(path: Path) -> None:
+    """Make sure that the replaced file in the directory is on the disk.
+
+    Directories cannot be opened on Windows, and it's not needed there.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _copy_mode(src: Path, dst: str) -> None:
+    """Make the new file to have the same permissions as the one it replaces.
+
+    Temporary files are created readable only by the owner.
+    """
+    try:
+        mode = src.stat().st_mode
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    os.chmod(dst, mode & 0o7777)
@@ -2,25 +2,139 @@ from __future__ import annotations
 
 import re
 import subprocess
-from dataclasses import asdict, dataclass
-from datetime import datetime
+from collections import Counter
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
 from functools import cached_property
-from pathlib import Path
-from typing import Iterator
-
-
-REX_COMMIT = re.compile(
-    (
-        r'(?P<hash>[0-9a-f]{40}) '
-        r'(?P<created_at>[0-9T:+-]+)\s+'
-        r'(?P<author_email>[^\s]+)\s+'
-        r'.+ \| \d+ [+-]+\s+'
-        r'\d+ files? changed'
-        r'(?:, (?P<insertions>\d+) insertions?\(\+\))?'
-        r'(?:, (?P<deletions>\d+) deletions?\(\-\))?'
-    ),
-    re.MULTILINE
+from pathlib import Path, PurePath
+from typing import Iterable, Iterator, Sequence
+
+from ._compression import COMPRESSIONS, get_compression, iter_decompressed
+
+
+# The first line of each commit in `git log` output.
+REX_HEADER = re.compile(
+    r'(?P<hash>[0-9a-f]{40}) (?P<created_at>[0-9T:+-]+) (?P<author_email>[^\s]+)$',
+)
+# The line with `--shortstat` stats that follows the header.
+REX_STAT = re.compile(
+    r'\s*\d+ files? changed'
+    r'(?:, (?P<insertions>\d+) insertions?\(\+\))?'
+    r'(?:, (?P<deletions>\d+) deletions?\(\-\))?'
 )
+# How many bytes of an object to read at once.
+CHUNK_SIZE = 2 ** 16
+# The mode of subdirectories in git tree objects.
+TREE_MODE = b'40000'
+
+
+class ObjectReader:
+    """Read objects from the git database.
+
+    All objects are read through one long-living `git cat-file --batch` process,
+    so that reading many objects doesn't spawn a process for each of them.
+    The process is started on the first request.
+    """
+    __slots__ = ('_proc',)
+
+    def __init__(self) -> None:
+        self._proc: subprocess.Popen[bytes] | None = None
+
+    def iter_blob(self, rev: str) -> Iterator[bytes]:
+        """Read the content of the file in chunks.
+
+        Raises FileNotFoundError if there is no such file.
+        """
+        header = self._request(rev)
+        if header is None:
+            raise FileNotFoundError(f'no such object in git: {rev}')
+        _, obj_type, size = header
+        chunks = self._read_body(size)
+        try:
+            if obj_type != 'blob':
+                raise FileNotFoundError(f'the git object is not a file: {rev}')
+            # Not `yield from`, it would close `chunks` when closing the generator.
+            for chunk in chunks:
+                yield chunk
+        finally:
+            # The content must be read to the end, even if the caller
+            # doesn't need it, to get to the next response.
+            for _ in chunks:
+                pass
+
+    def iter_files(self, rev: str, path: str) -> Iterator[tuple[str, str]]:
+        """Iterate over all files in the directory at the given commit.
+
+        For each file, produce its path and the oid of its content.
+        If the path is a file, only this file is produced.
+        """
+        header = self._request(f'{rev}:{path}')
+        if header is None:
+            return
+        oid, obj_type, size = header
+        if obj_type == 'blob':
+            for _ in self._read_body(size):
+                pass
+            yield path, oid
+            return
+        content = b''.join(self._read_body(size))
+        if obj_type != 'tree':
+            return
+        # The binary oid in the tree takes half of the hex one in the header.
+        for name, is_tree, sub_oid in _parse_tree(content, oid_size=len(oid) // 2):
+            sub_path = f'{path}/{name}'
+            if is_tree:
+                yield from self.iter_files(rev, sub_path)
+            else:
+                yield sub_path, sub_oid
+
+    def close(self) -> None:
+        if self._proc is None:
+            return
+        assert self._proc.stdin is not None
+        assert self._proc.stdout is not None
+        self._proc.stdin.close()
+        self._proc.stdout.close()
+        self._proc.wait()
+        self._proc = None
+
+    def __del__(self) -> None:
+        self.close()
+
+    def _request(self, rev: str) -> tuple[str, str, int] | None:
+        """Ask for the object and get its oid, type, and size.
+
+        Returns None if there is no such object.
+        """
+        if self._proc is None:
+            cmd = ['git', 'cat-file', '--batch']
+            self._proc = subprocess.Popen(
+                cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            )
+        assert self._proc.stdin is not None
+        assert self._proc.stdout is not None
+        self._proc.stdin.write(f'{rev}\n'.encode())
+        self._proc.stdin.flush()
+        # The header is "<oid> <type> <size>" or "<rev> missing".
+        header = self._proc.stdout.readline().split()
+        if not header:
+            raise RuntimeError('git cat-file has exited unexpectedly')
+        if len(header) != 3:
+            return None
+        return header[0].decode(), header[1].decode(), int(header[2])
+
+    def _read_body(self, size: int) -> Iterator[bytes]:
+        assert self._proc is not None
+        assert self._proc.stdout is not None
+        stdout = self._proc.stdout
+        while size:
+            chunk = stdout.read(min(size, CHUNK_SIZE))
+            if not chunk:
+                raise RuntimeError('git cat-file has exited unexpectedly')
+            size -= len(chunk)
+            yield chunk
+        # Each object is followed by a new line.
+        stdout.read(1)
 
 
 @dataclass
@@ -31,17 +145,63 @@ class Commit:
     created_at: datetime
     insertions: int
     deletions: int
+    objects: ObjectReader = field(default_factory=ObjectReader, repr=False)
 
     @cached_property
     def lines_count(self) -> int:
+        """How many non-empty lines the baseline has at the commit.
+
+        Raises FileNotFoundError if there is no baseline at the commit.
+        """
+        count = 0
+        for _, chunks in self._iter_files(missing_ok=False):
+            count += _count_lines(chunks)
+        return count
+
+    def read_lines(self) -> Counter[bytes]:
+        """Read the baseline at the commit and count how many times each line occurs.
+
+        For a directory, lines of all files in it are counted. Empty lines
+        are skipped. If there is no baseline at the commit, nothing is counted.
+        """
+        lines: Counter[bytes] = Counter()
+        for _, chunks in self._iter_files(missing_ok=True):
+            lines.update(line for line in _iter_lines(chunks) if line.strip())
+        return lines
+
+    def get_files(self, missing_ok: bool = True) -> dict[str, str]:
+        """Get paths of the baseline files at the commit and oids of their content.
+
+        Files with the same oid have the same content, even at different commits.
+        If there is no baseline at the commit, raises FileNotFoundError
+        or, if `missing_ok` is True, returns an empty dict.
+        """
         path = self.path
         if path.is_absolute():
             path = path.relative_to(Path().absolute())
-        cmd = ['git', 'show', f'{self.hash}:{path}']
-        result = subprocess.run(cmd, stdout=subprocess.PIPE)
-        result.check_returncode()
-        lines = result.stdout.decode().strip().splitlines()
-        return len(lines)
+        files = dict(self.objects.iter_files(self.hash, path.as_posix()))
+        # git doesn't store empty directories, so no files means no baseline.
+        if not files and not missing_ok:
+            raise FileNotFoundError(f'{path} does not exist at commit {self.hash}')
+        return files
+
+    def read_file_lines(self, name: str, oid: str) -> Counter[bytes]:
+        """Count how many times each line occurs in the baseline file.
+        """
+        chunks = self.objects.iter_blob(oid)
+        chunks = iter_decompressed(chunks, get_compression(PurePath(name)))
+        # Splitting the whole content at once is much faster than line by line.
+        lines = b''.join(chunks).split(b'\n')
+        if not lines[-1]:
+            lines.pop()
+        return Counter(lines)
+
+    def _iter_files(self, missing_ok: bool) -> Iterator[tuple[str, Iterator[bytes]]]:
+        """Iterate over the baseline files at the commit and their decompressed content.
+        """
+        for name, oid in self.get_files(missing_ok=missing_ok).items():
+            chunks = self.objects.iter_blob(oid)
+            yield name, iter_decompressed(chunks, get_compression(PurePath(name)))
 
     def fix_lines_count(self, prev_count: int | None) -> None:
         """
@@ -54,23 +214,158 @@ class Commit:
             self.lines_count = prev_count + self.insertions - self.deletions
 
     def as_dict(self) -> dict[str, object]:
-        result = asdict(self)
+        result = {f.name: getattr(self, f.name) for f in fields(self) if f.repr}
         result['lines_count'] = self.lines_count
         return result
 
 
-def get_commits(path: Path) -> Iterator[Commit]:
-    cmd = ['git', 'log', '--format=%H %cI %ae', '--reverse', '--stat', '--', str(path)]
-    result = subprocess.run(cmd, stdout=subprocess.PIPE)
-    result.check_returncode()
-    stdout = result.stdout.decode()
-    for match in REX_COMMIT.finditer(stdout):
-        info = match.groupdict()
-        yield Commit(
+def read_lines_at(path: Path, rev: str, objects: ObjectReader) -> Counter[bytes]:
+    """Read the baseline at any git revision, like a branch name.
+
+    See `Commit.read_lines`. Unlike `git diff`, it works for a compressed baseline.
+    """
+    commit = Commit(
+        path=path,
+        hash=rev,
+        author_email='',
+        created_at=datetime.fromtimestamp(0, timezone.utc),
+        insertions=0,
+        deletions=0,
+        objects=objects,
+    )
+    return commit.read_lines()
+
+
+def get_commits(
+    path: Path,
+    since: Commit | None = None,
+    git_args: Sequence[str] = (),
+) -> Iterator[Commit]:
+    """Iterate over commits that changed the baseline, from the oldest one.
+
+    If `since` is specified, only commits after it are produced.
+    The `git_args` are passed to `git log` to limit commits, like `--max-count`.
+    """
+    # For a directory, the stats are summed for all files in it.
+    cmd = ['git', 'log', '--format=%H %cI %ae', '--reverse', '--shortstat']
+    cmd.extend(git_args)
+    if since is not None:
+        cmd.append(f'{since.hash}..HEAD')
+    cmd += ['--', str(path)]
+    objects = ObjectReader()
+    # git doesn't show line stats for binary files, so for a compressed baseline
+    # we have to read it at every commit and compare with the previous one.
+    compressed = _is_compressed(path)
+    prev_lines: Counter[bytes] = Counter()
+    if compressed and since is not None:
+        prev_lines = since.read_lines()
+    for info in _iter_log(cmd):
+        commit = Commit(
             path=path,
             hash=info['hash'],
             author_email=info['author_email'],
             created_at=datetime.fromisoformat(info['created_at']),
             insertions=int(info['insertions'] or '0'),
             deletions=int(info['deletions'] or '0'),
+            objects=objects,
         )
+        if compressed:
+            lines = commit.read_lines()
+            commit.insertions = sum((lines - prev_lines).values())
+            commit.deletions = sum((prev_lines - lines).values())
+            prev_lines = lines
+        yield commit
+
+
+def _iter_log(cmd: list[str]) -> Iterator[dict[str, str]]:
+    """Run `git log` and parse commits from its output as it goes.
+
+    The output isn't loaded in memory at once, so the history can be huge,
+    and the first commits are produced before git walks the whole history.
+    Commits without stats (like merge commits) are skipped.
+    """
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    assert proc.stdout is not None
+    with proc:
+        try:
+            info: dict[str, str] | None = None
+            for raw_line in proc.stdout:
+                line = raw_line.decode()
+                match = REX_HEADER.match(line)
+                if match is not None:
+                    info = match.groupdict()
+                    continue
+                match = REX_STAT.match(line)
+                if match is not None and info is not None:
+                    info.update(match.groupdict(default=''))
+                    yield info
+                    info = None
+        except GeneratorExit:
+            # The caller doesn't need more commits, no need to walk the history.
+            proc.kill()
+            raise
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def is_ancestor(commit: str) -> bool:
+    """Check if the commit is in the history of the current HEAD.
+    """
+    cmd = ['git', 'merge-base', '--is-ancestor', commit, 'HEAD']
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return result.returncode == 0
+
+
+def get_git_dir() -> Path | None:
+    """Get the path to the `.git` directory, None if not in a git repository.
+    """
+    cmd = ['git', 'rev-parse', '--git-dir']
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    if result.returncode != 0:
+        return None
+    return Path(result.stdout.decode().strip())
+
+
+def _is_compressed(path: Path) -> bool:
+    """Check if the baseline file or shards in the baseline directory are compressed.
+    """
+    if not path.is_dir():
+        return bool(get_compression(path))
+    return any(next(path.rglob(f'*{ext}'), None) for ext in COMPRESSIONS)
+
+
+def _parse_tree(content: bytes, oid_size: int) -> Iterator[tuple[str, bool, str]]:
+    """Parse the raw tree object and produce entries.
+
+    For each entry, produce its name, if it is a tree, and its hex oid.
+    Each entry is "<mode> <name>\\0<binary oid>".
+    """
+    pos = 0
+    while pos < len(content):
+        space = content.index(b' ', pos)
+        nul = content.index(b'\0', space)
+        mode = content[pos:space]
+        name = content[space + 1:nul].decode()
+        pos = nul + 1 + oid_size
+        yield name, mode == TREE_MODE, content[nul + 1:pos].hex()
+
+
+def _iter_lines(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Split the content that comes in chunks into lines, without line endings.
+    """
+    tail = b''
+    for chunk in chunks:
+        lines = (tail + chunk).split(b'\n')
+        tail = lines.pop()
+        yield from lines
+    if tail:
+        yield tail
+
+
+def _count_lines(chunks: Iterable[bytes]) -> int:
+    """Count non-empty lines in the content that comes in chunks, without decoding it.
+
+    Lines with only whitespace are empty too, so that an empty baseline
+    that has only a line break has no lines.
+    """
+    return sum(1 for line in _iter_lines(chunks) if line.strip())
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from hashlib import sha256
+from pathlib import Path
+from typing import Iterator, Sequence
+
+from ._files import write_if_changed
+from ._git import Commit, ObjectReader, get_commits, get_git_dir, is_ancestor
+
+
+# Bump it every time the format of the cache file changes.
+CACHE_VERSION = 1
+# The directory inside `.git` where the cache is stored by default.
+GIT_CACHE_DIR = 'mypy-baseline'
+
+
+class HistoryCache:
+    """Commits that changed the baseline, with the baseline size after each of them.
+
+    Getting this information requires going through the whole git history
+    and reading the baseline at some commits, so we cache it. The next time,
+    only commits added since the last cached one are processed.
+    """
+    __slots__ = ('path',)
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    @classmethod
+    def for_baseline(cls, baseline: Path, cache_dir: Path | None) -> HistoryCache | None:
+        """Get the cache for the baseline file or directory.
+
+        If `cache_dir` is not specified, the cache is stored in the git directory.
+        Returns None if there is no place for the cache.
+        """
+        if cache_dir is None:
+            git_dir = get_git_dir()
+            if git_dir is None:
+                return None
+            cache_dir = git_dir / GIT_CACHE_DIR
+        key = sha256(_get_key(baseline).encode()).hexdigest()[:16]
+        return cls(cache_dir / f'history-{key}.json')
+
+    def read(self, baseline: Path) -> list[Commit]:
+        """Read cached commits, an empty list if the cache is missing or outdated.
+        """
+        try:
+            data = json.loads(self.path.read_bytes())
+        except (OSError, ValueError):
+            return []
+        if not isinstance(data, dict) or data.get('version') != CACHE_VERSION:
+            return []
+        if data.get('baseline') != _get_key(baseline):
+            return []
+        commits = []
+        # Share one git process between all commits in case they need to read objects.
+        objects = ObjectReader()
+        for item in data['commits']:
+            commit = Commit(
+                path=baseline,
+                hash=item['hash'],
+                author_email=item['author_email'],
+                created_at=datetime.fromisoformat(item['created_at']),
+                insertions=item['insertions'],
+                deletions=item['deletions'],
+                objects=objects,
+            )
+            commit.lines_count = item['lines_count']
+            commits.append(commit)
+        return commits
+
+    def write(self, baseline: Path, commits: list[Commit]) -> None:
+        data = dict(
+            version=CACHE_VERSION,
+            baseline=_get_key(baseline),
+            commits=[
+                dict(
+                    hash=commit.hash,
+                    author_email=commit.author_email,
+                    created_at=commit.created_at.isoformat(),
+                    insertions=commit.insertions,
+                    deletions=commit.deletions,
+                    lines_count=commit.lines_count,
+                )
+                for commit in commits
+            ],
+        )
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_if_changed(self.path, json.dumps(data))
+        except OSError:
+            # The cache is optional, it's fine if we cannot write it.
+            pass
+
+
+def get_history(
+    baseline: Path,
+    cache: HistoryCache | None = None,
+    git_args: Sequence[str] = (),
+) -> Iterator[Commit]:
+    """Iterate over commits that changed the baseline, from the oldest one.
+
+    The `lines_count` of each commit is adjusted to how the commit affected
+    the size of the baseline after the previous commit.
+
+    If the cache is specified, only commits after the last cached one
+    are processed, and the cache is updated when all commits are consumed.
+    New commits are always added at the end, even if they have been merged
+    from a branch that started before the last cached commit.
+
+    The `git_args` limit commits (see `get_commits`). The cache has the whole
+    history, so it is not used if commits are limited.
+    """
+    if git_args:
+        cache = None
+    cached: list[Commit] = []
+    if cache is not None:
+        cached = cache.read(baseline)
+        # The cached commits are not in the current branch, start from scratch.
+        if cached and not is_ancestor(cached[-1].hash):
+            cached = []
+    yield from cached
+
+    commits = list(cached)
+    prev_count = cached[-1].lines_count if cached else None
+    since = cached[-1] if cached else None
+    for commit in get_commits(baseline, since=since, git_args=git_args):
+        commit.fix_lines_count(prev_count)
+        prev_count = commit.lines_count
+        commits.append(commit)
+        yield commit
+
+    if cache is not None and len(commits) != len(cached):
+        cache.write(baseline, commits)
+
+
+def _get_key(baseline: Path) -> str:
+    return baseline.absolute().as_posix()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+
+# Characters that have a special meaning in regular expressions.
+# If a pattern has none of them, it matches only the exact same string.
+SPECIAL_CHARS = frozenset('.^$*+?{}[]\\|()')
+
+# How many messages to remember. Mypy output often has the same message
+# repeated many times, but the cache shouldn't grow without limits.
+MAX_CACHE_SIZE = 2 ** 16
+
+
+class IgnoreMatcher:
+    """Check if messages fully match any of the ignore patterns.
+
+    Literal patterns are checked with a single hash lookup, and all other
+    patterns are combined into one regex, so the cost of checking a message
+    doesn't grow much with the number of patterns.
+    """
+    __slots__ = (
+        'patterns', '_literals', '_combined', '_combinable', '_regexes', '_cache',
+    )
+
+    patterns: tuple[str, ...]
+    _literals: frozenset[str]
+    _combined: re.Pattern[str] | None
+    # Patterns in the combined regex, the index is the number in the group name.
+    _combinable: tuple[str, ...]
+    _regexes: tuple[tuple[str, re.Pattern[str]], ...]
+    _cache: dict[str, str | None]
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns = tuple(patterns)
+        self._cache = {}
+        literals: set[str] = set()
+        combinable: list[str] = []
+        regexes: list[tuple[str, re.Pattern[str]]] = []
+        for pattern in self.patterns:
+            try:
+                rex = re.compile(pattern)
+            except re.error:
+                raise ValueError(f'Invalid pattern: {pattern}')
+            if SPECIAL_CHARS.isdisjoint(pattern):
+                literals.add(pattern)
+            # Groups would shift numbers of groups in other patterns
+            # and global flags would affect all patterns.
+            elif rex.groups == 0 and rex.flags == re.UNICODE:
+                combinable.append(pattern)
+            else:
+                regexes.append((pattern, rex))
+        self._literals = frozenset(literals)
+        self._combined = None
+        if combinable:
+            combined = '|'.join(f'(?P<p{i}>{p})' for i, p in enumerate(combinable))
+            try:
+                self._combined = re.compile(combined)
+            except re.error:
+                # Each pattern is valid on its own, so it shouldn't happen.
+                # But if it does, check the patterns one by one.
+                regexes.extend((p, re.compile(p)) for p in combinable)
+                combinable = []
+        self._regexes = tuple(regexes)
+        self._combinable = tuple(combinable)
+
+    def match(self, msg: str) -> str | None:
+        """Get a pattern that fully matches the message, None if there are none.
+        """
+        try:
+            return self._cache[msg]
+        except KeyError:
+            pass
+        result = self._match(msg)
+        if len(self._cache) >= MAX_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[msg] = result
+        return result
+
+    def _match(self, msg: str) -> str | None:
+        if msg in self._literals:
+            return msg
+        if self._combined is not None:
+            match = self._combined.fullmatch(msg)
+            if match is not None:
+                assert match.lastgroup is not None
+                return self._combinable[int(match.lastgroup[1:])]
+        for pattern, rex in self._regexes:
+            if rex.fullmatch(msg):
+                return pattern
+        return None
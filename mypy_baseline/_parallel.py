@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import os
+from argparse import ArgumentParser
+from functools import partial
+from typing import Callable, Iterable, Iterator, TypeVar
+
+
+T = TypeVar('T')
+
+# Chunks smaller than that aren't worth sending into another process.
+MIN_CHUNK_SIZE = 2_000
+
+
+def add_jobs_argument(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='how many processes to use for parsing, 0 to use all CPUs.',
+    )
+
+
+def map_lines(
+    func: Callable[[str], T],
+    lines: Iterable[str],
+    jobs: int = 1,
+) -> Iterator[tuple[str, T]]:
+    """Apply the function to each line and produce pairs of the line and the result.
+
+    If jobs is not 1, the lines are split into chunks that are processed
+    in a process pool. The results are still produced in the same order
+    as the lines, so the output is the same as for the sequential processing.
+    The function must be picklable.
+
+    The sequential processing is lazy, the parallel one reads all lines first.
+    """
+    if jobs == 1:
+        return ((line, func(line)) for line in lines)
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    lines = list(lines)
+    # Make 4 chunks per process, so that if one chunk is slow to process,
+    # other processes could pick up the rest of the work.
+    chunk_size = max(MIN_CHUNK_SIZE, -(-len(lines) // (jobs * 4)))
+    if jobs == 1 or len(lines) <= chunk_size:
+        return ((line, func(line)) for line in lines)
+    chunks = [lines[i:i + chunk_size] for i in range(0, len(lines), chunk_size)]
+    return _map_chunks(func, chunks, jobs)
+
+
+def _map_chunks(
+    func: Callable[[str], T],
+    chunks: list[list[str]],
+    jobs: int,
+) -> Iterator[tuple[str, T]]:
+    # Importing it takes a noticeable time, so do it only if the pool is needed.
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as executor:
+        results = executor.map(partial(_map_chunk, func), chunks)
+        for chunk, chunk_results in zip(chunks, results):
+            yield from zip(chunk, chunk_results)
+
+
+def _map_chunk(func: Callable[[str], T], chunk: list[str]) -> list[T]:
+    return [func(line) for line in chunk]
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from argparse import SUPPRESS, ArgumentParser, Namespace
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ContextManager, Iterable, Iterator, Mapping, TextIO, TypeVar
+
+
+T = TypeVar('T')
+
+ENV_VAR = 'MYPY_BASELINE_PROFILE'
+_NULL_CONTEXT = nullcontext()
+_SENTINEL = object()
+
+
+def add_profile_arguments(parser: ArgumentParser, subcommand: bool = False) -> None:
+    """Add flags to enable profiling.
+
+    The flags are accepted both before and after the command name. For the parser
+    of a command, the flags have no defaults, so that they don't override the values
+    given before the command name.
+    """
+    flag_default = SUPPRESS if subcommand else False
+    path_default = SUPPRESS if subcommand else None
+    parser.add_argument(
+        '--profile', action='store_true',
+        help='report time and calls for each phase of the command.',
+        default=flag_default,
+    )
+    parser.add_argument(
+        '--profile-memory', action='store_true',
+        help='also track peak memory for each phase (makes everything much slower).',
+        default=flag_default,
+    )
+    parser.add_argument(
+        '--profile-output', type=Path,
+        help='write the profiling report as JSON into the given file.',
+        default=path_default,
+    )
+    parser.add_argument(
+        '--cprofile', type=Path,
+        help='dump cProfile stats for the command into the given file.',
+        default=path_default,
+    )
+
+
+@dataclass
+class Phase:
+    name: str
+    calls: int = 0
+    # Time spent in the phase itself, excluding nested phases.
+    time: float = 0
+    # The highest amount of memory (in bytes) allocated while in the phase.
+    # None if memory isn't tracked.
+    memory: int | None = None
+
+    def as_dict(self) -> dict[str, object]:
+        return dict(name=self.name, calls=self.calls, time=self.time, memory=self.memory)
+
+
+@dataclass
+class _Frame:
+    # time spent in nested phases
+    children: float = 0
+    # the highest memory peak seen before nested phases reset it
+    peak: int = 0
+
+
+@dataclass
+class Profiler:
+    """Collect time, calls, and memory for phases of a command.
+
+    When disabled, all methods do nothing and cost almost nothing,
+    so the commands can be instrumented unconditionally.
+    """
+    enabled: bool = False
+    memory: bool = False
+    output: Path | None = None
+    cprofile: Path | None = None
+    phases: dict[str, Phase] = field(default_factory=dict)
+    _stack: list[_Frame] = field(default_factory=list)
+
+    @classmethod
+    def from_args(
+        cls,
+        args: Namespace,
+        environ: Mapping[str, str] = os.environ,
+    ) -> Profiler:
+        output: Path | None = args.profile_output
+        enabled: bool = args.profile or args.profile_memory or output is not None
+        env_value = environ.get(ENV_VAR, '')
+        if env_value and env_value != '0':
+            enabled = True
+            if output is None and env_value not in ('1', 'stderr'):
+                output = Path(env_value)
+        return cls(
+            enabled=enabled,
+            memory=args.profile_memory,
+            output=output,
+            cprofile=args.cprofile,
+        )
+
+    def phase(self, name: str) -> ContextManager[None]:
+        """Context manager to attribute the time spent inside to the given phase.
+
+        Phases can be nested and re-entered. The time of a nested phase
+        isn't counted for the outer phase.
+        """
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._phase(name)
+
+    def iterate(self, name: str, items: Iterable[T]) -> Iterable[T]:
+        """Attribute the time spent producing each item to the given phase.
+
+        It's useful when items are lazily produced by a generator.
+        """
+        if not self.enabled:
+            return items
+        return self._iterate(name, items)
+
+    @contextmanager
+    def run(self, name: str) -> Iterator[None]:
+        """Profile the whole command and write the report when it's done.
+        """
+        if not self.enabled and self.cprofile is None:
+            yield
+            return
+
+        profiler = None
+        if self.cprofile is not None:
+            import cProfile
+            profiler = cProfile.Profile()
+        if self.memory:
+            import tracemalloc
+            tracemalloc.start()
+        try:
+            if profiler is not None:
+                profiler.enable()
+            with self.phase(name):
+                yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(str(self.cprofile))
+            if self.memory:
+                tracemalloc.stop()
+            if self.enabled:
+                self.report(sys.stderr)
+
+    def report(self, stream: TextIO) -> None:
+        """Write the report into the file from `--profile-output` or the stream.
+        """
+        phases = sorted(self.phases.values(), key=lambda p: p.time, reverse=True)
+        if self.output is not None:
+            total = sum(p.time for p in phases)
+            data = dict(total=total, phases=[p.as_dict() for p in phases])
+            self.output.write_text(json.dumps(data, indent=2), encoding='utf8')
+            return
+        header = f'{"phase":16} {"calls":>10} {"time":>9}'
+        if self.memory:
+            header += f' {"memory":>10}'
+        print(header, file=stream)
+        for phase in phases:
+            line = f'{phase.name:16} {phase.calls:>10} {phase.time:>8.3f}s'
+            if phase.memory is not None:
+                line += f' {phase.memory / 2 ** 20:>7.1f} MB'
+            print(line, file=stream)
+
+    @contextmanager
+    def _phase(self, name: str) -> Iterator[None]:
+        if self.memory:
+            import tracemalloc
+
+            # The peak is global, so remember the current one for the outer phase
+            # before resetting it for this phase.
+            if self._stack:
+                parent = self._stack[-1]
+                parent.peak = max(parent.peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        frame = _Frame()
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            phase = self.phases.get(name)
+            if phase is None:
+                phase = self.phases[name] = Phase(name)
+            phase.calls += 1
+            phase.time += elapsed - frame.children
+            if self._stack:
+                self._stack[-1].children += elapsed
+            if self.memory:
+                import tracemalloc
+
+                peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+                phase.memory = max(phase.memory or 0, peak)
+                if self._stack:
+                    self._stack[-1].peak = max(self._stack[-1].peak, peak)
+
+    def _iterate(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        iterator = iter(items)
+        while True:
+            with self._phase(name):
+                item = next(iterator, _SENTINEL)
+            if item is _SENTINEL:
+                # The last call only found out that there are no more items.
+                self.phases[name].calls -= 1
+                return
+            yield item  # type: ignore[misc]
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import NamedTuple
+
+from ._files import write_if_changed
+
+
+# Bump it every time the format of the result file changes.
+RESULT_VERSION = 2
+
+
+class ErrorStats(NamedTuple):
+    """All occurrences of one baseline line in mypy output.
+
+    Errors in different files might have the same baseline line
+    if the path is truncated by `depth`, so occurrences are counted per file.
+    """
+    path: str
+    category: str
+    # How many times the error occurred in each file, as mypy reported the path.
+    files: dict[str, int]
+
+    @property
+    def occurrences(self) -> int:
+        return sum(self.files.values())
+
+
+@dataclass
+class Result:
+    """Errors that `filter` found in a part of the project.
+
+    When mypy checks the project in parts (for example, in multiple CI jobs),
+    each part saves its result, and `merge` combines them into the final verdict.
+    The result contains only what is needed for that: errors as they would be
+    in the baseline, how many times each occurred, and mypy output lines
+    with new errors to show them to the user.
+    """
+    # Files and directories that have been checked. The empty path is everything.
+    scope: list[str] = field(default_factory=list)
+    errors: dict[str, ErrorStats] = field(default_factory=dict)
+    new_lines: list[str] = field(default_factory=list)
+
+    def add(self, line: str, path: str, category: str, raw_path: str) -> None:
+        """Record one occurrence of the error with the given baseline line.
+
+        The `path` is the path in the baseline line, `raw_path` is the path
+        of the file as mypy reported it.
+        """
+        stats = self.errors.get(line)
+        if stats is None:
+            stats = ErrorStats(path, category, {})
+            self.errors[line] = stats
+        stats.files[raw_path] = stats.files.get(raw_path, 0) + 1
+
+    def get_baseline(self) -> tuple[list[str], dict[str, str]]:
+        """Get lines for the baseline and the file path for each line.
+        """
+        lines: list[str] = []
+        paths: dict[str, str] = {}
+        for line, stats in self.errors.items():
+            lines.extend([line] * stats.occurrences)
+            paths[line] = stats.path
+        return lines, paths
+
+    @classmethod
+    def merge(cls, results: list[Result]) -> Result:
+        """Combine results for different parts of the project.
+
+        Errors in different files are summed up. If the same file has been checked
+        by multiple parts, its errors are counted only once: for each file,
+        the most occurrences that any part has found are taken.
+        The same goes for mypy output lines with new errors: they include the path,
+        so repeated lines are kept as many times as the most any part has them.
+        """
+        merged = cls()
+        scope: dict[str, None] = {}
+        new_lines: Counter[str] = Counter()
+        for result in results:
+            scope.update(dict.fromkeys(result.scope))
+            new_lines |= Counter(result.new_lines)
+            for line, stats in result.errors.items():
+                old = merged.errors.get(line)
+                if old is None:
+                    merged.errors[line] = stats._replace(files=dict(stats.files))
+                    continue
+                for path, count in stats.files.items():
+                    if old.files.get(path, 0) < count:
+                        old.files[path] = count
+        merged.scope = list(scope)
+        merged.new_lines = list(new_lines.elements())
+        return merged
+
+    @classmethod
+    def read(cls, path: Path) -> Result:
+        data = json.loads(path.read_bytes())
+        if not isinstance(data, dict) or data.get('version') != RESULT_VERSION:
+            raise ValueError(f'unsupported result file: {path}')
+        errors = {line: ErrorStats(*stats) for line, stats in data['errors'].items()}
+        return cls(scope=data['scope'], errors=errors, new_lines=data['new_lines'])
+
+    def write(self, path: Path) -> None:
+        data = dict(
+            version=RESULT_VERSION,
+            scope=self.scope,
+            errors=self.errors,
+            new_lines=self.new_lines,
+        )
+        write_if_changed(path, json.dumps(data))
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+from argparse import ArgumentParser
+from typing import Iterable
+
+from ._shards import ROOT_SHARD
+
+
+class Scope:
+    """Files and directories that have been checked by a partial mypy run.
+
+    Checking if a file is in the scope takes a set lookup for the file
+    and each of its parent directories, so it doesn't depend
+    on how many paths are in the scope.
+    """
+    __slots__ = ('paths',)
+
+    def __init__(self, paths: Iterable[str] = ()) -> None:
+        self.paths: set[str] = set()
+        self.update(paths)
+
+    def update(self, paths: Iterable[str]) -> None:
+        for path in paths:
+            self.paths.add(normalize_path(path))
+
+    def __contains__(self, path: str) -> bool:
+        """Check if the file is in the scope or in a directory that is in the scope.
+        """
+        path = normalize_path(path)
+        while True:
+            if path in self.paths:
+                return True
+            if '/' not in path:
+                # The empty path is the current directory.
+                return '' in self.paths
+            path = path.rsplit('/', 1)[0]
+
+    def may_contain_shard(self, key: str) -> bool:
+        """Check if the shard might have errors for files in the scope.
+        """
+        if '' in self.paths:
+            return True
+        if key == ROOT_SHARD:
+            return any('/' not in path for path in self.paths)
+        key_prefix = f'{key}/'
+        for path in self.paths:
+            path_prefix = f'{path}/'
+            if path_prefix.startswith(key_prefix) or key_prefix.startswith(path_prefix):
+                return True
+        return False
+
+
+def normalize_path(path: str) -> str:
+    """Make paths written in different ways comparable.
+
+    For example, `./pkg//module.py` and `pkg/module.py` are the same path.
+    """
+    parts = path.replace('\\', '/').split('/')
+    return '/'.join(part for part in parts if part not in ('', '.'))
+
+
+def relative_path(path: str) -> str:
+    """Make the path relative to the current directory, like paths in mypy output.
+    """
+    if os.path.isabs(path):
+        return os.path.relpath(path)
+    return path
+
+
+def add_paths_argument(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        '--paths', nargs='*', metavar='PATH',
+        help=(
+            'only these files and directories and files with errors in the output '
+            'have been checked, errors in the baseline for other files are kept. '
+            'Without values, only files with errors in the output.'
+        ),
+    )
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
+from ._baseline import BaselineIndex
+from ._compression import get_compression, read_lines, strip_compression
+from ._files import write_if_changed
+
+
+if TYPE_CHECKING:
+    from ._config import Config
+
+
+SUFFIX = '.txt'
+# The shard for files that aren't in any directory.
+ROOT_SHARD = '__root__'
+
+
+@dataclass(frozen=True)
+class Shards:
+    """Baseline split into multiple files by the directory of the file with errors.
+
+    Each shard is a regular baseline file. For example, errors for
+    `pkg/sub/module.py` with `depth=1` are stored in `mypy-baseline/pkg.txt`,
+    and with `depth=2` in `mypy-baseline/pkg/sub.txt`.
+    Shards of a compressed baseline are compressed the same way.
+    """
+    root: Path
+    depth: int
+    suffix: str = SUFFIX
+
+    @classmethod
+    def from_config(cls, config: Config) -> Shards | None:
+        """Get shards for the baseline, None if the baseline isn't sharded.
+        """
+        if config.shard_depth <= 0:
+            return None
+        return cls(
+            root=get_shards_dir(config.baseline_path),
+            depth=config.shard_depth,
+            suffix=SUFFIX + get_compression(config.baseline_path),
+        )
+
+    def get_key(self, path: str) -> str:
+        """Get the name of the shard for the file path from mypy output or baseline.
+        """
+        return _get_key(path, self.depth)
+
+    def get_path(self, key: str) -> Path:
+        """Get the path to the shard file.
+        """
+        return self.root / f'{key}{self.suffix}'
+
+    def keys(self) -> list[str]:
+        """Get names of all existing shards, sorted.
+        """
+        if not self.root.is_dir():
+            return []
+        keys = []
+        for path in self.root.rglob(f'*{self.suffix}'):
+            name = path.relative_to(self.root).as_posix()
+            keys.append(name[:-len(self.suffix)])
+        keys.sort()
+        return keys
+
+    def read(self, key: str) -> list[str]:
+        """Read lines of the shard, an empty list if there is no such shard.
+        """
+        try:
+            return read_lines(self.get_path(key))
+        except FileNotFoundError:
+            return []
+
+    def read_index(self, cache: bool = False) -> BaselineIndex:
+        """Read and combine all shards.
+        """
+        paths = (self.get_path(key) for key in self.keys())
+        return BaselineIndex.combine([BaselineIndex.read(p, cache) for p in paths])
+
+    def write(self, key: str, lines: list[str]) -> bool:
+        """Write lines into the shard. The shard is removed if there are no lines.
+
+        Returns False if the shard is unchanged.
+        """
+        path = self.get_path(key)
+        if not lines:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                return False
+            return True
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return write_if_changed(path, '\n'.join(lines) + '\n')
+
+    def group(self, lines: list[str], paths: dict[str, str]) -> dict[str, list[str]]:
+        """Split lines into shards, `paths` maps each line to its file path.
+        """
+        groups: dict[str, list[str]] = {}
+        for line in lines:
+            groups.setdefault(self.get_key(paths[line]), []).append(line)
+        return groups
+
+
+def get_shards_dir(path: Path) -> Path:
+    """Get the directory where shards of the given baseline file are stored.
+    """
+    path = strip_compression(path)
+    if path.suffix:
+        return path.with_suffix('')
+    return path.with_name(f'{path.name}.d')
+
+
+def get_baseline_path(config: Config) -> Path:
+    """Get the path to the baseline file or the directory with shards.
+    """
+    shards = Shards.from_config(config)
+    if shards is None:
+        return config.baseline_path
+    return shards.root
+
+
+def read_index(config: Config) -> BaselineIndex:
+    """Read the baseline, from all shards if it's sharded.
+    """
+    shards = Shards.from_config(config)
+    if shards is None:
+        return BaselineIndex.read(config.baseline_path, cache=config.baseline_index)
+    return shards.read_index(cache=config.baseline_index)
+
+
+@lru_cache(maxsize=2 ** 14)
+def _get_key(path: str, depth: int) -> str:
+    parts = list(_get_dirs(path))[:depth]
+    return '/'.join(parts) or ROOT_SHARD
+
+
+def _get_dirs(path: str) -> Iterator[str]:
+    *dirs, _ = path.replace('\\', '/').split('/')
+    for part in dirs:
+        if part in ('', '.'):
+            continue
+        # Don't let shards escape the shards directory.
+        if part == '..':
+            part = '__parent__'
+        yield part
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from ._baseline import BaselineIndex, stable_merge
+from ._config import Config
+from ._files import write_if_changed
+from ._profile import Profiler
+from ._scope import Scope
+from ._shards import Shards
+
+
+@dataclass
+class BaselineUpdater:
+    """Write errors from mypy output into the baseline.
+
+    The new baseline is merged with the old one to keep the diff small.
+    """
+    config: Config
+    profiler: Profiler = field(default_factory=Profiler)
+
+    def update(
+        self,
+        new_baseline: list[str],
+        paths: dict[str, str],
+        scope: Scope | None = None,
+        index: BaselineIndex | None = None,
+    ) -> bool:
+        """Replace the baseline with the new one.
+
+        `paths` maps each line of the new baseline to the file it refers to.
+        If `scope` is specified, only errors for files in the scope are replaced.
+        If the baseline file has already been read, pass it as `index`
+        to not read it again. It's ignored for a sharded baseline.
+
+        Returns False if the baseline is unchanged and so no files were touched.
+        """
+        shards = Shards.from_config(self.config)
+        if shards is not None:
+            return self._update_shards(shards, new_baseline, paths, scope)
+
+        with self.profiler.phase('baseline'):
+            if index is None:
+                index = BaselineIndex.read(
+                    self.config.baseline_path,
+                    cache=self.config.baseline_index and scope is not None,
+                )
+            if scope is not None:
+                new_baseline = self._add_unchecked(index, new_baseline, paths, scope)
+        new_baseline = self._sync_lines(index.lines, new_baseline, paths)
+        return self._write_baseline(new_baseline)
+
+    def _update_shards(
+        self,
+        shards: Shards,
+        new_baseline: list[str],
+        paths: dict[str, str],
+        scope: Scope | None,
+    ) -> bool:
+        """Sync each shard separately. Only changed shards are written.
+
+        Returns False if all shards are unchanged.
+        """
+        changed = False
+        groups = shards.group(new_baseline, paths)
+        # The shards without errors in the output have all errors fixed.
+        # For a partial run, only if the shard has files that were checked.
+        for key in shards.keys():
+            if scope is None or scope.may_contain_shard(key):
+                groups.setdefault(key, [])
+        for key, new_lines in groups.items():
+            with self.profiler.phase('baseline'):
+                if scope is None:
+                    old_lines = shards.read(key) if new_lines else []
+                else:
+                    path = shards.get_path(key)
+                    index = BaselineIndex.read(path, cache=self.config.baseline_index)
+                    old_lines = index.lines
+                    new_lines = self._add_unchecked(index, new_lines, paths, scope)
+            new_lines = self._sync_lines(old_lines, new_lines, paths)
+            with self.profiler.phase('write'):
+                changed |= shards.write(key, new_lines)
+        return changed
+
+    def _add_unchecked(
+        self,
+        index: BaselineIndex,
+        new_bline: list[str],
+        paths: dict[str, str],
+        scope: Scope,
+    ) -> list[str]:
+        """Add into the new baseline errors from the old one for files out of the scope.
+
+        Lines that cannot be parsed are kept as is because we don't know
+        which file they belong to.
+        """
+        # All lines are needed, so use the cached parsed lines if there are any.
+        index.parse_all()
+        result: list[str] = []
+        for line in index.lines:
+            if not line:
+                continue
+            entry = index.get(line)
+            if entry is None:
+                paths.setdefault(line, '')
+            elif entry.path in scope:
+                continue
+            else:
+                paths.setdefault(line, entry.path)
+            result.append(line)
+        result.extend(new_bline)
+        return result
+
+    def _sync_lines(
+        self,
+        old_bline: list[str],
+        new_bline: list[str],
+        paths: dict[str, str],
+    ) -> list[str]:
+        """Get the content of the updated baseline.
+        """
+        if self.config.sort_baseline:
+            return sorted(new_bline)
+        if not old_bline:
+            return new_bline
+        with self.profiler.phase('stable-sync'):
+            return self._stable_sync(old_bline, new_bline, paths)
+
+    def _stable_sync(
+        self,
+        old_bline: list[str],
+        new_bline: list[str],
+        paths: dict[str, str],
+    ) -> list[str]:
+        """Cleanly update the old baseline instead of rewriting it.
+
+        We do that to avoid lines jumping around that happens because of not ordered
+        output from mypy. Lines that are still present keep their position,
+        and new lines are inserted next to the lines for the same file.
+        So, the diff for the baseline shows only what actually changed.
+
+        Sorting lines solves the issue as well, so we don't use stable sync
+        when the output is sorted. However, sorting is not enabled by default
+        because I want to keep backward compatibility.
+        """
+        # Keep in mind that if preserve_position is False,
+        # it's possible to have duplicate lines.
+        #
+        # https://github.com/orsinium-labs/mypy-baseline/pull/27#issuecomment-2897267141
+        return stable_merge(old_bline, new_bline, paths)
+
+    def _write_baseline(self, baseline: list[str]) -> bool:
+        """Serialize baseline and write it into the file.
+
+        Returns False if the baseline is unchanged and so the file wasn't touched.
+        """
+        with self.profiler.phase('write'):
+            serialized = '\n'.join(baseline) + '\n'
+            return write_if_changed(self.config.baseline_path, serialized)
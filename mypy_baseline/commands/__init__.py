@@ -1,29 +1,128 @@
 from __future__ import annotations
 
+from importlib import import_module
 from types import MappingProxyType
+from typing import TYPE_CHECKING, Iterator, Mapping, NamedTuple
 
-from ._base import Command
-from ._filter import Filter
-from ._history import History
-from ._plot import Plot
-from ._suggest import Suggest
-from ._sync import Sync
-from ._top_files import TopFiles
-from ._version import Version
-
-
-commands: MappingProxyType[str, type[Command]]
-commands = MappingProxyType({
-    'filter': Filter,
-    'history': History,
-    'plot': Plot,
-    'suggest': Suggest,
-    'sync': Sync,
-    'top-files': TopFiles,
-    'version': Version,
+
+if TYPE_CHECKING:
+    from ._base import Command
+    from ._client import Client
+    from ._filter import Filter
+    from ._history import History
+    from ._merge import Merge
+    from ._plot import Plot
+    from ._run import Run
+    from ._serve import Serve
+    from ._suggest import Suggest
+    from ._sync import Sync
+    from ._top_files import TopFiles
+    from ._version import Version
+
+
+class CommandInfo(NamedTuple):
+    """Where to find a command, so that it can be imported only when needed.
+    """
+    module: str
+    cls: str
+    # Short description for `--help`, the first line of the class docstring.
+    help: str
+
+    def load(self) -> type[Command]:
+        module = import_module(f'{__name__}.{self.module}')
+        return getattr(module, self.cls)
+
+
+registry: MappingProxyType[str, CommandInfo]
+registry = MappingProxyType({
+    'client': CommandInfo(
+        '_client', 'Client',
+        'Filter mypy output from stdin using the running `serve` daemon.',
+    ),
+    'filter': CommandInfo(
+        '_filter', 'Filter',
+        'Filter out old mypy errors from stdin.',
+    ),
+    'history': CommandInfo(
+        '_history', 'History',
+        'Show how the baseline changed over time.',
+    ),
+    'merge': CommandInfo(
+        '_merge', 'Merge',
+        'Combine results of `filter --save-result` for parts of the project.',
+    ),
+    'plot': CommandInfo(
+        '_plot', 'Plot',
+        'Draw the graph of how the baseline changed over time.',
+    ),
+    'run': CommandInfo(
+        '_run', 'Run',
+        'Run mypy and filter out old errors from its output.',
+    ),
+    'serve': CommandInfo(
+        '_serve', 'Serve',
+        'Run a daemon that keeps the baseline in memory for `client`.',
+    ),
+    'suggest': CommandInfo(
+        '_suggest', 'Suggest',
+        'Suggest to fix a violation from the baseline.',
+    ),
+    'sync': CommandInfo(
+        '_sync', 'Sync',
+        'Generate baseline with all existing errors.',
+    ),
+    'top-files': CommandInfo(
+        '_top_files', 'TopFiles',
+        'Show files with the most errors.',
+    ),
+    'version': CommandInfo(
+        '_version', 'Version',
+        'Print the version of mypy-baseline.',
+    ),
 })
 
+
+class _LazyCommands(Mapping[str, 'type[Command]']):
+    """Mapping of command names to command classes that imports them on access.
+    """
+
+    def __getitem__(self, name: str) -> type[Command]:
+        return registry[name].load()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(registry)
+
+    def __len__(self) -> int:
+        return len(registry)
+
+
+commands: Mapping[str, type[Command]] = _LazyCommands()
+
+
+def __getattr__(name: str) -> object:
+    if name == 'Command':
+        from ._base import Command
+        return Command
+    for info in registry.values():
+        if info.cls == name:
+            return info.load()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
 __all__ = [
     'commands',
+    'registry',
     'Command',
+    'CommandInfo',
+    'Client',
+    'Filter',
+    'History',
+    'Merge',
+    'Plot',
+    'Run',
+    'Serve',
+    'Suggest',
+    'Sync',
+    'TopFiles',
+    'Version',
 ]
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from argparse import ArgumentParser, Namespace
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import cached_property
 from typing import ClassVar, TextIO
 
 from .._colors import Colors
 from .._config import Config
+from .._profile import Profiler
 
 
 @dataclass
@@ -15,6 +16,7 @@ class Command:
     args: Namespace
     stdin: TextIO
     stdout: TextIO
+    profiler: Profiler = field(default_factory=Profiler)
 
     @staticmethod
     def init_parser(parser: ArgumentParser) -> None:
@@ -24,11 +26,13 @@ class Command:
         raise NotImplementedError
 
     def print(self, *args: str, end: str = '\n', sep: str = ' ') -> None:
-        print(*args, file=self.stdout, end=end, sep=sep)
+        with self.profiler.phase('print'):
+            print(*args, file=self.stdout, end=end, sep=sep)
 
     @cached_property
     def config(self) -> Config:
-        return Config.from_args(vars(self.args))
+        with self.profiler.phase('config'):
+            return Config.from_args(vars(self.args))
 
     @cached_property
     def colors(self) -> Colors:
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+
+from .._config import Config
+from .._daemon import add_socket_argument, is_supported, send_request
+from ._base import Command
+
+
+class Client(Command):
+    """Filter mypy output from stdin using the running `serve` daemon.
+    """
+
+    @classmethod
+    def init_parser(cls, parser: ArgumentParser) -> None:
+        # The daemon uses the config and flags it was started with, so flags
+        # that change how to filter are accepted only by `serve`. Otherwise,
+        # they would have effect only when the daemon isn't running.
+        parser.add_argument(
+            '--config', type=Path, default=Path('pyproject.toml'),
+            help='path to the configuration file, if the daemon is not running.',
+        )
+        add_socket_argument(parser)
+
+    def run(self) -> int:
+        data = self.stdin.read()
+        if is_supported():
+            try:
+                code, output = send_request(self.args.socket, data.encode('utf8'))
+            except OSError:
+                pass
+            else:
+                self.print(output, end='')
+                return code
+        return self._filter_locally(data)
+
+    def _filter_locally(self, data: str) -> int:
+        """Run `filter` in this process if the daemon isn't running.
+        """
+        from io import StringIO
+
+        from ._filter import Filter, with_filter_defaults
+
+        # Take the config only from the file, as if no flags were passed.
+        parser = ArgumentParser()
+        Config.init_parser(parser)
+        args = parser.parse_args(['--config', str(self.args.config)])
+        cmd = Filter(
+            args=with_filter_defaults(Namespace(**{**vars(args), **vars(self.args)})),
+            stdin=StringIO(data),
+            stdout=self.stdout,
+            profiler=self.profiler,
+        )
+        return cmd.run()
@@ -1,8 +1,17 @@
 from __future__ import annotations
 
+from argparse import ArgumentParser, ArgumentTypeError, Namespace
 from collections import defaultdict
+from functools import partial
+from pathlib import Path
 
-from .._error import Error
+from .._baseline import BaselineIndex
+from .._error import parse_line, truncate_path
+from .._parallel import add_jobs_argument, map_lines
+from .._result import Result
+from .._scope import Scope, add_paths_argument, relative_path
+from .._shards import read_index
+from .._updater import BaselineUpdater
 from ._base import Command
 
 
@@ -10,99 +19,245 @@ class Filter(Command):
     """Filter out old mypy errors from stdin.
     """
 
+    @classmethod
+    def init_parser(cls, parser: ArgumentParser) -> None:
+        super().init_parser(parser)
+        add_jobs_argument(parser)
+        parser.add_argument(
+            '--update-baseline', action='store_true',
+            help='also sync the baseline, the same as running `sync` on the same input',
+        )
+        parser.add_argument(
+            '--fail-fast', type=_positive_int, nargs='?', const=1, metavar='N',
+            help='stop after N new errors, 1 if N is not specified.',
+        )
+        add_paths_argument(parser)
+        parser.add_argument(
+            '--save-result', type=Path, metavar='PATH',
+            help='save found errors into the file to combine them later with `merge`.',
+        )
+
     def run(self) -> int:
-        try:
-            baseline_text = self.config.baseline_path.read_text(encoding='utf8')
-        except FileNotFoundError:
-            baseline_text = ''
-        baseline = baseline_text.splitlines()
-
-        unresolved_errors: list[Error] = []
-        new_errors: list[Error] = []
-
-        for line in self.stdin:
-            error = Error.new(line)
-            if error is None:
+        with self.profiler.phase('baseline'):
+            index = self.read_index()
+
+        # Keep only categories of errors for stats, not the errors themselves,
+        # so that memory consumption doesn't grow much with the input size.
+        unresolved_categories: list[str] = []
+        new_categories: list[str] = []
+        fail_fast: int | None = self.args.fail_fast
+        # All errors, needed to update the baseline, to know which files
+        # have been checked, or to save the result.
+        collect = (
+            self.args.update_baseline
+            or self.args.paths is not None
+            or self.args.save_result is not None
+        )
+        result = Result()
+        # If the input has at least one error, even an ignored one.
+        self.found_errors = False
+        # The errors for the updated baseline in the same order as `sync` has.
+        new_baseline: list[str] = []
+
+        parse = partial(parse_line, self.config)
+        results = map_lines(parse, self.stdin, self.args.jobs)
+        for line, errors in self.profiler.iterate('parse', results):
+            if not errors:
                 self.print(line, end='')
                 continue
-            if self.config.is_ignored(error.message):
-                continue
-            if self.config.is_ignored_category(error.category):
-                continue
-            clean_line = error.get_clean_line(self.config)
-            try:
-                baseline.remove(clean_line)
-            except ValueError:
+            self.found_errors = True
+            is_new = False
+            with self.profiler.phase('match'):
+                for error, clean_line in errors:
+                    if self.config.is_ignored(error.message):
+                        continue
+                    if self.config.is_ignored_category(error.category):
+                        continue
+                    if collect:
+                        path = truncate_path(error.raw_path, self.config.depth)
+                        result.add(clean_line, path, error.category, error.raw_path)
+                        new_baseline.append(clean_line)
+                    if index.remove(clean_line):
+                        unresolved_categories.append(error.category)
+                    else:
+                        new_categories.append(error.category)
+                        is_new = True
+            if is_new:
                 self.print(line, end='')
-                new_errors.append(error)
-            else:
-                unresolved_errors.append(error)
+                if collect:
+                    result.new_lines.append(line)
+                if fail_fast is not None and len(new_categories) >= fail_fast:
+                    # The verdict won't change, so don't waste time on the rest.
+                    # The baseline isn't updated because we haven't seen all errors.
+                    return self._stop(len(new_categories))
+
+        scope = None
+        if self.args.paths is not None:
+            scope = Scope(relative_path(path) for path in self.args.paths)
+            # Files with errors in the output have been checked for sure.
+            scope.update(stats.path for stats in result.errors.values())
+        if self.args.save_result is not None or self.args.update_baseline:
+            # The baseline has been read before any changes, so the stats
+            # and the exit code are the same as without the flag.
+            self.write_results(result, new_baseline, scope, index)
+
+        fixed_categories = get_fixed_categories(self, index, scope)
+        if fixed_categories is None:
+            return 1
+        return report(self, fixed_categories, new_categories, unresolved_categories)
+
+    def _stop(self, new_count: int) -> int:
+        """Stop reading the input when the fail-fast limit is reached.
+        """
+        self.stop_input()
+        if not self.config.hide_stats:
+            self.print()
+            self.print(
+                f'stopped after {self.colors.red(new_count)} new errors, '
+                'the rest of mypy output is not checked',
+            )
+            self.print(self.colors.get_exit_message(fixed=0, new=new_count))
+        return min(new_count, 100)
+
+    def write_results(
+        self,
+        result: Result,
+        new_baseline: list[str],
+        scope: Scope | None,
+        index: BaselineIndex,
+    ) -> None:
+        """Save the result and update the baseline if asked to.
+
+        It's called only when all input has been checked.
+        """
+        if self.args.save_result is not None:
+            result.scope = [''] if scope is None else sorted(scope.paths)
+            result.write(self.args.save_result)
+        if self.args.update_baseline:
+            paths = {line: stats.path for line, stats in result.errors.items()}
+            updater = BaselineUpdater(self.config, self.profiler)
+            changed = updater.update(new_baseline, paths, scope, index=index)
+            if not changed and not self.config.hide_stats:
+                self.print('the baseline is unchanged')
+
+    def stop_input(self) -> None:
+        """Close stdin, so that the process writing into the pipe could exit early.
+        """
+        self.stdin.close()
+
+    def read_index(self) -> BaselineIndex:
+        """Read the baseline. The daemon overrides it to use the baseline from memory.
+        """
+        return read_index(self.config)
 
-        fixed_errors: list[Error] = []
 
-        for line in baseline:
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise ArgumentTypeError(f'must be at least 1, got {number}')
+    return number
+
+
+def with_filter_defaults(args: Namespace) -> Namespace:
+    """Add defaults for flags that only filter has to arguments of another command.
+    """
+    return Namespace(**{
+        'jobs': 1,
+        'update_baseline': False,
+        'fail_fast': None,
+        'paths': None,
+        'save_result': None,
+        **vars(args),
+    })
+
+
+def get_fixed_categories(
+    cmd: Command,
+    index: BaselineIndex,
+    scope: Scope | None,
+) -> list[str] | None:
+    """Get categories of errors from the baseline that haven't been matched.
+
+    If only some files have been checked, errors for other files aren't fixed.
+    Returns None if the baseline cannot be parsed.
+    """
+    fixed_categories: list[str] = []
+    with cmd.profiler.phase('unmatched'):
+        for line in index.get_unmatched():
             if not line:  # Skip empty lines
                 continue
-            error = Error.new(line)
-            if error is None:
-                print(f'invalid baseline, cannot parse line: {line}')
-                return 1
-            fixed_errors.append(error)
-
-        fixed_count = len(fixed_errors)
-        new_count = len(new_errors)
-        unresolved_count = len(unresolved_errors)
-
-        # calculate exit code
-        if not fixed_count and not new_count and not unresolved_count:
-            return 0
-        exit_code = new_count
-        if not self.config.allow_unsynced:
-            exit_code += fixed_count
-        if exit_code > 100:
-            exit_code = 100
-        if self.config.hide_stats:
-            return exit_code
-
-        # print short summary
-        self.print()
-        self.print('total errors:')
-        self.print(f'  fixed: {self.colors.green(fixed_count)}')
-        self.print(f'  new: {self.colors.red(new_count)}')
-        self.print(f'  unresolved: {self.colors.blue(unresolved_count)}')
-        self.print()
-
-        # print stats for each error code (category)
-        stats_total: defaultdict[str, int] = defaultdict(int)
-        stats_fixed: defaultdict[str, int] = defaultdict(int)
-        stats_new: defaultdict[str, int] = defaultdict(int)
-        for error in fixed_errors:
-            stats_total[error.category] += 1
-            stats_fixed[error.category] += 1
-        for error in new_errors:
-            stats_total[error.category] += 1
-            stats_new[error.category] += 1
-        for error in unresolved_errors:
-            stats_total[error.category] += 1
-        self.print('errors by error code:')
-        sorted_stats = sorted(
-            stats_total.items(),
-            key=lambda x: x[::-1],
-            reverse=True,
-        )
-        for category, total in sorted_stats:
-            total_formatted = f'{total: >3}'
-            line = f'  {category:24} {self.colors.blue(total_formatted)}'
-            fixed = stats_fixed[category]
-            if fixed:
-                fixed_formatted = f'{-fixed: >3}'
-                line += f' {self.colors.green(fixed_formatted)}'
-            new = stats_new[category]
-            if new:
-                new_formatted = f'{new: >+3}'
-                line += f' {self.colors.red(new_formatted)}'
-            self.print(line)
-
-        msg = self.colors.get_exit_message(fixed=fixed_count, new=new_count)
-        self.print(msg)
+            entry = index.get(line)
+            if entry is None:
+                cmd.print(f'invalid baseline, cannot parse line: {line}')
+                return None
+            if scope is not None and entry.path not in scope:
+                continue
+            fixed_categories.append(entry.category)
+    return fixed_categories
+
+
+def report(
+    cmd: Command,
+    fixed_categories: list[str],
+    new_categories: list[str],
+    unresolved_categories: list[str],
+) -> int:
+    """Print stats for the errors and get the exit code.
+    """
+    fixed_count = len(fixed_categories)
+    new_count = len(new_categories)
+    unresolved_count = len(unresolved_categories)
+
+    # calculate exit code
+    if not fixed_count and not new_count and not unresolved_count:
+        return 0
+    exit_code = new_count
+    if not cmd.config.allow_unsynced:
+        exit_code += fixed_count
+    if exit_code > 100:
+        exit_code = 100
+    if cmd.config.hide_stats:
         return exit_code
+
+    # print short summary
+    cmd.print()
+    cmd.print('total errors:')
+    cmd.print(f'  fixed: {cmd.colors.green(fixed_count)}')
+    cmd.print(f'  new: {cmd.colors.red(new_count)}')
+    cmd.print(f'  unresolved: {cmd.colors.blue(unresolved_count)}')
+    cmd.print()
+
+    # print stats for each error code (category)
+    stats_total: defaultdict[str, int] = defaultdict(int)
+    stats_fixed: defaultdict[str, int] = defaultdict(int)
+    stats_new: defaultdict[str, int] = defaultdict(int)
+    for category in fixed_categories:
+        stats_total[category] += 1
+        stats_fixed[category] += 1
+    for category in new_categories:
+        stats_total[category] += 1
+        stats_new[category] += 1
+    for category in unresolved_categories:
+        stats_total[category] += 1
+    cmd.print('errors by error code:')
+    sorted_stats = sorted(
+        stats_total.items(),
+        key=lambda x: x[::-1],
+        reverse=True,
+    )
+    for category, total in sorted_stats:
+        total_formatted = f'{total: >3}'
+        line = f'  {category:24} {cmd.colors.blue(total_formatted)}'
+        fixed = stats_fixed[category]
+        if fixed:
+            fixed_formatted = f'{-fixed: >3}'
+            line += f' {cmd.colors.green(fixed_formatted)}'
+        new = stats_new[category]
+        if new:
+            new_formatted = f'{new: >+3}'
+            line += f' {cmd.colors.red(new_formatted)}'
+        cmd.print(line)
+
+    msg = cmd.colors.get_exit_message(fixed=fixed_count, new=new_count)
+    cmd.print(msg)
+    return exit_code
@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from .._git import get_commits
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Iterator
+
+from .._breakdown import GROUPS, Breakdown
+from .._export import FORMATS, iter_export
+from .._git import Commit
+from .._history_cache import HistoryCache, get_history
+from .._shards import get_baseline_path
 from ._base import Command
 
 
@@ -8,11 +16,30 @@ class History(Command):
     """Show how the baseline changed over time.
     """
 
+    @classmethod
+    def init_parser(cls, parser: ArgumentParser) -> None:
+        super().init_parser(parser)
+        parser.add_argument(
+            '--by', choices=GROUPS,
+            help='show how the number of errors changed in each category or path.',
+        )
+        parser.add_argument(
+            '--format', choices=('table', *FORMATS), default='table',
+            help='export the history in a machine-readable format.',
+        )
+        add_history_arguments(parser)
+
     def run(self) -> int:
+        if self.args.format != 'table':
+            for line in iter_export(self._iter_rows(), self.args.format):
+                self.print(line)
+            return 0
+        if self.args.by:
+            return self._run_by(self.args.by)
         prev_count: int | None = None
         self.print('date       time           res   old  fix  new   commit      author')
-        for commit in get_commits(self.config.baseline_path):
-            commit.fix_lines_count(prev_count)
+        commits = get_history(*get_history_args(self))
+        for commit in self.profiler.iterate('git', commits):
             count_formatted = f'{commit.lines_count:>3}'
             line = f'{commit.created_at} {self.colors.blue(count_formatted)}'
             line += f' = {prev_count or 0:>3}'
@@ -31,3 +58,125 @@ class History(Command):
             self.print(line)
             prev_count = commit.lines_count
         return 0
+
+    def _run_by(self, by: str) -> int:
+        breakdown = Breakdown(by, depth=self.config.depth)
+        first: dict[str, int] | None = None
+        for commit, diff in self._iter_changes(breakdown):
+            if first is None:
+                first = dict(breakdown.counts)
+            if not diff:
+                continue
+            line = f'{commit.created_at}   {commit.hash[:10]}'
+            line += f'  {self.colors.magenta(commit.author_email)}'
+            self.print(line)
+            for group, change in sorted(diff.items()):
+                self._print_change(group, breakdown.counts[group], change)
+        if first is None:
+            return 0
+
+        # Show the total change for each group, the most improved first.
+        self.print()
+        self.print(f' res    old  change  {by}')
+        changes = {
+            group: breakdown.counts[group] - first.get(group, 0)
+            for group in set(first) | set(breakdown.counts)
+        }
+        for group, change in sorted(changes.items(), key=lambda x: (x[1], x[0])):
+            self._print_change(group, breakdown.counts[group], change)
+        return 0
+
+    def _iter_rows(self) -> Iterator[dict[str, object]]:
+        """Generate the history as rows for export.
+
+        With `--by`, there is a row for each group changed by each commit.
+        """
+        by: str | None = self.args.by
+        if by is None:
+            history = get_history(*get_history_args(self))
+            for commit in self.profiler.iterate('git', history):
+                yield commit.as_dict()
+            return
+        breakdown = Breakdown(by, depth=self.config.depth)
+        for commit, diff in self._iter_changes(breakdown):
+            for group, change in sorted(diff.items()):
+                row: dict[str, object] = dict(
+                    hash=commit.hash,
+                    created_at=commit.created_at,
+                    author_email=commit.author_email,
+                )
+                row[by] = group
+                row['count'] = breakdown.counts[group]
+                row['change'] = change
+                yield row
+
+    def _iter_changes(
+        self,
+        breakdown: Breakdown,
+    ) -> Iterator[tuple[Commit, dict[str, int]]]:
+        """Apply commits to the breakdown and produce how each changed the groups.
+        """
+        path, cache, git_args = get_history_args(self)
+        history = get_history(path, cache, git_args)
+        is_first = True
+        for commit in self.profiler.iterate('git', history):
+            if is_first and git_args:
+                # The history is limited, it might start after the baseline was added.
+                breakdown.start_before(commit)
+            is_first = False
+            yield commit, breakdown.update(commit)
+
+    def _print_change(self, group: str, count: int, change: int) -> None:
+        count_formatted = f'{count:>4}'
+        line = f'{self.colors.blue(count_formatted)} = {count - change:>4}'
+        formatted = f'{change:>+6}'
+        if change < 0:
+            formatted = self.colors.green(formatted)
+        elif change > 0:
+            formatted = self.colors.red(formatted)
+        self.print(f'{line}  {formatted}  {group}')
+
+
+def add_history_arguments(parser: ArgumentParser) -> None:
+    """Add arguments to limit commits and control the cache for `get_history_args`.
+
+    The arguments to limit commits are passed to `git log` as is.
+    """
+    parser.add_argument(
+        '--since',
+        help='show only commits more recent than the date, like "2 weeks ago".',
+    )
+    parser.add_argument(
+        '--until',
+        help='show only commits older than the date, like "2024-01-01".',
+    )
+    parser.add_argument(
+        '--max-count', type=int,
+        help='show only that many latest commits.',
+    )
+    parser.add_argument(
+        '--rev-range',
+        help='show only commits in the range, like "v1.0..HEAD".',
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help='read the whole git history instead of using and updating the cache.',
+    )
+
+
+def get_history_args(cmd: Command) -> tuple[Path, HistoryCache | None, list[str]]:
+    """Get the baseline path, its history cache, and git arguments for `get_history`.
+    """
+    path = get_baseline_path(cmd.config)
+    git_args: list[str] = []
+    if cmd.args.since:
+        git_args.append(f'--since={cmd.args.since}')
+    if cmd.args.until:
+        git_args.append(f'--until={cmd.args.until}')
+    if cmd.args.max_count is not None:
+        git_args.append(f'--max-count={cmd.args.max_count}')
+    if cmd.args.rev_range:
+        git_args.append(cmd.args.rev_range)
+    if cmd.args.no_cache:
+        return path, None, git_args
+    return path, HistoryCache.for_baseline(path, cmd.config.cache_dir), git_args
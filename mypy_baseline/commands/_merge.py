@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from pathlib import Path
+
+from .._result import Result
+from .._scope import Scope
+from .._shards import read_index
+from .._updater import BaselineUpdater
+from ._base import Command
+from ._filter import get_fixed_categories, report
+
+
+class Merge(Command):
+    """Combine results of `filter --save-result` for parts of the project.
+    """
+
+    @classmethod
+    def init_parser(cls, parser: ArgumentParser) -> None:
+        super().init_parser(parser)
+        parser.add_argument(
+            '--update-baseline', action='store_true',
+            help='also sync the baseline with all errors from the results.',
+        )
+        parser.add_argument(
+            'results', type=Path, nargs='+', metavar='RESULT',
+            help='paths to files saved by `filter --save-result`.',
+        )
+
+    def run(self) -> int:
+        with self.profiler.phase('results'):
+            result = Result.merge([Result.read(path) for path in self.args.results])
+            scope = Scope(result.scope)
+        with self.profiler.phase('baseline'):
+            index = read_index(self.config)
+
+        for line in result.new_lines:
+            self.print(line, end='')
+
+        unresolved_categories: list[str] = []
+        new_categories: list[str] = []
+        with self.profiler.phase('match'):
+            for line, stats in result.errors.items():
+                for _ in range(stats.occurrences):
+                    if index.remove(line):
+                        unresolved_categories.append(stats.category)
+                    else:
+                        new_categories.append(stats.category)
+
+        if self.args.update_baseline:
+            new_baseline, paths = result.get_baseline()
+            updater = BaselineUpdater(self.config, self.profiler)
+            changed = updater.update(new_baseline, paths, scope, index=index)
+            if not changed and not self.config.hide_stats:
+                self.print('the baseline is unchanged')
+
+        fixed_categories = get_fixed_categories(self, index, scope)
+        if fixed_categories is None:
+            return 1
+        return report(self, fixed_categories, new_categories, unresolved_categories)
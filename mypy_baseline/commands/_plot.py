@@ -1,36 +1,73 @@
 from __future__ import annotations
 
+import importlib.util
 from argparse import ArgumentParser
 from pathlib import Path
 
-from .._git import get_commits
+from .._chart import render_png, render_svg
+from .._git import Commit
+from .._history_cache import get_history
 from ._base import Command
+from ._history import add_history_arguments, get_history_args
+
+
+# How the chart can be drawn, "auto" uses plotnine if it's installed.
+BACKENDS = ('auto', 'builtin', 'plotnine')
 
 
 class Plot(Command):
     """Draw the graph of how the baseline changed over time.
 
-    Requires plotnine to be installed.
+    The chart is drawn with plotnine if it is installed and as SVG otherwise.
     """
     @classmethod
     def init_parser(cls, parser: ArgumentParser) -> None:
         super().init_parser(parser)
         parser.add_argument(
-            '--output', type=Path, default=Path('mypy-baseline.png'),
+            '--output', type=Path,
             help='the path to save the file to',
         )
+        parser.add_argument(
+            '--backend', choices=BACKENDS, default='auto',
+            help='how to draw the chart: plotnine or the built-in SVG renderer.',
+        )
+        add_history_arguments(parser)
 
     def run(self) -> int:
-        import pandas
-        import plotnine as gg
-        commits = list(get_commits(self.config.baseline_path))
-
-        prev_count: int | None = None
-        for commit in commits:
-            commit.fix_lines_count(prev_count)
-            prev_count = commit.lines_count
+        backend: str = self.args.backend
+        if backend == 'auto':
+            # Don't import plotnine here, it takes a noticeable time.
+            has_plotnine = importlib.util.find_spec('plotnine') is not None
+            backend = 'plotnine' if has_plotnine else 'builtin'
+        output: Path | None = self.args.output
+        if output is None:
+            suffix = '.png' if backend == 'plotnine' else '.svg'
+            output = Path('mypy-baseline').with_suffix(suffix)
 
+        with self.profiler.phase('git'):
+            commits = list(get_history(*get_history_args(self)))
         commits = commits[1:]  # drop the oldest commit
+        if not commits:
+            self.print('not enough commits with the baseline to draw the chart')
+            return 1
+
+        with self.profiler.phase('render'):
+            if backend == 'plotnine':
+                self._render_plotnine(commits, output)
+            elif output.suffix == '.png':
+                try:
+                    content = render_png(commits)
+                except ImportError as exc:
+                    self.print(f'{exc}, use .svg output instead')
+                    return 1
+                output.write_bytes(content)
+            else:
+                output.write_text(render_svg(commits))
+        return 0
+
+    def _render_plotnine(self, commits: list[Commit], output: Path) -> None:
+        import pandas
+        import plotnine as gg
         df = pandas.DataFrame(c.as_dict() for c in commits)
         df['created_at'] = pandas.to_datetime(df.created_at, utc=True)
         graph = (
@@ -42,5 +79,4 @@ class Plot(Command):
             + gg.xlab('commit time')
             + gg.ylab('unresolved issues')
         )
-        graph.save(self.args.output)
-        return 0
+        graph.save(output)
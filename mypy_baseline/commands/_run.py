@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import io
+import os
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+from argparse import REMAINDER, ArgumentParser
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Iterator
+
+from ._filter import Filter
+
+
+# How many bytes of mypy output to buffer when reading it.
+CHUNK_SIZE = 2 ** 16
+# How long to wait for mypy to exit after asking it nicely, in seconds.
+KILL_GRACE_PERIOD = 5.0
+# Exit codes of mypy that mean it successfully checked the code.
+MYPY_OK_CODES = frozenset({0, 1})
+# The summary that mypy prints at the end, possibly colored.
+REX_SUMMARY = re.compile(
+    r'(?:\x1b\[[\d;]*m)*(?:Found \d+ errors? in \d+ files?|Success: no issues found)',
+)
+
+
+class Run(Filter):
+    """Run mypy and filter out old errors from its output.
+    """
+
+    @classmethod
+    def init_parser(cls, parser: ArgumentParser) -> None:
+        super().init_parser(parser)
+        parser.add_argument(
+            '--timeout', type=float,
+            help='stop mypy if it runs longer than that many seconds.',
+        )
+        parser.add_argument(
+            'command', nargs=REMAINDER,
+            help='the command to run after `--`, `python -m mypy` by default.',
+        )
+
+    def run(self) -> int:
+        command: list[str] = self.args.command
+        if command and command[0] == '--':
+            command = command[1:]
+        if not command:
+            command = [sys.executable, '-m', 'mypy']
+        with self.profiler.phase('spawn'):
+            try:
+                proc = subprocess.Popen(
+                    command,
+                    stdout=subprocess.PIPE,
+                    env=self._get_env(),
+                    bufsize=CHUNK_SIZE,
+                )
+            except FileNotFoundError:
+                self.print(f'command not found: {command[0]}')
+                return 127
+            except PermissionError:
+                self.print(f'command is not executable: {command[0]}')
+                return 126
+        assert proc.stdout is not None
+        self._proc = proc
+        self._stopped = False
+        self._pending_write: Callable[[], None] | None = None
+        deadline = _Deadline(proc, self.args.timeout)
+        with _forward_signals(proc) as signals, deadline, proc.stdout:
+            # Filter the output line by line as mypy produces it.
+            output = _MypyOutput(proc.stdout, encoding='utf8', errors='replace')
+            self.stdin = output
+            code = super().run()
+            mypy_code = proc.wait()
+
+        if self._stopped:
+            # We've stopped mypy ourselves because of --fail-fast.
+            return code
+        # mypy exits with 1 only if it has found errors. If there are none
+        # in the output, it's python that has failed, like when mypy isn't installed.
+        checked = mypy_code != 1 or output.has_summary or self.found_errors
+        if deadline.expired:
+            self.print(f'mypy timed out after {self.args.timeout} seconds')
+        elif mypy_code not in MYPY_OK_CODES:
+            self.print(f'mypy failed with exit code {mypy_code}')
+        elif signals:
+            self.print('mypy has been interrupted')
+        elif not checked:
+            self.print('mypy has printed neither errors nor the summary')
+        elif self._pending_write is not None:
+            self._pending_write()
+            self._pending_write = None
+        if self._pending_write is not None:
+            self.print('the baseline and the result are not saved')
+        if not checked:
+            return mypy_code
+        return _combine_codes(code, mypy_code)
+
+    def write_results(self, *args: Any) -> None:
+        """Save results only after mypy has successfully finished.
+
+        If mypy has failed, timed out, or has been interrupted,
+        its output is incomplete and cannot replace the baseline.
+        """
+        self._pending_write = partial(super().write_results, *args)
+
+    def stop_input(self) -> None:
+        """Stop mypy, we already know the verdict.
+        """
+        self._stopped = True
+        if self._proc.poll() is None:
+            self._proc.terminate()
+        super().stop_input()
+
+    def _get_env(self) -> dict[str, str]:
+        """Environment variables for mypy.
+
+        mypy doesn't use colors when its output is piped, so we force it
+        to use colors (and the terminal width) if our own output is a terminal.
+        """
+        env = dict(os.environ)
+        if not self.config.no_colors and self.stdout.isatty():
+            env.setdefault('MYPY_FORCE_COLOR', '1')
+            width = shutil.get_terminal_size().columns
+            env.setdefault('MYPY_FORCE_TERMINAL_WIDTH', str(width))
+        return env
+
+
+class _MypyOutput(io.TextIOWrapper):
+    """The output of mypy that remembers if mypy has printed its summary.
+
+    The summary (or at least one error) shows that mypy has actually checked
+    the code, the exit code alone cannot tell it: python also exits with 1
+    when the mypy module cannot be imported.
+    """
+    has_summary = False
+
+    def __next__(self) -> str:  # type: ignore[override]
+        line = super().__next__()
+        if not self.has_summary and REX_SUMMARY.match(line):
+            self.has_summary = True
+        return line
+
+
+class _Deadline:
+    """Stop the process if it doesn't finish in time.
+    """
+    __slots__ = ('expired', '_proc', '_timer')
+
+    def __init__(self, proc: subprocess.Popen, timeout: float | None) -> None:
+        self.expired = False
+        self._proc = proc
+        self._timer = None
+        if timeout is not None:
+            self._timer = threading.Timer(timeout, self._expire)
+            self._timer.daemon = True
+
+    def __enter__(self) -> _Deadline:
+        if self._timer is not None:
+            self._timer.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+
+    def _expire(self) -> None:
+        self.expired = True
+        self._proc.terminate()
+        try:
+            self._proc.wait(KILL_GRACE_PERIOD)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+
+
+@contextmanager
+def _forward_signals(proc: subprocess.Popen) -> Iterator[list[int]]:
+    """Pass termination signals to the process instead of exiting.
+
+    So, mypy can stop gracefully, and we still filter whatever it has printed
+    and report the exit code. Signal handlers can be set only in the main thread.
+    Produces the list of signals that have been forwarded so far.
+    """
+    forwarded: list[int] = []
+    if threading.current_thread() is not threading.main_thread():
+        yield forwarded
+        return
+
+    def forward(signum: int, frame: object) -> None:
+        if proc.poll() is None:
+            forwarded.append(signum)
+            proc.send_signal(signum)
+
+    signums = [signal.SIGINT, signal.SIGTERM]
+    if hasattr(signal, 'SIGHUP'):
+        signums.append(signal.SIGHUP)
+    old_handlers = {signum: signal.signal(signum, forward) for signum in signums}
+    try:
+        yield forwarded
+    finally:
+        for signum, handler in old_handlers.items():
+            signal.signal(signum, handler)
+
+
+def _combine_codes(filter_code: int, mypy_code: int) -> int:
+    """Get the exit code that takes into account both mypy and the filter.
+
+    If mypy checked the code, the filter knows better if there are new errors.
+    If mypy failed, the filter results cannot be trusted.
+    """
+    if mypy_code in MYPY_OK_CODES:
+        return filter_code
+    if mypy_code < 0:
+        # Killed by a signal, use the same exit code as shells do.
+        return 128 - mypy_code
+    return mypy_code
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import socket
+import traceback
+from argparse import ArgumentParser, Namespace
+from dataclasses import dataclass
+from io import StringIO
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .._baseline import BaselineIndex
+from .._config import Config
+from .._daemon import (
+    add_socket_argument, encode_response, is_supported, recv_all,
+)
+from .._shards import Shards, read_index
+from ._base import Command
+from ._filter import Filter, with_filter_defaults
+
+
+# The size and modification time of a file, None if there is no such file.
+FileStat = Optional[Tuple[int, int]]
+
+
+class Serve(Command):
+    """Run a daemon that keeps the baseline in memory for `client`.
+    """
+
+    @classmethod
+    def init_parser(cls, parser: ArgumentParser) -> None:
+        super().init_parser(parser)
+        add_socket_argument(parser)
+
+    def run(self) -> int:
+        if not is_supported():
+            self.print('Unix sockets are not supported on this platform')
+            return 1
+        path: Path = self.args.socket
+        if _is_listening(path):
+            self.print(f'the daemon is already running at {path}')
+            return 1
+        # The socket file left by a daemon that didn't exit cleanly.
+        path.unlink(missing_ok=True)
+
+        state = _State(self.args)
+        state.refresh()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(str(path))
+            try:
+                server.listen()
+                self.print(f'listening on {path}')
+                self.stdout.flush()
+                while True:
+                    conn, _ = server.accept()
+                    with conn:
+                        self._handle(conn, state)
+            except KeyboardInterrupt:
+                return 0
+            finally:
+                path.unlink(missing_ok=True)
+
+    def _handle(self, conn: socket.socket, state: _State) -> None:
+        with self.profiler.phase('request'):
+            data = recv_all(conn)
+        with self.profiler.phase('filter'):
+            try:
+                state.refresh()
+                code, output = state.filter(data.decode('utf8'))
+            except Exception:
+                code, output = 1, traceback.format_exc()
+        try:
+            conn.sendall(encode_response(code, output))
+        except OSError:
+            # The client has gone away, for example, it was only checking
+            # if the daemon is running.
+            pass
+
+
+@dataclass
+class _CachedFilter(Filter):
+    """The filter command that uses the baseline already read by the daemon.
+    """
+    index: BaselineIndex | None = None
+
+    def read_index(self) -> BaselineIndex:
+        assert self.index is not None
+        # The index is shared by all requests, each one matches lines on its own.
+        return self.index.copy()
+
+
+class _State:
+    """The config and the baseline, reread only when the files change.
+
+    Checking for changes takes a few `stat` calls, which is much faster
+    than reading and parsing the files on every request.
+    """
+    __slots__ = ('args', 'config', 'index', '_config_stat', '_baseline_stat')
+
+    def __init__(self, args: Namespace) -> None:
+        self.args = args
+        self.config = Config()
+        self.index = BaselineIndex([])
+        self._config_stat: list[FileStat] | None = None
+        self._baseline_stat: list[FileStat] | None = None
+
+    def refresh(self) -> None:
+        config_stat = [_stat(Path(self.args.config))]
+        if config_stat != self._config_stat:
+            self.config = Config.from_args(vars(self.args))
+            self._config_stat = config_stat
+            self._baseline_stat = None
+        baseline_stat = [_stat(path) for path in self._get_baseline_files()]
+        if baseline_stat != self._baseline_stat:
+            self.index = read_index(self.config)
+            # Parse everything in advance, so that requests don't have to.
+            self.index.parse_all()
+            self._baseline_stat = baseline_stat
+
+    def filter(self, text: str) -> tuple[int, str]:
+        args = with_filter_defaults(self.args)
+        stdout = StringIO()
+        cmd = _CachedFilter(args=args, stdin=StringIO(text), stdout=stdout)
+        cmd.config = self.config
+        cmd.index = self.index
+        code = cmd.run()
+        return code, stdout.getvalue()
+
+    def _get_baseline_files(self) -> list[Path]:
+        shards = Shards.from_config(self.config)
+        if shards is None:
+            return [self.config.baseline_path]
+        return [shards.get_path(key) for key in shards.keys()]
+
+
+def _stat(path: Path) -> FileStat:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def _is_listening(path: Path) -> bool:
+    """Check if there is a daemon accepting connections on the socket.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        try:
+            conn.connect(str(path))
+        except OSError:
+            return False
+    return True
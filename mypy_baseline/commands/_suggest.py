@@ -11,6 +11,8 @@ from typing import Iterable
 
 from .._config import Config
 from .._error import Error
+from .._git import ObjectReader, read_lines_at
+from .._shards import get_baseline_path, read_index
 from ._base import Command
 
 
@@ -101,15 +103,13 @@ class Suggest(Command):
     def fixed_count(self) -> int:
         """Get number of baseline violations fixed in this PR.
         """
-        lines = self._get_stdout(
-            'diff', self.target, 'HEAD', '--',
-            str(self.config.baseline_path),
-        )
-        count = 0
-        for line in lines:
-            if line.startswith('-') and not line.startswith('---'):
-                count += 1
-        return count
+        path = get_baseline_path(self.config)
+        objects = ObjectReader()
+        with self.profiler.phase('git'):
+            old_lines = read_lines_at(path, self.target, objects)
+            new_lines = read_lines_at(path, 'HEAD', objects)
+        objects.close()
+        return sum((old_lines - new_lines).values())
 
     @cached_property
     def changed_files(self) -> tuple[Path, ...]:
@@ -121,7 +121,8 @@ class Suggest(Command):
     def _get_stdout(self, *args: str) -> list[str]:
         """Run the command in the shell and get stdout lines.
         """
-        result = subprocess.run(['git', *args], stdout=subprocess.PIPE)
+        with self.profiler.phase('git'):
+            result = subprocess.run(['git', *args], stdout=subprocess.PIPE)
         result.check_returncode()
         stdout = result.stdout.decode().strip()
         return stdout.splitlines()
@@ -146,10 +147,11 @@ class Suggest(Command):
         """Parse errors from the baseline.
         """
         baseline: list[Error] = []
-        for line in self.baseline_lines:
-            err = Error.new(line)
-            if err is not None:
-                baseline.append(err)
+        with self.profiler.phase('baseline'):
+            for line in self.baseline_lines:
+                err = Error.new(line)
+                if err is not None:
+                    baseline.append(err)
         if not baseline:
             raise RuntimeError('baseline is empty')
         return baseline
@@ -160,8 +162,7 @@ class Suggest(Command):
         """
         # if not self.stdin.isatty():
         #     return self.stdin
-        text = self.config.baseline_path.read_text(encoding='utf8')
-        return text.splitlines()
+        return read_index(self.config).lines
 
     @cached_property
     def seed(self) -> str:
@@ -200,7 +201,7 @@ class Suggest(Command):
 
         # form the message
         s = 's' if self.args.min_fixed > 1 else ''
-        path = self.config.baseline_path
+        path = get_baseline_path(self.config)
         count = self.args.min_fixed
         msg = f"""
             ## mypy-baseline suggest
@@ -3,7 +3,8 @@ from __future__ import annotations
 from argparse import ArgumentParser
 from collections import defaultdict
 
-from .._error import Error
+from .._parallel import add_jobs_argument
+from .._shards import read_index
 from ._base import Command
 
 
@@ -17,18 +18,22 @@ class TopFiles(Command):
             '-n', type=int, default=20,
             help='how many files to show',
         )
+        add_jobs_argument(parser)
 
     def run(self) -> int:
-        baseline_text = self.config.baseline_path.read_text(encoding='utf8')
+        with self.profiler.phase('baseline'):
+            index = read_index(self.config)
+        with self.profiler.phase('parse'):
+            index.parse_all(jobs=self.args.jobs)
+        for line in index.get_invalid():
+            self.print(f'cannot parse line: {line}')
+            return 1
         file_stats: dict[str, int] = defaultdict(int)
-        baseline = baseline_text.strip().splitlines()
-        for line in baseline:
-            error = Error.new(line)
-            if error is None:
-                self.print(f'cannot parse line: {line}')
-                return 1
-            path = '/'.join(error.path.parts[:self.config.depth])
-            file_stats[path] += 1
+        total = 0
+        for path, count in index.files.items():
+            path = '/'.join(path.split('/')[:self.config.depth])
+            file_stats[path] += count
+            total += count
 
         sorted_file_stats = sorted(
             file_stats.items(),
@@ -39,7 +44,7 @@ class TopFiles(Command):
         for path, total_count in sorted_file_stats[:self.args.n]:
             total_formatted = f'{total_count:>3}'
             path = path.ljust(max_width)
-            percent = round(total_count / len(baseline) * 100, 1)
+            percent = round(total_count / total * 100, 1)
             self.print(f'{path} {self.colors.blue(total_formatted)} {percent:>4}%')
 
         return 0
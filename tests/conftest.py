@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def repo(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    for name in ('AUTHOR', 'COMMITTER'):
+        monkeypatch.setenv(f'GIT_{name}_NAME', 'test')
+        monkeypatch.setenv(f'GIT_{name}_EMAIL', 'test@example.com')
+    subprocess.run(['git', 'init', '-q'], check=True)
+    return tmp_path
@@ -0,0 +1,149 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from mypy_baseline._baseline import (
+    BaselineIndex, Entry, get_index_path, stable_merge,
+)
+
+
+def test_remove():
+    bline = BaselineIndex(['a', 'b', 'a'])
+    assert bline.remove('a')
+    assert bline.remove('a')
+    assert not bline.remove('a')
+    assert not bline.remove('c')
+    assert list(bline.get_unmatched()) == ['b']
+
+
+def test_get_unmatched__order():
+    bline = BaselineIndex(['a', 'b', 'a', 'c'])
+    assert bline.remove('a')
+    assert bline.remove('c')
+    assert list(bline.get_unmatched()) == ['b', 'a']
+    # a copy starts with nothing matched
+    assert list(bline.copy().get_unmatched()) == ['a', 'b', 'a', 'c']
+    assert bline.counts['a'] == 2
+
+
+LINE1 = 'views.py:0: error: Hello world  [assignment]'
+LINE2 = 'settings.py:0: note: How are you?'
+
+
+def test_index__lazy(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    blpath.write_text(f'{LINE1}\n{LINE2}\n{LINE1}\noh hi mark\n')
+    index = BaselineIndex.read(blpath)
+    assert index.counts[LINE1] == 2
+    assert index.get(LINE1) == Entry('views.py', 'error', 'assignment')
+    assert index.get(LINE2) == Entry('settings.py', 'note', 'note')
+    assert list(index.get_invalid()) == ['oh hi mark']
+    assert index.files == {'views.py': 2, 'settings.py': 1}
+    assert index.categories == {'assignment': 2, 'note': 1}
+    assert not get_index_path(blpath).exists()
+
+
+def test_index__cache(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    blpath.write_text(f'{LINE1}\n{LINE2}\n')
+    index_path = get_index_path(blpath)
+    assert index_path.name == '.bline.idx'
+
+    # the index is written only when all lines need to be parsed
+    index = BaselineIndex.read(blpath, cache=True)
+    assert index.get(LINE1) == Entry('views.py', 'error', 'assignment')
+    assert not index_path.exists()
+    assert index.files == {'views.py': 1, 'settings.py': 1}
+    assert index_path.exists()
+    # the index doesn't store the lines themselves
+    assert LINE1 not in index_path.read_text()
+
+    # the index is used if the baseline is not changed
+    index = BaselineIndex.read(blpath, cache=True)
+    assert index.lines == [LINE1, LINE2]
+    index.parse_all()
+    assert index._entries == {
+        LINE1: Entry('views.py', 'error', 'assignment'),
+        LINE2: Entry('settings.py', 'note', 'note'),
+    }
+    assert index.categories == {'assignment': 1, 'note': 1}
+
+    # the index is rebuilt if the baseline is changed
+    blpath.write_text(f'{LINE1}\noh hi mark\n')
+    index = BaselineIndex.read(blpath, cache=True)
+    assert index.lines == [LINE1, 'oh hi mark']
+    assert index.files == {'views.py': 1}
+    index = BaselineIndex.read(blpath, cache=True)
+    assert list(index.get_invalid()) == ['oh hi mark']
+
+
+def test_index__cache_racy(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    blpath.write_text(f'{LINE1}\n')
+    index = BaselineIndex.read(blpath, cache=True)
+    assert index.files == {'views.py': 1}
+
+    # the baseline is changed in the same timestamp tick, size and mtime are the same
+    mtime = blpath.stat().st_mtime_ns
+    blpath.write_text(LINE1.replace('views', 'viewz') + '\n')
+    os.utime(blpath, ns=(mtime, mtime))
+    index = BaselineIndex.read(blpath, cache=True)
+    assert index.files == {'viewz.py': 1}
+
+
+def test_index__cache_fast_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    blpath = tmp_path / 'bline.txt'
+    blpath.write_text(f'{LINE1}\n')
+    # the baseline has been modified long before it's indexed
+    os.utime(blpath, ns=(10 ** 18, 10 ** 18))
+    BaselineIndex.read(blpath, cache=True).parse_all()
+
+    def fail(*args, **kwargs):
+        raise AssertionError('must not be called')
+
+    monkeypatch.setattr('mypy_baseline._baseline.sha256', fail)
+    monkeypatch.setattr('mypy_baseline._baseline._parse_entry', fail)
+    index = BaselineIndex.read(blpath, cache=True)
+    assert index.lines == [LINE1]
+    assert index.files == {'views.py': 1}
+
+
+def test_index__cache_corrupted(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    blpath.write_text(f'{LINE1}\n')
+    get_index_path(blpath).write_text('{')
+    index = BaselineIndex.read(blpath, cache=True)
+    assert index.lines == [LINE1]
+    assert index.files == {'views.py': 1}
+
+
+def test_index__missing_baseline(tmp_path: Path):
+    index = BaselineIndex.read(tmp_path / 'bline.txt', cache=True)
+    assert index.lines == []
+
+
+@pytest.mark.parametrize('old, new, expected', [
+    # nothing changed, the old order is preserved
+    ('a1 b1 c1', 'c1 b1 a1', 'a1 b1 c1'),
+    # fixed errors are removed
+    ('a1 b1 a2 c1', 'c1 a1', 'a1 c1'),
+    # new error goes after the last line for the same file
+    ('a1 b1 a2 c1', 'c1 b2 a1 a2 b1', 'a1 b1 b2 a2 c1'),
+    # new file goes after the file that precedes it in the new baseline
+    ('a1 b1 c1', 'a1 b1 d1 d2 c1', 'a1 b1 d1 d2 c1'),
+    ('a1 b1 c1', 'c1 d1 b1 a1', 'a1 b1 c1 d1'),
+    # new file that is the first one goes at the beginning
+    ('a1 b1', 'd1 a1 b1', 'd1 a1 b1'),
+    # duplicates are counted
+    ('a1 a1 b1', 'a1 b1 a1 a1', 'a1 a1 a1 b1'),
+    ('a1 a1 b1', 'b1 a1', 'a1 b1'),
+    # empty baselines
+    ('', 'a1 b1', 'a1 b1'),
+    ('a1 b1', '', ''),
+])
+def test_stable_merge(old: str, new: str, expected: str):
+    new_lines = new.split()
+    # The first letter is the file name.
+    paths = {line: line[0] for line in new_lines}
+    assert stable_merge(old.split(), new_lines, paths) == expected.split()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from mypy_baseline._breakdown import Breakdown
+from mypy_baseline._git import get_commits
+
+from .test_git import commit
+
+
+LINE1 = 'a.py:0: error: x  [arg-type]'
+LINE2 = 'pkg/b.py:0: error: y  [misc]'
+LINE3 = 'pkg/sub/c.py:0: error: z  [misc]'
+
+
+@pytest.mark.parametrize('by, depth, expected', [
+    ('category', 40, [
+        {'arg-type': 1, 'misc': 1},
+        {'misc': 2},
+        {'arg-type': -1, 'misc': -1},
+    ]),
+    ('file', 40, [
+        {'a.py': 1, 'pkg/b.py': 1},
+        {'pkg/b.py': 1, 'pkg/sub/c.py': 1},
+        {'a.py': -1, 'pkg/b.py': -1},
+    ]),
+    ('directory', 1, [
+        {'.': 1, 'pkg': 1},
+        {'pkg': 2},
+        {'.': -1, 'pkg': -1},
+    ]),
+])
+def test_breakdown(repo: Path, by: str, depth: int, expected: list[dict[str, int]]):
+    path = Path('bline.txt')
+    versions = [
+        [LINE1, LINE2, 'not an error'],
+        [LINE1, LINE2, LINE2, LINE3],
+        [LINE2, LINE3],
+    ]
+    for lines in versions:
+        path.write_text('\n'.join(lines) + '\n')
+        commit(path)
+    breakdown = Breakdown(by, depth=depth)
+    actual = [breakdown.update(c) for c in get_commits(path)]
+    assert actual == expected
+    assert sum(breakdown.counts.values()) == 2
+
+
+def test_breakdown__dir(repo: Path):
+    (repo / 'bline').mkdir()
+    (repo / 'bline' / 'a.txt').write_text(LINE1 + '\n')
+    (repo / 'bline' / 'b.txt').write_text(LINE2 + '\n')
+    commit(repo / 'bline')
+    (repo / 'bline' / 'b.txt').write_text(f'{LINE2}\n{LINE3}\n')
+    commit(repo / 'bline')
+    (repo / 'bline' / 'a.txt').unlink()
+    commit(repo / 'bline')
+    breakdown = Breakdown('category', depth=40)
+    actual = [breakdown.update(c) for c in get_commits(Path('bline'))]
+    assert actual == [{'arg-type': 1, 'misc': 1}, {'misc': 1}, {'arg-type': -1}]
+    assert breakdown.counts == {'arg-type': 0, 'misc': 2}
+
+
+def test_breakdown__start_before(repo: Path):
+    path = Path('bline.txt')
+    for lines in ([LINE1], [LINE1, LINE2]):
+        path.write_text('\n'.join(lines) + '\n')
+        commit(path)
+    last = list(get_commits(path))[-1]
+    breakdown = Breakdown('category', depth=40)
+    breakdown.start_before(last)
+    assert breakdown.update(last) == {'misc': 1}
+    assert breakdown.counts == {'arg-type': 1, 'misc': 1}
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pytest
+
+from mypy_baseline._chart import (
+    COLOR_FIXED, COLOR_NEW, get_ticks, get_time_ticks, render_svg,
+)
+from mypy_baseline._git import Commit
+
+
+@pytest.mark.parametrize('max_value, expected', [
+    (0, [0]),
+    (3, [0, 1, 2, 3]),
+    (10, [0, 2, 4, 6, 8, 10]),
+    (65, [0, 20, 40, 60, 80]),
+    (1200, [0, 200, 400, 600, 800, 1000, 1200]),
+])
+def test_get_ticks(max_value: int, expected: list[int]):
+    assert get_ticks(max_value) == expected
+
+
+def test_get_time_ticks():
+    start = datetime(2022, 9, 1, tzinfo=timezone.utc).timestamp()
+    ticks = get_time_ticks(start, start + 50 * 24 * 3600)
+    assert len(ticks) == 6
+    assert ticks[0] == (start, '2022-09-01')
+    assert ticks[-1][1] == '2022-10-21'
+    assert get_time_ticks(start, start) == [(start, '2022-09-01 00:00')]
+
+
+def make_commit(days: int, count: int, insertions: int, deletions: int) -> Commit:
+    start = datetime(2022, 9, 1, tzinfo=timezone.utc)
+    commit = Commit(
+        path=Path('bline.txt'),
+        hash=f'{days:040}',
+        author_email='test@example.com',
+        created_at=start + timedelta(days=days),
+        insertions=insertions,
+        deletions=deletions,
+    )
+    commit.lines_count = count
+    return commit
+
+
+def test_render_svg():
+    commits = [
+        make_commit(0, 10, insertions=10, deletions=0),
+        make_commit(3, 7, insertions=1, deletions=4),
+        make_commit(9, 12, insertions=5, deletions=0),
+    ]
+    svg = render_svg(commits)
+    root = ElementTree.fromstring(svg)
+    ns = '{http://www.w3.org/2000/svg}'
+    points = root.findall(f'{ns}circle')
+    # one for each commit and two in the legend
+    assert len(points) == 5
+    colors = [p.get('fill') for p in points[:3]]
+    assert colors == [COLOR_NEW, COLOR_FIXED, COLOR_NEW]
+    title = points[1].find(f'{ns}title')
+    assert title is not None
+    assert title.text == f'2022-09-04 00:00:00+00:00 {"0" * 10} test@example.com: 7'
+    polyline = root.find(f'{ns}polyline')
+    assert polyline is not None
+    assert len(polyline.get('points', '').split()) == 3
+
+
+def test_render_svg__one_commit():
+    svg = render_svg([make_commit(0, 0, insertions=0, deletions=0)])
+    ElementTree.fromstring(svg)
+
+
+def test_render_svg__unsorted_dates():
+    commits = [
+        make_commit(5, 10, insertions=10, deletions=0),
+        # the commit date goes backwards, like after a rebase
+        make_commit(0, 7, insertions=1, deletions=4),
+        make_commit(9, 12, insertions=5, deletions=0),
+    ]
+    root = ElementTree.fromstring(render_svg(commits))
+    ns = '{http://www.w3.org/2000/svg}'
+    area = root.findall(f'{ns}rect')[1]
+    left = float(area.get('x', ''))
+    right = left + float(area.get('width', ''))
+    xs = [float(p.get('cx', '')) for p in root.findall(f'{ns}circle')[:3]]
+    assert all(left <= x <= right for x in xs)
+    # points are sorted by time, so the line doesn't go backwards
+    assert xs == sorted(xs)
+    assert xs[0] == left
+    assert xs[-1] == right
+    polyline = root.find(f'{ns}polyline')
+    assert polyline is not None
+    line_xs = [float(p.split(',')[0]) for p in polyline.get('points', '').split()]
+    assert line_xs == xs
+    labels = [
+        t.text for t in root.findall(f'{ns}text')
+        if 'rotate(-45' in t.get('transform', '')
+    ]
+    assert labels[0] == '2022-09-01'
+    assert labels[-1] == '2022-09-10'
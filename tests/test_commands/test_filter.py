@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 from io import StringIO
+from pathlib import Path
+
+import pytest
 
 from mypy_baseline import main
+from mypy_baseline._baseline import BaselineIndex
+from mypy_baseline.commands._filter import Filter
 
 from .helpers import (
     LINE1, LINE2, LINE3, LINE_WITH_NOTE, NOTEBOOK_LINE1, SUCCESS_LINE, run,
@@ -82,3 +87,206 @@ def test_filter_success():
     assert code == 0
     actual = stdout.getvalue()
     assert actual == SUCCESS_LINE
+
+
+def test_filter__duplicates(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    bline = f'{LINE1}{LINE2}{LINE1}{LINE1}'
+    blpath.write_text(bline.replace(':69:', ':0:').replace(':42:', ':0:'))
+    stdin = StringIO()
+    stdin.write(LINE1)
+    stdin.write(LINE1)
+    stdin.seek(0)
+    stdout = StringIO()
+    cmd = ['filter', '--baseline-path', str(blpath), '--no-colors']
+    code = main(cmd, stdin, stdout)
+    assert code == 2
+    actual = stdout.getvalue()
+    assert '  fixed: 2' in actual
+    assert '  new: 0' in actual
+    assert '  unresolved: 2' in actual
+
+
+class _CountingLine(str):
+    """Baseline line that counts how many times it's compared with other lines.
+    """
+    comparisons = 0
+
+    def __eq__(self, other: object) -> bool:
+        _CountingLine.comparisons += 1
+        return str.__eq__(self, other)
+
+    __hash__ = str.__hash__
+
+
+def _count_comparisons(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    size: int,
+) -> int:
+    lines = [f'pkg/mod{i}.py:{i}: error: Message {i}  [misc]\n' for i in range(size)]
+    bline = [line.replace(f':{i}:', ':0:').rstrip() for i, line in enumerate(lines)]
+    index = BaselineIndex([_CountingLine(line) for line in bline])
+    monkeypatch.setattr(Filter, 'read_index', lambda self: index)
+    # The matching order is reversed to make it the worst case for a linear search.
+    stdin = StringIO(''.join(reversed(lines)))
+    _CountingLine.comparisons = 0
+    cmd = ['filter', '--baseline-path', str(tmp_path / 'bline.txt')]
+    assert main(cmd, stdin, StringIO()) == 0
+    return _CountingLine.comparisons
+
+
+@pytest.mark.parametrize('size', [2_000, 16_000])
+def test_filter__scales_linearly(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    size: int,
+):
+    # Each error is looked up in the baseline a constant number of times.
+    # A linear search would make about size ** 2 / 2 comparisons.
+    comparisons = _count_comparisons(tmp_path, monkeypatch, size)
+    assert 0 < comparisons <= 2 * size
+
+
+def test_filter__baseline_index(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    blpath.write_text(LINE1.replace(':69:', ':0:') + LINE2.replace(':42:', ':0:'))
+    cmd = ['filter', '--baseline-path', str(blpath), '--no-colors', '--baseline-index']
+    index_path = tmp_path / '.bline.idx'
+    top_files = ['top-files', '--baseline-path', str(blpath), '--baseline-index']
+    for _ in range(2):
+        stdin = StringIO(LINE1)
+        stdout = StringIO()
+        code = main(cmd, stdin, stdout)
+        assert code == 1
+        actual = stdout.getvalue()
+        assert '  fixed: 1' in actual
+        assert '  union-attr  ' in actual
+        # filter parses only unmatched lines, the index isn't worth loading,
+        # it's built by commands that need all lines parsed
+        if not index_path.exists():
+            assert main(top_files, StringIO(), StringIO()) == 0
+            assert index_path.exists()
+
+
+def test_filter__jobs(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    lines = [
+        f'pkg/mod{i % 300}.py:{i}: error: Message {i % 7}  [misc]\n'
+        for i in range(6000)
+    ]
+    lines[100] = SUCCESS_LINE + '\n'
+    blpath.write_text(''.join(lines[::2]).replace(':', ':0:', 1))
+    outputs = []
+    for jobs in ('1', '3'):
+        stdout = StringIO()
+        cmd = ['filter', '--baseline-path', str(blpath), '--jobs', jobs]
+        code = main(cmd, StringIO(''.join(lines)), stdout)
+        outputs.append((code, stdout.getvalue()))
+    assert outputs[0] == outputs[1]
+
+
+def test_filter__json(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    blpath.write_text('views.py:0: error: Hello world  [assignment]\n')
+    line1 = '{"file": "views.py", "line": 69, "column": 1, "message": "Hello world", "hint": null, "code": "assignment", "severity": "error"}\n'  # noqa: E501
+    line2 = '{"file": "settings.py", "line": 42, "column": 1, "message": "How are you?", "hint": "Oh hi mark", "code": "union-attr", "severity": "error"}\n'  # noqa: E501
+    stdout = StringIO()
+    cmd = ['filter', '--baseline-path', str(blpath), '--input-format', 'json']
+    code = main(cmd, StringIO(line1 + line2), stdout)
+    assert code == 2
+    actual = stdout.getvalue()
+    assert line1 not in actual
+    assert actual.startswith(line2)
+    assert '  unresolved: \x1b[94m1' in actual
+
+
+def test_filter__shards(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    sync_cmd = ['sync', '--baseline-path', str(blpath), '--shard-depth', '1']
+    code = main(sync_cmd, StringIO(f'{LINE1}{LINE3}'), StringIO())
+    assert code == 0
+
+    stdout = StringIO()
+    cmd = ['filter', '--baseline-path', str(blpath), '--shard-depth', '1', '--no-colors']
+    code = main(cmd, StringIO(f'{LINE2}{LINE3}'), stdout)
+    assert code == 2
+    actual = stdout.getvalue()
+    assert LINE2.strip() in actual
+    assert LINE3.strip() not in actual
+    assert 'fixed: 1' in actual
+    assert 'new: 1' in actual
+
+
+def test_filter__update_baseline(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    blpath.write_text(
+        'settings.py:0: error: How are you?  [union-attr]\n'
+        'python/utils.py:0: error: Fixed  [misc]\n',
+    )
+    stdin = StringIO(LINE1 + LINE2 + LINE3)
+    stdout = StringIO()
+    cmd = ['filter', '--update-baseline', '--baseline-path', str(blpath)]
+    code = main(cmd, stdin, stdout)
+    # The output and the exit code are the same as without the flag.
+    assert code == 3
+    assert LINE1.strip() in stdout.getvalue()
+    assert 'fixed: ' in stdout.getvalue()
+    # The baseline is synced the same way as by `sync`.
+    assert blpath.read_text().splitlines() == [
+        'views.py:0: error: Hello world  [assignment]',
+        'settings.py:0: error: How are you?  [union-attr]',
+        'python/utils.py:0: error: Second argument of Enum() must be string  [misc]',
+    ]
+    # Now, there is nothing new.
+    code = main(['filter', '--baseline-path', str(blpath)], StringIO(LINE1), StringIO())
+    assert code == 2
+    assert 'the baseline is unchanged' not in stdout.getvalue()
+    # Syncing the same output again doesn't change the baseline.
+    stdout = StringIO()
+    code = main(cmd, StringIO(LINE1 + LINE2 + LINE3), stdout)
+    assert code == 0
+    assert 'the baseline is unchanged' in stdout.getvalue()
+
+
+def test_filter__update_baseline_sorted(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    stdin = StringIO(LINE1 + LINE2)
+    cmd = [
+        'filter', '--update-baseline', '--sort-baseline',
+        '--baseline-path', str(blpath),
+    ]
+    code = main(cmd, stdin, StringIO())
+    assert code == 2
+    assert blpath.read_text().splitlines() == [
+        'settings.py:0: error: How are you?  [union-attr]',
+        'views.py:0: error: Hello world  [assignment]',
+    ]
+
+
+@pytest.mark.parametrize('flag, expected', [
+    ('--fail-fast', 1),
+    ('--fail-fast=2', 2),
+    ('--fail-fast=5', 3),
+])
+def test_filter__fail_fast(tmp_path: Path, flag: str, expected: int):
+    blpath = tmp_path / 'bline.txt'
+    stdin = StringIO(LINE1 + LINE2 + LINE3)
+    stdout = StringIO()
+    code = main(['filter', flag, '--baseline-path', str(blpath)], stdin, stdout)
+    assert code == expected
+    actual = stdout.getvalue()
+    lines = [LINE1, LINE2, LINE3]
+    for line in lines[:expected]:
+        assert line.strip() in actual
+    for line in lines[expected:]:
+        assert line.strip() not in actual
+    assert ('stopped after' in actual) == (expected < 3)
+
+
+@pytest.mark.parametrize('value', ['0', '-1', 'one'])
+def test_filter__fail_fast__invalid(tmp_path: Path, value: str):
+    blpath = tmp_path / 'bline.txt'
+    cmd = ['filter', f'--fail-fast={value}', '--baseline-path', str(blpath)]
+    with pytest.raises(SystemExit):
+        main(cmd, StringIO(LINE1), StringIO())
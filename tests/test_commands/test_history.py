@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
-from .helpers import run
+from ..test_git import commit
+from .helpers import LINE1, LINE2, run
 
 
 def test_history(request):
@@ -11,3 +13,38 @@ def test_history(request):
     actual = run(cmd)
     exp = '2022-09-01 11:45:28+02:00  60 =   3   -1  +58   8fe7afd10c  git@orsinium.dev'
     assert exp in actual
+
+
+def test_history__by(repo: Path):
+    path = Path('bline.txt')
+    for lines in ([LINE1, LINE2], [LINE2]):
+        path.write_text(''.join(lines))
+        commit(path)
+    cmd = ['history', '--by', 'category', '--baseline-path', str(path), '--no-color']
+    actual = run(cmd)
+    assert '   0 =    1      -1  assignment' in actual
+    # the total change is at the end, the most improved first
+    summary = actual.split('\n\n')[-1].splitlines()
+    assert summary[1:] == [
+        '   0 =    1      -1  assignment',
+        '   1 =    1      +0  union-attr',
+    ]
+
+
+def test_history__format(repo: Path):
+    path = Path('bline.txt')
+    for lines in ([LINE1, LINE2], [LINE2]):
+        path.write_text(''.join(lines))
+        commit(path)
+    cmd = ['history', '--baseline-path', str(path)]
+    actual = run([*cmd, '--format', 'ndjson'])
+    rows = [json.loads(line) for line in actual.splitlines()]
+    assert [row['lines_count'] for row in rows] == [2, 1]
+    assert rows[1]['path'] == 'bline.txt'
+
+    actual = run([*cmd, '--format', 'csv', '--by', 'category', '--max-count', '1'])
+    assert actual.splitlines()[1:] == [
+        f'{rows[1]["hash"]},{rows[1]["created_at"]},test@example.com,assignment,0,-1',
+    ]
+    actual = run([*cmd, '--format', 'json', '--rev-range', 'HEAD~1..HEAD'])
+    assert json.loads(actual) == rows[1:]
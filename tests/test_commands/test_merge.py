@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from io import StringIO
+from pathlib import Path
+
+from mypy_baseline import main
+
+from .helpers import LINE1, LINE2, LINE3
+
+
+BASELINE = (
+    'views.py:0: error: Hello world  [assignment]\n'
+    'settings.py:0: error: How are you?  [union-attr]\n'
+    'python/utils.py:0: error: Second argument of Enum() must be string  [misc]\n'
+)
+NEW_LINE = 'python/new.py:1: error: Oh no  [misc]\n'
+
+
+def run_part(blpath: Path, result: Path, stdin: str, paths: list[str]) -> int:
+    cmd = [
+        'filter', '--baseline-path', str(blpath),
+        '--save-result', str(result), '--paths', *paths,
+    ]
+    return main(cmd, StringIO(stdin), StringIO())
+
+
+def test_merge(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    blpath.write_text(BASELINE)
+    result1 = tmp_path / 'result1.json'
+    result2 = tmp_path / 'result2.json'
+    # The first part fixed an error in settings.py.
+    assert run_part(blpath, result1, LINE1, ['views.py', 'settings.py']) == 1
+    # Errors for files that haven't been checked aren't reported as fixed.
+    assert run_part(blpath, result2, LINE3, ['python']) == 0
+
+    stdout = StringIO()
+    cmd = ['merge', '--baseline-path', str(blpath), '--no-colors']
+    code = main([*cmd, str(result1), str(result2)], StringIO(), stdout)
+    assert code == 1
+    assert 'fixed: 1' in stdout.getvalue()
+    assert 'unresolved: 2' in stdout.getvalue()
+
+    cmd = ['merge', '--baseline-path', str(blpath), '--update-baseline']
+    code = main([*cmd, str(result1), str(result2)], StringIO(), StringIO())
+    assert code == 1
+    assert blpath.read_text().splitlines() == [
+        'views.py:0: error: Hello world  [assignment]',
+        'python/utils.py:0: error: Second argument of Enum() must be string  [misc]',
+    ]
+    code = main([*cmd, str(result1), str(result2)], StringIO(), StringIO())
+    assert code == 0
+
+
+def test_merge__new(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    blpath.write_text(BASELINE)
+    result1 = tmp_path / 'result1.json'
+    result2 = tmp_path / 'result2.json'
+    assert run_part(blpath, result1, LINE1 + LINE2, ['views.py', 'settings.py']) == 0
+    assert run_part(blpath, result2, LINE3 + NEW_LINE, ['python']) == 1
+
+    stdout = StringIO()
+    cmd = ['merge', '--baseline-path', str(blpath), str(result1), str(result2)]
+    code = main(cmd, StringIO(), stdout)
+    assert code == 1
+    assert stdout.getvalue().startswith(NEW_LINE)
+    assert 'new: ' in stdout.getvalue()
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from ..test_git import commit
+from .helpers import LINE1, LINE2, run
+
+
+@pytest.fixture
+def history(repo: Path) -> Path:
+    path = repo / 'bline.txt'
+    for lines in ([LINE1], [LINE1, LINE2], [LINE2]):
+        path.write_text(''.join(lines))
+        commit(path)
+    return path
+
+
+def test_plot__svg(history: Path, monkeypatch: pytest.MonkeyPatch):
+    # plotnine isn't used even if it is installed
+    monkeypatch.setitem(sys.modules, 'plotnine', None)
+    run(['plot', '--baseline-path', str(history), '--backend', 'builtin'])
+    svg = Path('mypy-baseline.svg').read_text()
+    assert svg.startswith('<svg ')
+    assert svg.count('<title>') == 2
+
+
+def test_plot__png_without_cairosvg(history: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(sys.modules, 'cairosvg', None)
+    output = history.parent / 'chart.png'
+    cmd = ['plot', '--baseline-path', str(history), '--backend', 'builtin']
+    actual = run([*cmd, '--output', str(output)], exit_code=1)
+    assert 'cairosvg package is required' in actual
+    assert not output.exists()
+
+
+def test_plot__no_history(repo: Path):
+    (repo / 'bline.txt').write_text(LINE1)
+    commit(repo / 'bline.txt')
+    actual = run(['plot', '--baseline-path', 'bline.txt'], exit_code=1)
+    assert 'not enough commits' in actual
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import os
+import signal
+import sys
+import threading
+import time
+from io import StringIO
+from pathlib import Path
+
+from mypy_baseline import main
+
+from .helpers import LINE1, LINE2
+
+
+# mypy output as it's seen through a pipe.
+OUTPUT = (LINE1 + LINE2).replace('\r\n', '\n')
+
+
+def fake_mypy(tmp_path: Path, output: str, code: int, sleep: float = 0) -> list[str]:
+    script = tmp_path / 'fake_mypy.py'
+    script.write_text(
+        'import sys, time\n'
+        f'sys.stdout.write({output!r})\n'
+        'sys.stdout.flush()\n'
+        f'time.sleep({sleep})\n'
+        f'sys.exit({code})\n',
+    )
+    return ['--', sys.executable, str(script)]
+
+
+def test_run(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    blpath.write_text('views.py:0: error: Hello world  [assignment]\n')
+    args = ['--baseline-path', str(blpath), '--no-colors']
+    stdout = StringIO()
+    code = main(['filter', *args], StringIO(OUTPUT), stdout)
+    assert code == 1
+
+    cmd = ['run', *args, *fake_mypy(tmp_path, OUTPUT, code=1)]
+    actual = StringIO()
+    assert main(cmd, StringIO(), actual) == code
+    assert actual.getvalue() == stdout.getvalue()
+
+
+def test_run__no_new_errors(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    blpath.write_text('views.py:0: error: Hello world  [assignment]\n')
+    cmd = ['run', '--baseline-path', str(blpath), *fake_mypy(tmp_path, LINE1, code=1)]
+    assert main(cmd, StringIO(), StringIO()) == 0
+
+
+def test_run__mypy_failed(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    cmd = ['run', '--baseline-path', str(blpath), *fake_mypy(tmp_path, '', code=2)]
+    stdout = StringIO()
+    assert main(cmd, StringIO(), stdout) == 2
+    assert 'mypy failed with exit code 2' in stdout.getvalue()
+
+
+def test_run__mypy_failed__update_baseline(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    old_baseline = ''.join(
+        f'views.py:0: error: Error {i}  [assignment]\n' for i in range(3)
+    )
+    blpath.write_text(old_baseline)
+    result_path = tmp_path / 'result.json'
+    cmd = [
+        'run', '--baseline-path', str(blpath), '--update-baseline',
+        '--save-result', str(result_path),
+        *fake_mypy(tmp_path, OUTPUT, code=2),
+    ]
+    stdout = StringIO()
+    assert main(cmd, StringIO(), stdout) == 2
+    assert 'mypy failed with exit code 2' in stdout.getvalue()
+    assert 'the baseline and the result are not saved' in stdout.getvalue()
+    assert blpath.read_text() == old_baseline
+    assert not result_path.exists()
+
+
+def test_run__interrupted__update_baseline(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    old_baseline = 'views.py:0: error: Hello world  [assignment]\n'
+    blpath.write_text(old_baseline)
+    script = tmp_path / 'fake_mypy.py'
+    # mypy handles the signal and exits as if it has checked everything
+    script.write_text(
+        'import signal, sys, time\n'
+        'signal.signal(signal.SIGTERM, lambda *args: sys.exit(1))\n'
+        f'sys.stdout.write({LINE2!r})\n'
+        'sys.stdout.flush()\n'
+        'time.sleep(30)\n',
+    )
+    cmd = [
+        'run', '--baseline-path', str(blpath), '--update-baseline',
+        '--', sys.executable, str(script),
+    ]
+    timer = threading.Timer(1, os.kill, (os.getpid(), signal.SIGTERM))
+    timer.start()
+    stdout = StringIO()
+    try:
+        main(cmd, StringIO(), stdout)
+    finally:
+        timer.cancel()
+    assert 'mypy has been interrupted' in stdout.getvalue()
+    assert blpath.read_text() == old_baseline
+
+
+def test_run__update_baseline(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    blpath.write_text('views.py:0: error: Hello world  [assignment]\n')
+    cmd = [
+        'run', '--baseline-path', str(blpath), '--update-baseline',
+        *fake_mypy(tmp_path, OUTPUT, code=1),
+    ]
+    main(cmd, StringIO(), StringIO())
+    assert blpath.read_text().count('\n') == 2
+
+
+def test_run__timeout(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    blpath.write_text('views.py:0: error: Hello world  [assignment]\n')
+    cmd = [
+        'run', '--baseline-path', str(blpath), '--timeout', '.5',
+        *fake_mypy(tmp_path, LINE1, code=1, sleep=30),
+    ]
+    stdout = StringIO()
+    start = time.monotonic()
+    code = main(cmd, StringIO(), stdout)
+    assert time.monotonic() - start < 10
+    assert code > 128
+    assert 'mypy timed out after 0.5 seconds' in stdout.getvalue()
+
+
+def test_run__fail_fast(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    cmd = [
+        'run', '--baseline-path', str(blpath), '--fail-fast',
+        *fake_mypy(tmp_path, OUTPUT, code=1, sleep=30),
+    ]
+    stdout = StringIO()
+    start = time.monotonic()
+    code = main(cmd, StringIO(), stdout)
+    assert time.monotonic() - start < 10
+    assert code == 1
+    assert LINE1.strip() in stdout.getvalue()
+    assert 'stopped after' in stdout.getvalue()
+
+
+def test_run__no_mypy_output__update_baseline(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    old_baseline = 'views.py:0: error: Hello world  [assignment]\n'
+    blpath.write_text(old_baseline)
+    cmd = [
+        'run', '--baseline-path', str(blpath), '--update-baseline',
+        '--', sys.executable, '-c', 'import nonexistent_module',
+    ]
+    stdout = StringIO()
+    assert main(cmd, StringIO(), stdout) == 1
+    assert 'mypy has printed neither errors nor the summary' in stdout.getvalue()
+    assert 'the baseline and the result are not saved' in stdout.getvalue()
+    assert blpath.read_text() == old_baseline
+
+
+def test_run__summary__update_baseline(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    blpath.write_text('views.py:0: error: Hello world  [assignment]\n')
+    # the errors are printed only into stderr, but the summary is in stdout
+    output = 'Found 1 error in 1 file (checked 3 source files)\n'
+    cmd = [
+        'run', '--baseline-path', str(blpath), '--update-baseline',
+        *fake_mypy(tmp_path, output, code=1),
+    ]
+    main(cmd, StringIO(), StringIO())
+    assert blpath.read_text().strip() == ''
+
+
+def test_run__command_not_found(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    cmd = ['run', '--baseline-path', str(blpath), '--', 'mypy-does-not-exist']
+    stdout = StringIO()
+    assert main(cmd, StringIO(), stdout) == 127
+    assert 'command not found: mypy-does-not-exist' in stdout.getvalue()
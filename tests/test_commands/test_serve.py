@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import threading
+import time
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from mypy_baseline import main
+from mypy_baseline._daemon import is_supported
+
+from .helpers import LINE1, LINE2
+
+
+pytestmark = pytest.mark.skipif(not is_supported(), reason='no Unix sockets')
+
+
+def filter_output(cmd: list[str], stdin: str) -> tuple[int, str]:
+    stdout = StringIO()
+    code = main(cmd, StringIO(stdin), stdout)
+    return code, stdout.getvalue()
+
+
+def start_daemon(args: list[str], sock: Path) -> None:
+    thread = threading.Thread(
+        target=main,
+        args=(['serve', *args, '--socket', str(sock)], StringIO(), StringIO()),
+        daemon=True,
+    )
+    thread.start()
+    for _ in range(500):
+        if sock.exists():
+            return
+        time.sleep(.01)
+    raise TimeoutError('the daemon did not start')
+
+
+def test_client__no_daemon(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    blpath.write_text('views.py:0: error: Hello world  [assignment]\n')
+    config = tmp_path / 'pyproject.toml'
+    config.write_text(
+        '[tool.mypy-baseline]\n'
+        f'baseline_path = {str(blpath)!r}\n'
+        'no_colors = true\n',
+    )
+    args = ['--config', str(config)]
+    expected = filter_output(['filter', *args], LINE1 + LINE2)
+    assert expected[0] == 1
+    sock = tmp_path / 'd.sock'
+    actual = filter_output(['client', *args, '--socket', str(sock)], LINE1 + LINE2)
+    assert actual == expected
+
+
+@pytest.mark.parametrize('flag', [
+    '--baseline-path=x.txt', '--allow-unsynced', '--jobs=2',
+])
+def test_client__filter_flags(tmp_path: Path, flag: str):
+    # The daemon would ignore them, so they are rejected.
+    sock = tmp_path / 'd.sock'
+    with pytest.raises(SystemExit):
+        filter_output(['client', flag, '--socket', str(sock)], LINE1)
+
+
+def test_serve(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    blpath.write_text('views.py:0: error: Hello world  [assignment]\n')
+    args = ['--baseline-path', str(blpath), '--no-colors']
+    sock = tmp_path / 'd.sock'
+    start_daemon(args, sock)
+    client = ['client', '--socket', str(sock)]
+
+    expected = filter_output(['filter', *args], LINE1 + LINE2)
+    assert expected[0] == 1
+    assert filter_output(client, LINE1 + LINE2) == expected
+
+    # The daemon notices that the baseline has changed.
+    blpath.write_text(
+        'views.py:0: error: Hello world  [assignment]\n'
+        'settings.py:0: error: How are you?  [union-attr]\n',
+    )
+    expected = filter_output(['filter', *args], LINE1 + LINE2)
+    assert expected[0] == 0
+    assert filter_output(client, LINE1 + LINE2) == expected
+
+    # Only one daemon can listen on the socket.
+    code, output = filter_output(['serve', *args, '--socket', str(sock)], '')
+    assert code == 1
+    assert 'already running' in output
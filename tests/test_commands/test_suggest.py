@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import gzip
 import os
 import subprocess
 from argparse import ArgumentParser
@@ -77,6 +78,21 @@ def test_fixed_and_committed(repo_path: Path):
     assert stdout.strip() == ''
 
 
+def test_fixed_and_committed__compressed(repo_path: Path):
+    """git diff doesn't show lines of a compressed baseline, it should still work.
+    """
+    bline_path = repo_path / 'baseline.txt.gz'
+    bline_path.write_bytes(gzip.compress(f'{LINE1}\n{LINE2}'.encode()))
+    run_git('add', str(bline_path))
+    run_git('commit', '-m', 'init')
+    run_git('checkout', '-b', 'feature-branch')
+    bline_path.write_bytes(gzip.compress(LINE1.encode()))
+    run_git('commit', '-am', 'fix bline')
+    cmd = ['suggest', '--baseline-path', str(bline_path)]
+    stdout = run(cmd, exit_code=0)
+    assert stdout.strip() == ''
+
+
 def test_target_branch__cli_flag():
     parser = ArgumentParser()
     Config.init_parser(parser)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import lzma
+import os
 from io import StringIO
 from pathlib import Path
 
@@ -50,3 +52,166 @@ def test_sync_sorted(tmp_path: Path):
     assert line1 == 'python/utils.py:0: error: Second argument of Enum() must be string  [misc]'  # noqa: E501s
     assert line2 == 'settings.py:0: error: How are you?  [union-attr]'
     assert line3 == 'views.py:0: error: Hello world  [assignment]'
+
+
+def test_sync__jobs(tmp_path: Path):
+    lines = [
+        f'pkg/mod{i % 300}.py:{i}: error: Message {i % 7}  [misc]\n'
+        for i in range(6000)
+    ]
+    results = []
+    for jobs in ('1', '3'):
+        blpath = tmp_path / f'bline{jobs}.txt'
+        cmd = ['sync', '--baseline-path', str(blpath), '--jobs', jobs]
+        code = main(cmd, StringIO(''.join(lines)), StringIO())
+        assert code == 0
+        results.append(blpath.read_text())
+    assert results[0] == results[1]
+    assert results[0].splitlines()[1] == 'pkg/mod1.py:0: error: Message 1  [misc]'
+
+
+def test_sync__json(tmp_path: Path):
+    lines = [
+        '{"file": "views.py", "line": 69, "column": 1, "message": "Hello world", "hint": null, "code": "assignment", "severity": "error"}\n',  # noqa: E501
+        '{"file": "settings.py", "line": 42, "column": 1, "message": "How are you?", "hint": null, "code": "union-attr", "severity": "error"}\n',  # noqa: E501
+        'Found 2 errors in 2 files (checked 26 source files)\n',
+    ]
+    blpath = tmp_path / 'bline.txt'
+    stdout = StringIO()
+    cmd = ['sync', '--baseline-path', str(blpath)]
+    code = main(cmd, StringIO(''.join(lines)), stdout)
+    assert code == 0
+    assert blpath.read_text() == (
+        'views.py:0: error: Hello world  [assignment]\n'
+        'settings.py:0: error: How are you?  [union-attr]\n'
+    )
+    assert stdout.getvalue() == lines[-1]
+
+    # the same baseline is produced from the text output
+    code = main(cmd, StringIO(f'{LINE1}{LINE2}'), StringIO())
+    assert code == 0
+    assert blpath.read_text().splitlines() == [
+        'views.py:0: error: Hello world  [assignment]',
+        'settings.py:0: error: How are you?  [union-attr]',
+    ]
+
+
+def test_sync__stable(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    cmd = ['sync', '--baseline-path', str(blpath)]
+    code = main(cmd, StringIO(f'{LINE1}{LINE2}{LINE3}'), StringIO())
+    assert code == 0
+    old_lines = blpath.read_text().splitlines()
+
+    # mypy reports files in a different order and there is a new error
+    new_line = 'settings.py:13: error: Oh hi Mark  [misc]\n'
+    code = main(cmd, StringIO(f'{LINE3}{new_line}{LINE2}{LINE1}'), StringIO())
+    assert code == 0
+    assert blpath.read_text().splitlines() == [
+        old_lines[0],
+        old_lines[1],
+        'settings.py:0: error: Oh hi Mark  [misc]',
+        old_lines[2],
+    ]
+
+
+def test_sync__unchanged(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    cmd = ['sync', '--baseline-path', str(blpath)]
+    code = main(cmd, StringIO(f'{LINE1}{LINE2}'), StringIO())
+    assert code == 0
+    os.utime(blpath, ns=(0, 0))
+    stdout = StringIO()
+    code = main(cmd, StringIO(f'{LINE2}{LINE1}'), stdout)
+    assert code == 0
+    assert blpath.stat().st_mtime_ns == 0
+    assert stdout.getvalue() == 'the baseline is unchanged\n'
+
+    # the message is shown only if the baseline is unchanged
+    stdout = StringIO()
+    code = main(cmd, StringIO(LINE1), stdout)
+    assert code == 0
+    assert stdout.getvalue() == ''
+
+
+def test_sync__compressed(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt.xz'
+    cmd = ['sync', '--baseline-path', str(blpath)]
+    code = main(cmd, StringIO(f'{LINE1}{LINE2}'), StringIO())
+    assert code == 0
+    assert lzma.decompress(blpath.read_bytes()).decode().splitlines() == [
+        'views.py:0: error: Hello world  [assignment]',
+        'settings.py:0: error: How are you?  [union-attr]',
+    ]
+    cmd = ['filter', '--baseline-path', str(blpath)]
+    code = main(cmd, StringIO(f'{LINE1}{LINE2}'), StringIO())
+    assert code == 0
+
+
+def test_sync__shards(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    cmd = ['sync', '--baseline-path', str(blpath), '--shard-depth', '1']
+    code = main(cmd, StringIO(f'{LINE1}{LINE2}{LINE3}'), StringIO())
+    assert code == 0
+    assert not blpath.exists()
+    root_path = tmp_path / 'bline' / '__root__.txt'
+    python_path = tmp_path / 'bline' / 'python.txt'
+    assert root_path.read_text().splitlines() == [
+        'views.py:0: error: Hello world  [assignment]',
+        'settings.py:0: error: How are you?  [union-attr]',
+    ]
+    assert python_path.read_text().splitlines() == [
+        'python/utils.py:0: error: Second argument of Enum() must be string  [misc]',
+    ]
+
+    # only changed shards are written, and shards without errors are removed
+    os.utime(root_path, ns=(0, 0))
+    code = main(cmd, StringIO(f'{LINE2}{LINE1}'), StringIO())
+    assert code == 0
+    assert root_path.stat().st_mtime_ns == 0
+    assert not python_path.exists()
+
+    stdout = StringIO()
+    code = main(cmd, StringIO(f'{LINE2}{LINE1}'), stdout)
+    assert code == 0
+    assert stdout.getvalue() == 'the baseline is unchanged\n'
+
+
+def test_sync__paths(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    cmd = ['sync', '--baseline-path', str(blpath)]
+    code = main(cmd, StringIO(f'{LINE1}{LINE2}{LINE3}'), StringIO())
+    assert code == 0
+    old_lines = blpath.read_text().splitlines()
+
+    # Only settings.py is checked and its error is fixed.
+    # Errors for other files are preserved.
+    code = main([*cmd, '--paths', 'settings.py'], StringIO(''), StringIO())
+    assert code == 0
+    assert blpath.read_text().splitlines() == [old_lines[0], old_lines[2]]
+
+    # The file with errors in the output is detected as checked.
+    new_line = 'python/utils.py:13: error: Oh hi Mark  [misc]\n'
+    code = main([*cmd, '--paths'], StringIO(new_line), StringIO())
+    assert code == 0
+    assert blpath.read_text().splitlines() == [
+        old_lines[0],
+        'python/utils.py:0: error: Oh hi Mark  [misc]',
+    ]
+
+
+def test_sync__paths_shards(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    cmd = ['sync', '--baseline-path', str(blpath), '--shard-depth', '1']
+    code = main(cmd, StringIO(f'{LINE1}{LINE2}{LINE3}'), StringIO())
+    assert code == 0
+    root_path = tmp_path / 'bline' / '__root__.txt'
+    python_path = tmp_path / 'bline' / 'python.txt'
+    old_root = root_path.read_text()
+
+    os.utime(root_path, ns=(0, 0))
+    code = main([*cmd, '--paths', 'python/'], StringIO(''), StringIO())
+    assert code == 0
+    assert not python_path.exists()
+    assert root_path.read_text() == old_root
+    assert root_path.stat().st_mtime_ns == 0
@@ -20,3 +20,34 @@ def test_top_notebook(tmp_path: Path):
     cmd = ['top-files', '--baseline-path', str(blpath), '--no-color']
     actual = run(cmd)
     assert 'fail.ipynb' in actual
+
+
+def test_top_files__baseline_index(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    blpath.write_text(f'{LINE1}{LINE2}{LINE2}')
+    cmd = ['top-files', '--baseline-path', str(blpath), '--no-color', '--baseline-index']
+    for _ in range(2):
+        actual = run(cmd)
+        assert actual.splitlines()[0].split() == ['settings.py', '2', '66.7%']
+    assert (tmp_path / '.bline.idx').exists()
+
+
+def test_top_files__jobs(tmp_path: Path):
+    blpath = tmp_path / 'bline.txt'
+    lines = [f'pkg/mod{i % 300}.py:0: error: Message {i}  [misc]\n' for i in range(6000)]
+    blpath.write_text(''.join(lines))
+    cmd = ['top-files', '--baseline-path', str(blpath), '--no-color']
+    assert run([*cmd, '--jobs', '3']) == run(cmd)
+
+
+def test_top_files__shards(tmp_path: Path):
+    shards_path = tmp_path / 'bline'
+    (shards_path / 'python').mkdir(parents=True)
+    (shards_path / '__root__.txt').write_text(f'{LINE1}{LINE2}')
+    (shards_path / 'python' / 'api.txt').write_text(f'{NOTEBOOK_LINE1}')
+    blpath = tmp_path / 'bline.txt'
+    cmd = ['top-files', '--baseline-path', str(blpath), '--shard-depth', '2']
+    actual = run([*cmd, '--no-color'])
+    assert 'views.py' in actual
+    assert 'settings.py' in actual
+    assert 'fail.ipynb' in actual
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import gzip
+import lzma
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from mypy_baseline._compression import decompress, get_compression, read_lines
+from mypy_baseline._files import write_if_changed
+from mypy_baseline._git import get_commits
+
+
+@pytest.mark.parametrize('path, expected', [
+    ('mypy-baseline.txt', ''),
+    ('mypy-baseline.txt.gz', '.gz'),
+    ('mypy-baseline.txt.xz', '.xz'),
+    ('mypy-baseline.zst', '.zst'),
+    ('mypy-baseline', ''),
+])
+def test_get_compression(path: str, expected: str):
+    assert get_compression(Path(path)) == expected
+
+
+@pytest.mark.parametrize('name, decompress_func', [
+    ('bline.txt.gz', gzip.decompress),
+    ('bline.txt.xz', lzma.decompress),
+])
+def test_write_read(tmp_path: Path, name: str, decompress_func):
+    path = tmp_path / name
+    assert write_if_changed(path, 'hello\nworld\n')
+    raw = path.read_bytes()
+    assert decompress_func(raw) == b'hello\nworld\n'
+    assert read_lines(path) == ['hello', 'world']
+    assert decompress(raw, path) == b'hello\nworld\n'
+
+    # the uncompressed content is compared
+    os.utime(path, ns=(0, 0))
+    assert not write_if_changed(path, 'hello\nworld\n')
+    assert path.stat().st_mtime_ns == 0
+    assert write_if_changed(path, 'hello\n')
+    assert read_lines(path) == ['hello']
+
+
+def test_write__deterministic(tmp_path: Path):
+    path1 = tmp_path / 'bline1.txt.gz'
+    path2 = tmp_path / 'bline2.txt.gz'
+    write_if_changed(path1, 'hello\n')
+    write_if_changed(path2, 'hello\n')
+    assert path1.read_bytes() == path2.read_bytes()
+
+
+def test_write__corrupted(tmp_path: Path):
+    path = tmp_path / 'bline.txt.gz'
+    path.write_bytes(b'not gzip')
+    assert write_if_changed(path, 'hello\n')
+    assert read_lines(path) == ['hello']
+
+
+def test_get_commits(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.chdir(tmp_path)
+    for name in ('AUTHOR', 'COMMITTER'):
+        monkeypatch.setenv(f'GIT_{name}_NAME', 'test')
+        monkeypatch.setenv(f'GIT_{name}_EMAIL', 'test@example.com')
+    subprocess.run(['git', 'init', '-q'], check=True)
+    path = Path('bline.txt.gz')
+    for content in ('a\nb\n', 'a\nb\nc\nd\n', 'c\nd\ne\n'):
+        write_if_changed(path, content)
+        subprocess.run(['git', 'add', str(path)], check=True)
+        subprocess.run(['git', 'commit', '-q', '-m', 'upd'], check=True)
+    commits = list(get_commits(path))
+    stats = [(c.lines_count, c.insertions, c.deletions) for c in commits]
+    assert stats == [(2, 2, 0), (4, 2, 0), (3, 1, 2)]
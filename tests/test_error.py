@@ -1,5 +1,9 @@
+import pytest
+
 from mypy_baseline._config import Config
-from mypy_baseline._error import Error
+from mypy_baseline._error import (
+    Error, _parse_fast, _parse_regex, parse, parse_line, truncate_path,
+)
 
 
 LINE1 = 'my_project/api/views.py:69: \x1b[1m\x1b[31merror:\x1b[m\x0f Incompatible types in assignment (expression has type \x1b[m\x0f\x1b[1m"List[Type[RawRenderer]]"\x1b[m\x0f, base class \x1b[m\x0f\x1b[1m"BaseAPI"\x1b[m\x0f defined the type as \x1b[m\x0f\x1b[1m"Tuple[Any, Type[RawRenderer]]"\x1b[m\x0f)  \x1b[m\x0f\x1b[33m[assignment]\x1b[m\x0f\r\n'  # noqa
@@ -61,3 +65,102 @@ def test_line4_parse():
     assert e.message == 'This violates the Liskov substitution principle'
     assert e.category == 'note'
     assert e.get_clean_line(Config()) == LINE4EXP
+
+
+@pytest.mark.parametrize('line', [
+    'my_project/api/views.py:69: error: Incompatible types  [assignment]\n',
+    'my_project/api/views.py:69:13: error: Incompatible types  [assignment]\n',
+    'my_project/api/views.pyi:1: note: Revealed type is "builtins.list[builtins.int]"\n',
+    'views.py:1: note:     def f(self) -> int\n',
+    'views.py:1: error: Name "x" is not defined  [name-defined]  \r\n',
+])
+def test_parse__fast_path(line: str):
+    fields = _parse_fast(line)
+    assert fields is not None
+    assert fields == _parse_regex(line)
+
+
+@pytest.mark.parametrize('line', [
+    'views.py:1: error: see other.py:2: error: oh hi mark',
+    'views.py:1:\terror: Name "x" is not defined  [name-defined]',
+    'views.py:1: error: Name "x" is not defined \t[name-defined]',
+    'views.py:1: note: Revealed type is list[int]',
+    'fail.ipynb:cell_1:2: error: Unsupported operand types  [operator]',
+])
+def test_parse__fallback(line: str):
+    assert _parse_fast(line) is None
+    assert parse(line) == _parse_regex(line)
+
+
+@pytest.mark.parametrize('line', [
+    'Success: no issues found in 26 source files',
+    'Found 3 errors in 2 files (checked 26 source files)',
+    'views.py: error: oh hi mark',
+    '',
+])
+def test_parse__not_error(line: str):
+    assert parse(line) is None
+
+
+@pytest.mark.parametrize('path, depth, expected', [
+    ('a/b/c.py', 40, 'a/b/c.py'),
+    ('a/b/c.py', 3, 'a/b/c.py'),
+    ('a/b/c.py', 2, 'a/b'),
+    ('a/b/c.py', 1, 'a'),
+    ('a/b/c.py', 0, '.'),
+    ('./a/b/c.py', 2, 'a/b'),
+    ('a//b/c.py', 2, 'a/b'),
+    ('/a/b/c.py', 2, '/a'),
+])
+def test_truncate_path(path: str, depth: int, expected: str):
+    assert truncate_path(path, depth) == expected
+
+
+def test_error_is_compact():
+    e1 = Error.new(LINE1)
+    e2 = Error.new(LINE1)
+    assert e1 is not None
+    assert e2 is not None
+    assert not hasattr(e1, '__dict__')
+    assert e1 == e2
+    assert e1.raw_path is e2.raw_path
+    assert e1.category is e2.category
+    assert e1.severity is e2.severity
+    assert 'assignment' in repr(e1)
+
+
+JSON_LINE = '{"file": "my_project/api/views.py", "line": 69, "column": 4, "message": "Incompatible types  [in assignment]", "hint": "See docs\\n  for details", "code": "assignment", "severity": "error"}'  # noqa: E501
+
+
+def test_from_json():
+    e, note1, note2 = Error.from_json(JSON_LINE)
+    assert e.raw_path == 'my_project/api/views.py'
+    assert e.line_number == 69
+    assert e.severity == 'error'
+    assert e.message == 'Incompatible types  [in assignment]'
+    assert e.category == 'assignment'
+    exp = 'my_project/api/views.py:0: error: Incompatible types  [in assignment]  [assignment]'  # noqa: E501
+    assert e.get_clean_line(Config()) == exp
+    prefix = 'my_project/api/views.py:0: note: '
+    assert note1.get_clean_line(Config()) == f'{prefix}See docs'
+    assert note2.get_clean_line(Config()) == f'{prefix}for details'
+
+
+@pytest.mark.parametrize('line', [
+    '{',
+    '[]',
+    '{"file": "views.py"}',
+    '{"file": "views.py", "line": "1", "message": "hi", "severity": "error"}',
+])
+def test_from_json__invalid(line: str):
+    assert Error.from_json(line) == []
+
+
+def test_parse_line__input_format():
+    text_line = LINE2
+    assert len(parse_line(Config(), JSON_LINE)) == 3
+    assert len(parse_line(Config(), text_line)) == 1
+    assert len(parse_line(Config(input_format='json'), JSON_LINE)) == 3
+    assert parse_line(Config(input_format='json'), text_line) == []
+    assert parse_line(Config(input_format='text'), JSON_LINE) == []
+    assert len(parse_line(Config(input_format='text'), text_line)) == 1
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from mypy_baseline._export import iter_export
+
+
+ROWS: list[dict[str, object]] = [
+    dict(path=Path('a', 'b.txt'), created_at=datetime(2022, 9, 1, tzinfo=timezone.utc)),
+    dict(path=Path('c, d.txt'), created_at=datetime(2022, 9, 2, tzinfo=timezone.utc)),
+]
+
+
+def test_iter_export__ndjson():
+    lines = list(iter_export(ROWS, 'ndjson'))
+    assert [json.loads(line) for line in lines] == [
+        dict(path='a/b.txt', created_at='2022-09-01T00:00:00+00:00'),
+        dict(path='c, d.txt', created_at='2022-09-02T00:00:00+00:00'),
+    ]
+
+
+@pytest.mark.parametrize('rows', [ROWS, ROWS[:1], []])
+def test_iter_export__json(rows: list[dict[str, object]]):
+    lines = list(iter_export(rows, 'json'))
+    assert len(lines) == len(rows) + 1
+    expected = [json.loads(line) for line in iter_export(rows, 'ndjson')]
+    assert json.loads('\n'.join(lines)) == expected
+
+
+def test_iter_export__csv():
+    assert list(iter_export(ROWS, 'csv')) == [
+        'path,created_at',
+        'a/b.txt,2022-09-01T00:00:00+00:00',
+        '"c, d.txt",2022-09-02T00:00:00+00:00',
+    ]
+    assert list(iter_export([], 'csv')) == []
+
+
+def test_iter_export__unknown():
+    with pytest.raises(ValueError):
+        list(iter_export(ROWS, 'xml'))
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from mypy_baseline._files import write_if_changed
+
+
+def test_write_if_changed(tmp_path: Path):
+    path = tmp_path / 'bline.txt'
+    assert write_if_changed(path, 'hello\n')
+    assert path.read_text() == 'hello\n'
+    os.utime(path, ns=(0, 0))
+
+    assert not write_if_changed(path, 'hello\n')
+    assert path.stat().st_mtime_ns == 0
+
+    # same size, different content
+    assert write_if_changed(path, 'howdy\n')
+    assert path.read_text() == 'howdy\n'
+    assert path.stat().st_mtime_ns != 0
+    assert os.listdir(tmp_path) == ['bline.txt']
+
+
+def test_write_if_changed__keeps_mode(tmp_path: Path):
+    path = tmp_path / 'bline.txt'
+    path.write_text('hello\n')
+    path.chmod(0o640)
+    assert write_if_changed(path, 'world\n')
+    assert path.stat().st_mode & 0o777 == 0o640
+
+
+def test_write_if_changed__failed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    path = tmp_path / 'bline.txt'
+    path.write_text('hello\n')
+
+    def fail(src, dst):
+        raise OSError('oh no')
+    monkeypatch.setattr(os, 'replace', fail)
+    with pytest.raises(OSError):
+        write_if_changed(path, 'world\n')
+    assert path.read_text() == 'hello\n'
+    assert os.listdir(tmp_path) == ['bline.txt']
+
+
+@pytest.mark.parametrize('name', ['bline.txt', 'bline.txt.gz'])
+def test_write_if_changed__fsync(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, name: str,
+):
+    path = tmp_path / name
+    calls = []
+    fsync = os.fsync
+    replace = os.replace
+
+    def record_fsync(fd):
+        calls.append(('fsync', os.fstat(fd).st_size > 0))
+        fsync(fd)
+
+    def record_replace(src, dst):
+        calls.append(('replace', True))
+        replace(src, dst)
+
+    monkeypatch.setattr(os, 'fsync', record_fsync)
+    monkeypatch.setattr(os, 'replace', record_replace)
+    assert write_if_changed(path, 'hello\n')
+    # the written file is synced before it replaces the old one,
+    # and then the directory is synced.
+    assert calls[:2] == [('fsync', True), ('replace', True)]
+    assert calls[2][0] == 'fsync'
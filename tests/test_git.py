@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from mypy_baseline._git import (
+    ObjectReader, _count_lines, _iter_lines, get_commits,
+)
+
+
+@pytest.mark.parametrize('chunks, expected', [
+    ([], []),
+    ([b''], []),
+    ([b'a\nb\n'], [b'a', b'b']),
+    ([b'a\nb'], [b'a', b'b']),
+    ([b'a', b'\n', b'b', b'c\n'], [b'a', b'bc']),
+    ([b'a\n\nb\n'], [b'a', b'', b'b']),
+])
+def test_iter_lines(chunks: list[bytes], expected: list[bytes]):
+    assert list(_iter_lines(chunks)) == expected
+    assert _count_lines(chunks) == len([line for line in expected if line])
+
+
+@pytest.mark.parametrize('chunks, expected', [
+    ([b'\n'], 0),
+    ([b'\n\n'], 0),
+    ([b'  \n'], 0),
+    ([b'a\n', b'\n'], 1),
+    ([b'a\n\n\nb'], 2),
+])
+def test_count_lines__empty(chunks: list[bytes], expected: int):
+    assert _count_lines(chunks) == expected
+
+
+def commit(*paths: Path) -> None:
+    subprocess.run(['git', 'add', *map(str, paths)], check=True)
+    subprocess.run(['git', 'commit', '-q', '-m', 'upd'], check=True)
+
+
+def test_object_reader(repo: Path):
+    (repo / 'bline' / 'pkg').mkdir(parents=True)
+    (repo / 'bline' / 'a.txt').write_text('a\nb\n')
+    (repo / 'bline' / 'pkg' / 'sub.txt').write_text('c\n')
+    commit(repo / 'bline')
+    objects = ObjectReader()
+    files = dict(objects.iter_files('HEAD', 'bline'))
+    assert list(files) == ['bline/a.txt', 'bline/pkg/sub.txt']
+    assert b''.join(objects.iter_blob(files['bline/a.txt'])) == b'a\nb\n'
+    assert dict(objects.iter_files('HEAD', 'bline/a.txt')) == {
+        'bline/a.txt': files['bline/a.txt'],
+    }
+    assert list(objects.iter_files('HEAD', 'missing')) == []
+    assert b''.join(objects.iter_blob('HEAD:bline/a.txt')) == b'a\nb\n'
+    with pytest.raises(FileNotFoundError):
+        list(objects.iter_blob('HEAD:missing'))
+    # not a blob
+    with pytest.raises(FileNotFoundError):
+        list(objects.iter_blob('HEAD:bline'))
+    # the content that hasn't been read doesn't break the next request
+    next(objects.iter_blob('HEAD:bline/a.txt'))
+    assert b''.join(objects.iter_blob('HEAD:bline/pkg/sub.txt')) == b'c\n'
+    objects.close()
+
+
+def test_get_commits__dir(repo: Path):
+    (repo / 'bline').mkdir()
+    (repo / 'bline' / 'a.txt').write_text('a\nb\n')
+    commit(repo / 'bline')
+    (repo / 'bline' / 'b.txt').write_text('c\n')
+    commit(repo / 'bline')
+    commits = list(get_commits(Path('bline')))
+    assert [c.lines_count for c in commits] == [2, 3]
+    assert [c.insertions for c in commits] == [2, 1]
+    assert set(commits[0].as_dict()) == {
+        'path', 'hash', 'author_email', 'created_at',
+        'insertions', 'deletions', 'lines_count',
+    }
+
+
+def test_get_commits__git_args(repo: Path):
+    path = repo / 'bline.txt'
+    for lines in ('a\n', 'a\nb\n', 'b\n'):
+        path.write_text(lines)
+        commit(path)
+    commits = list(get_commits(Path('bline.txt'), git_args=['--max-count=2']))
+    assert [(c.insertions, c.deletions) for c in commits] == [(1, 0), (0, 1)]
+    assert list(get_commits(Path('bline.txt'), git_args=['HEAD~1..HEAD~1'])) == []
+    # stopping early doesn't wait for git to walk the whole history
+    commits_iter = get_commits(Path('bline.txt'))
+    assert next(commits_iter).insertions == 1
+    commits_iter.close()  # type: ignore[attr-defined]
+    with pytest.raises(subprocess.CalledProcessError):
+        list(get_commits(Path('bline.txt'), git_args=['missing..HEAD']))
+
+
+def test_lines_count(repo: Path):
+    path = repo / 'bline.txt'
+    path.write_text('a\nb\n')
+    commit(path)
+    # that's what sync writes when all errors are fixed
+    path.write_text('\n')
+    commit(path)
+    path.unlink()
+    commit(path)
+    commits = list(get_commits(Path('bline.txt')))
+    assert commits[0].lines_count == 2
+    assert commits[1].lines_count == 0
+    with pytest.raises(FileNotFoundError):
+        commits[2].lines_count
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from mypy_baseline._history_cache import HistoryCache, get_history
+
+from .test_git import commit
+
+
+def count_calls(monkeypatch: pytest.MonkeyPatch) -> list[object]:
+    import mypy_baseline._history_cache as module
+    calls: list[object] = []
+    original = module.get_commits
+
+    def get_commits(path, since=None, **kwargs):
+        calls.append(since and since.hash)
+        return original(path, since=since, **kwargs)
+
+    monkeypatch.setattr(module, 'get_commits', get_commits)
+    return calls
+
+
+def test_for_baseline(repo: Path, tmp_path: Path):
+    cache = HistoryCache.for_baseline(Path('bline.txt'), None)
+    assert cache is not None
+    assert cache.path.parent == Path('.git', 'mypy-baseline')
+    other = HistoryCache.for_baseline(Path('other.txt'), tmp_path / 'cache')
+    assert other is not None
+    assert other.path.parent == tmp_path / 'cache'
+    assert other.path.name != cache.path.name
+
+
+def test_get_history__incremental(
+    repo: Path, monkeypatch: pytest.MonkeyPatch,
+):
+    path = Path('bline.txt')
+    cache = HistoryCache(repo / 'cache.json')
+    path.write_text('a\nb\n')
+    commit(path)
+    path.write_text('a\nb\nc\n')
+    commit(path)
+    expected = [c.as_dict() for c in get_history(path)]
+    assert [c['lines_count'] for c in expected] == [2, 3]
+
+    calls = count_calls(monkeypatch)
+    assert [c.as_dict() for c in get_history(path, cache)] == expected
+    assert cache.path.exists()
+    assert [c.as_dict() for c in get_history(path, cache)] == expected
+    path.write_text('a\n')
+    commit(path)
+    commits = list(get_history(path, cache))
+    assert [c.lines_count for c in commits] == [2, 3, 1]
+    assert [c.deletions for c in commits] == [0, 0, 2]
+    assert calls == [None, expected[-1]['hash'], expected[-1]['hash']]
+    assert [c.as_dict() for c in get_history(path, cache)] == [
+        c.as_dict() for c in get_history(path)
+    ]
+
+
+def test_get_history__rewritten(repo: Path):
+    path = Path('bline.txt')
+    cache = HistoryCache(repo / 'cache.json')
+    path.write_text('a\nb\n')
+    commit(path)
+    path.write_text('a\nb\nc\n')
+    commit(path)
+    assert len(list(get_history(path, cache))) == 2
+
+    subprocess.run(['git', 'reset', '-q', '--hard', 'HEAD~1'], check=True)
+    path.write_text('a\n')
+    commit(path)
+    commits = list(get_history(path, cache))
+    assert [c.lines_count for c in commits] == [2, 1]
+
+
+def test_get_history__broken_cache(repo: Path):
+    path = Path('bline.txt')
+    cache = HistoryCache(repo / 'cache.json')
+    path.write_text('a\n')
+    commit(path)
+    cache.path.write_text('{"version": 0}')
+    assert [c.lines_count for c in get_history(path, cache)] == [1]
+    cache.path.write_text('not json')
+    assert [c.lines_count for c in get_history(path, cache)] == [1]
@@ -0,0 +1,46 @@
+import pytest
+
+from mypy_baseline._config import Config
+from mypy_baseline._ignore import IgnoreMatcher
+
+
+PATTERNS = [
+    'Function is missing a type annotation',
+    '.*Enum.*',
+    r'Name "(\w+)" already defined on line \d+',
+    '(?i)cannot find implementation.*',
+    'Revealed type is .*',
+    'Revealed type is "int"',
+]
+
+
+@pytest.mark.parametrize('msg, expected', [
+    ('Function is missing a type annotation', PATTERNS[0]),
+    ('Second argument of Enum() must be string', PATTERNS[1]),
+    ('Name "x" already defined on line 10', PATTERNS[2]),
+    ('Cannot find implementation or library stub', PATTERNS[3]),
+    ('Revealed type is "int"', PATTERNS[5]),
+    ('Revealed type is "str"', PATTERNS[4]),
+    ('Function is missing a type annotation for one or more arguments', None),
+    ('Name "x" already defined (possibly by an import)', None),
+    ('', None),
+])
+def test_ignore_matcher(msg: str, expected: str):
+    matcher = IgnoreMatcher(PATTERNS)
+    assert matcher.match(msg) == expected
+    # the second call hits the cache
+    assert matcher.match(msg) == expected
+    config = Config(ignore=PATTERNS)
+    assert config.matching_ignore(msg) == expected
+    assert config.is_ignored(msg) is (expected is not None)
+
+
+def test_ignore_matcher__invalid():
+    with pytest.raises(ValueError, match=r'Invalid pattern: oh\('):
+        IgnoreMatcher(['.*', 'oh('])
+
+
+def test_is_ignored_category():
+    config = Config(ignore_categories=['note', 'misc'])
+    assert config.is_ignored_category('note')
+    assert not config.is_ignored_category('assignment')
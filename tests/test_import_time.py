@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import mypy_baseline
+from mypy_baseline.commands import registry
+
+
+ROOT = Path(mypy_baseline.__file__).parent.parent
+# The budget is generous so that the test isn't flaky on slow machines.
+# Locally, importing takes about 25ms.
+BUDGET_US = 150_000
+RUN_MAIN = 'import sys; from mypy_baseline import main; main(sys.argv[1:], sys.stdin, sys.stdout)'  # noqa: E501
+
+
+def run_python(cwd: Path, *args: str) -> str:
+    """Run python in a new process and get its stderr.
+    """
+    result = subprocess.run(
+        [sys.executable, *args],
+        cwd=cwd,
+        env={'PYTHONPATH': str(ROOT)},
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=True,
+    )
+    return result.stderr.decode()
+
+
+def test_import_time_budget(tmp_path: Path):
+    code = 'from mypy_baseline import main'
+    stderr = run_python(tmp_path, '-X', 'importtime', '-c', code)
+    times = {}
+    for line in stderr.splitlines()[1:]:
+        _, cumulative, module = line.split('|')
+        times[module.strip()] = int(cumulative)
+    assert times['mypy_baseline'] < BUDGET_US
+
+
+@pytest.mark.parametrize('cmd_name', ['version', 'filter', 'sync'])
+def test_only_selected_command_is_imported(tmp_path: Path, cmd_name: str):
+    code = f'{RUN_MAIN}; print(*sys.modules, file=sys.stderr)'
+    imported = set(run_python(tmp_path, '-c', code, cmd_name).split())
+    for name, info in registry.items():
+        module = f'mypy_baseline.commands.{info.module}'
+        assert (module in imported) is (name == cmd_name)
+    # There is no config file, so there is nothing to parse.
+    assert 'tomllib' not in imported
+    assert 'tomli' not in imported
+    # The process pool isn't used without --jobs.
+    assert 'concurrent.futures' not in imported
+
+
+def test_registry_matches_commands():
+    for info in registry.values():
+        cmd_class = info.load()
+        assert cmd_class.__name__ == info.cls
+        assert cmd_class.__doc__ is not None
+        assert cmd_class.__doc__.strip().splitlines()[0] == info.help
@@ -0,0 +1,10 @@
+from mypy_baseline._parallel import map_lines
+
+
+def test_map_lines():
+    lines = [f'line {i}' for i in range(5_000)]
+    expected = [(line, line.upper()) for line in lines]
+    assert list(map_lines(str.upper, lines)) == expected
+    assert list(map_lines(str.upper, lines, jobs=2)) == expected
+    assert list(map_lines(str.upper, lines, jobs=0)) == expected
+    assert list(map_lines(str.upper, lines[:10], jobs=2)) == expected[:10]
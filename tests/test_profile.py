@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+import time
+from argparse import ArgumentParser
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from mypy_baseline import main
+from mypy_baseline._profile import Profiler, add_profile_arguments
+
+
+def test_profiler__nested_phases():
+    profiler = Profiler(enabled=True)
+    with profiler.phase('outer'):
+        with profiler.phase('inner'):
+            time.sleep(.02)
+        for _ in profiler.iterate('items', range(3)):
+            pass
+    outer = profiler.phases['outer']
+    inner = profiler.phases['inner']
+    assert outer.calls == 1
+    assert inner.calls == 1
+    assert profiler.phases['items'].calls == 3
+    assert inner.time >= .02
+    assert outer.time < inner.time
+    assert outer.memory is None
+
+
+def test_profiler__disabled():
+    profiler = Profiler()
+    items = [1, 2, 3]
+    assert profiler.iterate('items', items) is items
+    with profiler.phase('outer'):
+        pass
+    assert profiler.phases == {}
+
+
+@pytest.mark.parametrize('argv, env, enabled, output', [
+    ([], {}, False, None),
+    (['--profile'], {}, True, None),
+    (['--profile-output', 'p.json'], {}, True, Path('p.json')),
+    ([], {'MYPY_BASELINE_PROFILE': '0'}, False, None),
+    ([], {'MYPY_BASELINE_PROFILE': '1'}, True, None),
+    ([], {'MYPY_BASELINE_PROFILE': 'p.json'}, True, Path('p.json')),
+])
+def test_profiler__from_args(argv, env, enabled, output):
+    parser = ArgumentParser()
+    add_profile_arguments(parser)
+    profiler = Profiler.from_args(parser.parse_args(argv), env)
+    assert profiler.enabled is enabled
+    assert profiler.output == output
+
+
+def test_profile_filter(tmp_path: Path):
+    report_path = tmp_path / 'profile.json'
+    cprofile_path = tmp_path / 'cprofile.prof'
+    stdin = StringIO('views.py:69: error: Hello world  [assignment]\n')
+    cmd = [
+        '--profile-memory',
+        '--profile-output', str(report_path),
+        '--cprofile', str(cprofile_path),
+        'filter',
+        '--baseline-path', str(tmp_path / 'baseline.txt'),
+    ]
+    code = main(cmd, stdin, StringIO())
+    assert code == 1
+    report = json.loads(report_path.read_text())
+    phases = {phase['name']: phase for phase in report['phases']}
+    assert {'filter', 'config', 'baseline', 'parse', 'match'} <= set(phases)
+    assert phases['parse']['calls'] == 1
+    assert phases['filter']['memory'] > 0
+    assert cprofile_path.exists()
+
+
+@pytest.mark.parametrize('before, after', [
+    (['--profile-output', 'P'], []),
+    ([], ['--profile-output', 'P']),
+    (['--profile-memory'], ['--profile-output', 'P']),
+])
+def test_profile__flags_position(tmp_path: Path, before, after):
+    report_path = tmp_path / 'profile.json'
+    before = [str(report_path) if arg == 'P' else arg for arg in before]
+    after = [str(report_path) if arg == 'P' else arg for arg in after]
+    stdin = StringIO('views.py:69: error: Hello world  [assignment]\n')
+    cmd = [
+        *before,
+        'filter',
+        '--baseline-path', str(tmp_path / 'baseline.txt'),
+        *after,
+    ]
+    code = main(cmd, stdin, StringIO())
+    assert code == 1
+    report = json.loads(report_path.read_text())
+    phases = {phase['name']: phase for phase in report['phases']}
+    assert 'filter' in phases
+    if '--profile-memory' in before:
+        assert phases['filter']['memory'] > 0
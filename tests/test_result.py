@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from mypy_baseline._result import ErrorStats, Result
+
+
+def test_write_read(tmp_path: Path):
+    result = Result(scope=['pkg'])
+    result.add('a', 'pkg/a.py', 'misc', 'pkg/a.py')
+    result.add('a', 'pkg/a.py', 'misc', 'pkg/a.py')
+    result.add('b', 'pkg/b.py', 'note', 'pkg/b.py')
+    result.new_lines.append('pkg/b.py:1: note: b\n')
+    path = tmp_path / 'result.json'
+    result.write(path)
+    assert Result.read(path) == result
+    assert result.get_baseline() == (
+        ['a', 'a', 'b'],
+        {'a': 'pkg/a.py', 'b': 'pkg/b.py'},
+    )
+
+
+def test_read__unsupported(tmp_path: Path):
+    path = tmp_path / 'result.json'
+    path.write_text('{"version": 0}')
+    with pytest.raises(ValueError, match='unsupported result file'):
+        Result.read(path)
+
+
+def test_merge():
+    result1 = Result(scope=['a', 'c'], new_lines=['x\n'])
+    result1.add('a', 'a.py', 'misc', 'a.py')
+    result1.add('c', 'c.py', 'misc', 'c.py')
+    result2 = Result(scope=['b', 'c'], new_lines=['x\n', 'y\n', 'y\n'])
+    result2.add('b', 'b.py', 'misc', 'b.py')
+    # The same file checked twice, errors aren't counted twice.
+    result2.add('c', 'c.py', 'misc', 'c.py')
+    result2.add('c', 'c.py', 'misc', 'c.py')
+    merged = Result.merge([result1, result2])
+    assert merged.scope == ['a', 'c', 'b']
+    # Repeated new errors are kept.
+    assert merged.new_lines == ['x\n', 'y\n', 'y\n']
+    assert merged.errors == {
+        'a': ErrorStats('a.py', 'misc', {'a.py': 1}),
+        'c': ErrorStats('c.py', 'misc', {'c.py': 2}),
+        'b': ErrorStats('b.py', 'misc', {'b.py': 1}),
+    }
+    assert merged.errors['c'].occurrences == 2
+    # The original results aren't changed.
+    assert result1.errors['c'].occurrences == 1
+
+
+def test_merge__truncated_paths():
+    """Different files with the same baseline line in different parts are summed up.
+    """
+    line = 'pkg:0: error: Oh no  [misc]'
+    result1 = Result(scope=['pkg/a.py'])
+    result1.add(line, 'pkg', 'misc', 'pkg/a.py')
+    result2 = Result(scope=['pkg/b.py'])
+    result2.add(line, 'pkg', 'misc', 'pkg/b.py')
+    result2.add(line, 'pkg', 'misc', 'pkg/b.py')
+    result3 = Result(scope=['pkg/b.py'])
+    result3.add(line, 'pkg', 'misc', 'pkg/b.py')
+    merged = Result.merge([result1, result2, result3])
+    assert merged.errors[line].occurrences == 3
+    assert merged.get_baseline() == ([line] * 3, {line: 'pkg'})
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import pytest
+
+from mypy_baseline._scope import Scope, normalize_path
+
+
+@pytest.mark.parametrize('path, expected', [
+    ('pkg/module.py', 'pkg/module.py'),
+    ('./pkg//module.py', 'pkg/module.py'),
+    ('pkg\\module.py', 'pkg/module.py'),
+    ('pkg/', 'pkg'),
+    ('.', ''),
+])
+def test_normalize_path(path: str, expected: str):
+    assert normalize_path(path) == expected
+
+
+def test_scope_contains():
+    scope = Scope(['pkg/sub/', './module.py'])
+    assert 'pkg/sub/module.py' in scope
+    assert 'pkg/sub/deep/module.py' in scope
+    assert 'module.py' in scope
+    assert 'pkg/module.py' not in scope
+    assert 'pkg/subpackage/module.py' not in scope
+    assert 'other.py' not in scope
+    assert 'anything.py' in Scope(['.'])
+
+
+@pytest.mark.parametrize('paths, key, expected', [
+    (['pkg/sub/module.py'], 'pkg/sub', True),
+    (['pkg/sub/module.py'], 'pkg', True),
+    (['pkg/module.py'], 'pkg/sub', False),
+    (['pkg'], 'pkg/sub', True),
+    (['pkg/sub'], 'pkg/subpackage', False),
+    (['other/module.py'], 'pkg', False),
+    (['module.py'], '__root__', True),
+    (['pkg/module.py'], '__root__', False),
+    (['.'], 'pkg', True),
+])
+def test_scope_may_contain_shard(paths: list[str], key: str, expected: bool):
+    assert Scope(paths).may_contain_shard(key) is expected
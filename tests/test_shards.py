@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from mypy_baseline._config import Config
+from mypy_baseline._shards import Shards, get_shards_dir
+
+
+@pytest.mark.parametrize('path, depth, expected', [
+    ('pkg/sub/module.py', 1, 'pkg'),
+    ('pkg/sub/module.py', 2, 'pkg/sub'),
+    ('pkg/sub/module.py', 3, 'pkg/sub'),
+    ('pkg/module.py', 2, 'pkg'),
+    ('./pkg/module.py', 1, 'pkg'),
+    ('pkg\\sub\\module.py', 2, 'pkg/sub'),
+    ('/pkg/module.py', 1, 'pkg'),
+    ('../pkg/module.py', 1, '__parent__'),
+    ('module.py', 1, '__root__'),
+    ('notebooks/nb.ipynb', 1, 'notebooks'),
+])
+def test_get_key(path: str, depth: int, expected: str):
+    shards = Shards(root=Path('mypy-baseline'), depth=depth)
+    assert shards.get_key(path) == expected
+
+
+@pytest.mark.parametrize('path, expected', [
+    ('mypy-baseline.txt', 'mypy-baseline'),
+    ('ci/baseline.txt', 'ci/baseline'),
+    ('baseline', 'baseline.d'),
+    ('mypy-baseline.txt.gz', 'mypy-baseline'),
+])
+def test_get_shards_dir(path: str, expected: str):
+    assert get_shards_dir(Path(path)) == Path(expected)
+
+
+def test_shards_from_config():
+    assert Shards.from_config(Config()) is None
+    shards = Shards.from_config(Config(shard_depth=2))
+    assert shards == Shards(root=Path('mypy-baseline'), depth=2)
+
+
+def test_write_read(tmp_path: Path):
+    shards = Shards(root=tmp_path / 'bline', depth=2)
+    assert shards.keys() == []
+    assert shards.write('pkg/sub', ['a', 'b'])
+    assert shards.write('__root__', ['c'])
+    assert not shards.write('pkg/sub', ['a', 'b'])
+    assert shards.keys() == ['__root__', 'pkg/sub']
+    assert shards.read('pkg/sub') == ['a', 'b']
+    assert shards.read('pkg') == []
+    index = shards.read_index()
+    assert index.lines == ['c', 'a', 'b']
+
+    assert shards.write('pkg/sub', [])
+    assert not shards.write('pkg/sub', [])
+    assert shards.keys() == ['__root__']
+
+
+def test_write_read__compressed(tmp_path: Path):
+    config = Config(baseline_path=tmp_path / 'bline.txt.gz', shard_depth=1)
+    shards = Shards.from_config(config)
+    assert shards is not None
+    assert shards.root == tmp_path / 'bline'
+    assert shards.write('pkg', ['a', 'b'])
+    assert (tmp_path / 'bline' / 'pkg.txt.gz').exists()
+    assert shards.keys() == ['pkg']
+    assert shards.read('pkg') == ['a', 'b']